@@ -1,8 +1,6 @@
 """Pytest configuration and hooks for MCP compliance reporting."""
 
-import json
 import os
-from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional
 
@@ -11,9 +9,19 @@ from _pytest.config import Config
 from _pytest.nodes import Item
 from _pytest.reports import TestReport
 
+from mcp.compliance import DEFAULT_REPORT, build_report, print_report, save_report
 from tests._meta import MCP_REQUIREMENTS
 
 
+def pytest_addoption(parser) -> None:
+    """Add the report location option."""
+    parser.addoption(
+        "--report-file",
+        default=DEFAULT_REPORT,
+        help=f"Where to save the compliance report (default: {DEFAULT_REPORT})",
+    )
+
+
 def pytest_configure(config: Config) -> None:
     """Configure pytest with custom markers and initialize results storage."""
     config.addinivalue_line(
@@ -32,7 +40,12 @@ def pytest_configure(config: Config) -> None:
 def pytest_runtest_makereport(item: Item, call) -> None:
     """Process test results and store compliance data."""
     if call.when == "call" or (call.when == "setup" and call.excinfo):
-        outcome = "PASS" if call.excinfo is None else "FAIL"
+        if call.excinfo is None:
+            outcome = "PASS"
+        elif call.excinfo.errisinstance(pytest.skip.Exception):
+            outcome = "SKIPPED"
+        else:
+            outcome = "FAIL"
         if hasattr(item, "iter_markers"):
             markers = [m for m in item.iter_markers(name="mcp_requirement")]
             if markers:
@@ -63,76 +76,19 @@ def pytest_runtest_makereport(item: Item, call) -> None:
 
 
 def pytest_sessionfinish(session: pytest.Session, exitstatus: int) -> None:
-    """Generate and save the compliance report."""
-    results = session.config.mcp_results
-
-    # Generate timestamp for the report
-    timestamp = datetime.now().isoformat()
-
-    # Create the full report structure
-    report = {
-        "timestamp": timestamp,
-        "summary": {
-            "total": len(results),
-            "passed": len([r for r in results if r["outcome"] == "PASS"]),
-            "failed": len([r for r in results if r["outcome"] == "FAIL"]),
-            "skipped": len([r for r in results if r["outcome"] == "SKIPPED"]),
-            "must_failures": len(
-                [r for r in results if r["outcome"] == "FAIL" and r["level"] == "MUST"]
-            ),
-            "should_failures": len(
-                [
-                    r
-                    for r in results
-                    if r["outcome"] == "FAIL" and r["level"] == "SHOULD"
-                ]
-            ),
-        },
-        "results": results,
-    }
-
-    # Save JSON report
-    with open("reports/summary.json", "w") as f:
-        json.dump(report, f, indent=2)
-
-    # Generate and print CLI summary
-    print("\n=== MCP COMPLIANCE SUMMARY ===\n")
-
-    # Print feature-wise summary
-    features = sorted(set(r["feature"] for r in results))
-    for feature in features:
-        print(f"\n🔍 {feature}")
-        feature_results = [r for r in results if r["feature"] == feature]
-        for result in feature_results:
-            status_icon = {
-                "PASS": "✅",
-                "FAIL": "❌",
-                "SKIPPED": "⚠️",
-                "XFAIL": "🔸",
-                "XPASS": "🔹",
-            }.get(result["outcome"], "❓")
-
-            print(
-                f"{status_icon} [{result['level']}] {result['req_id'] or 'unknown'}: "
-                f"{result['description'] or result['nodeid']}"
-            )
-            if result["reason"]:
-                print(f"   └─ {result['reason']}")
-
-    # Print overall summary
-    print("\n=== SUMMARY ===")
-    print(f"Total Tests: {report['summary']['total']}")
-    print(f"✅ Passed: {report['summary']['passed']}")
-    print(f"❌ Failed: {report['summary']['failed']}")
-    print(f"⚠️ Skipped: {report['summary']['skipped']}")
-
+    """Generate and save the compliance report.
+
+    Runs that collected no compliance test, such as the mock server's own
+    tests, leave the last report alone.
+    """
+    if not any(item.get_closest_marker("mcp_requirement") for item in session.items):
+        return
+    report = build_report(session.config.mcp_results)
+    save_report(report, session.config.getoption("--report-file"))
+    print_report(report)
     if report["summary"]["must_failures"] > 0:
-        print(f"\n❌ {report['summary']['must_failures']} MUST requirements failed!")
         session.exitstatus = 1
 
-    if report["summary"]["should_failures"] > 0:
-        print(f"\n⚠️ {report['summary']['should_failures']} SHOULD requirements failed")
-
 
 @pytest.fixture
 def client():
@@ -0,0 +1,105 @@
+"""Asyncio MCP client implementation."""
+
+import asyncio
+import json
+import logging
+from typing import Any, Dict, Optional
+
+import httpx
+
+from mcp.client import RequestIdAllocator, extract_result
+from mcp.errors import MCPError
+from mcp.transports.base import (
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_POOL_SIZE,
+    DEFAULT_READ_TIMEOUT,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONCURRENCY = 64
+
+
+class AsyncMCPClient:
+    """Asyncio client for interacting with an MCP server.
+
+    Any number of ``send`` calls may be awaited concurrently; they share one
+    pool of keep-alive connections and at most ``max_concurrency`` of them are
+    on the wire at once.
+    """
+
+    def __init__(
+        self,
+        server_url: str,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        connect_timeout: Optional[float] = DEFAULT_CONNECT_TIMEOUT,
+        read_timeout: Optional[float] = DEFAULT_READ_TIMEOUT,
+    ):
+        """Initialize the client.
+
+        Args:
+            server_url: URL of the MCP server
+            max_concurrency: Maximum number of requests in flight at once
+            pool_size: Maximum number of connections to the server
+            connect_timeout: Seconds to wait for a connection, or None to wait forever
+            read_timeout: Seconds to wait for a response, or None to wait forever
+        """
+        self.server_url = server_url
+        self.max_concurrency = max_concurrency
+        self._ids = RequestIdAllocator()
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._http = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=pool_size, max_keepalive_connections=pool_size
+            ),
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+        )
+
+    @property
+    def request_id(self) -> int:
+        """The id of the most recently sent request."""
+        return self._ids.last
+
+    async def __aenter__(self) -> "AsyncMCPClient":
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Close all pooled connections."""
+        await self._http.aclose()
+
+    async def send(self, method: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """Send a JSON-RPC request to the server.
+
+        Args:
+            method: The method name to call
+            params: Optional parameters for the method
+
+        Returns:
+            The result from the method call
+
+        Raises:
+            JSONRPCError: If the server returns a JSON-RPC error
+            MCPError: For other errors
+        """
+        request = {"jsonrpc": "2.0", "method": method, "id": self._ids.next()}
+        if params:
+            request["params"] = params
+
+        async with self._semaphore:
+            try:
+                logger.debug(f"Sending request to {self.server_url}: {request}")
+                response = await self._http.post(self.server_url, json=request)
+                data = response.json()
+                logger.debug(f"Received response: {data}")
+            except httpx.HTTPError as e:
+                logger.error(f"Request failed: {e}")
+                raise MCPError(f"Request failed: {e}")
+            except json.JSONDecodeError as e:
+                logger.error(f"Invalid JSON response: {e}")
+                raise MCPError(f"Invalid JSON response: {e}")
+
+        return extract_result(data)
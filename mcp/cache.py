@@ -0,0 +1,155 @@
+"""Response cache for idempotent MCP list and capability requests."""
+
+import copy
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+# Methods whose results only change when the server says so
+CACHEABLE_METHODS = frozenset(
+    {
+        "capabilities/get",
+        "tools/list",
+        "prompts/list",
+        "resources/list",
+        "resources/templates/list",
+    }
+)
+
+# Cached methods invalidated by each list_changed notification
+LIST_CHANGED_INVALIDATES = {
+    "notifications/tools/list_changed": ("tools/list",),
+    "notifications/prompts/list_changed": ("prompts/list",),
+    "notifications/resources/list_changed": (
+        "resources/list",
+        "resources/templates/list",
+    ),
+}
+
+DEFAULT_CACHE_SIZE = 256
+DEFAULT_CACHE_TTL = 60.0
+
+CacheKey = Tuple[str, str]
+
+
+class ResponseCache:
+    """Bounded LRU cache of results, keyed by method and canonical params.
+
+    Entries expire after ``ttl`` seconds and are dropped early when the
+    matching ``*/list_changed`` notification arrives. Results are copied on
+    the way in and out so callers cannot mutate cached values.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_CACHE_SIZE,
+        ttl: Optional[float] = DEFAULT_CACHE_TTL,
+    ):
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of results kept before evicting the
+                least recently used
+            ttl: Seconds a result stays fresh, or None to keep it until evicted
+                or invalidated
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[CacheKey, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(method: str, params: Optional[Dict[str, Any]]) -> CacheKey:
+        """Build the cache key for a request; param order does not matter."""
+        canonical = json.dumps(
+            params or {}, sort_keys=True, separators=(",", ":"), default=str
+        )
+        return method, canonical
+
+    def lookup(self, method: str, params: Optional[Dict[str, Any]]) -> Tuple[bool, Any]:
+        """Look up a cached result.
+
+        Returns:
+            ``(True, result)`` on a hit, ``(False, None)`` on a miss
+        """
+        key = self.make_key(method, params)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl is not None:
+                if time.monotonic() - entry[0] > self.ttl:
+                    del self._entries[key]
+                    self.expirations += 1
+                    entry = None
+            if entry is None:
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return True, copy.deepcopy(entry[1])
+
+    def store(
+        self,
+        method: str,
+        params: Optional[Dict[str, Any]],
+        result: Any,
+        generation: int,
+    ) -> None:
+        """Cache a result fetched while the cache was at ``generation``.
+
+        Results fetched before an invalidation are discarded, so a reply that
+        raced a list_changed notification cannot repopulate the cache.
+        """
+        key = self.make_key(method, params)
+        value = copy.deepcopy(result)
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, method: Optional[str] = None) -> int:
+        """Drop cached results for a method, or all results if method is None.
+
+        Returns:
+            The number of entries dropped
+        """
+        with self._lock:
+            self.generation += 1
+            if method is None:
+                keys = list(self._entries)
+            else:
+                keys = [key for key in self._entries if key[0] == method]
+            for key in keys:
+                del self._entries[key]
+            self.invalidations += len(keys)
+        return len(keys)
+
+    def handle_notification(self, message: Dict[str, Any]) -> None:
+        """Invalidate the methods affected by a list_changed notification."""
+        for method in LIST_CHANGED_INVALIDATES.get(message.get("method"), ()):
+            self.invalidate(method)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit, miss, eviction, expiry and invalidation counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+                "size": len(self._entries),
+            }
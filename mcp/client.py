@@ -1,43 +1,204 @@
 """MCP client implementation."""
 
-import json
 import logging
-import requests
-from typing import Any, Dict, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+from urllib.parse import urlparse
+
+from mcp.cache import CACHEABLE_METHODS, ResponseCache
+from mcp.errors import JSONRPCError, MCPError
+from mcp.transports import (
+    HTTPTransport,
+    SSETransport,
+    Transport,
+    WebSocketTransport,
+)
+from mcp.transports.base import (
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_POOL_SIZE,
+    DEFAULT_READ_TIMEOUT,
+    NotificationHandler,
+)
 
 logger = logging.getLogger(__name__)
 
+BatchCall = Union[str, Tuple[str, Optional[Dict[str, Any]]]]
+
+
+class RequestIdAllocator:
+    """Hands out unique, increasing JSON-RPC request ids.
+
+    Safe to share between threads and between asyncio tasks.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.last = 0
 
-class MCPError(Exception):
-    """Base class for MCP errors."""
+    def next(self) -> int:
+        """Return the next unused request id."""
+        with self._lock:
+            self.last += 1
+            return self.last
 
-    pass
 
+def extract_result(data: Any) -> Any:
+    """Return the result of a decoded JSON-RPC response.
 
-class JSONRPCError(MCPError):
-    """JSON-RPC error response."""
+    Raises:
+        JSONRPCError: If the response carries a JSON-RPC error
+        MCPError: If the response is malformed
+    """
+    try:
+        if "error" in data:
+            error = data["error"]
+            raise JSONRPCError(error["code"], error["message"])
 
-    def __init__(self, code: int, message: str):
-        self.code = code
-        self.message = message
-        super().__init__(f"JSON-RPC error {code}: {message}")
+        if "result" not in data:
+            raise MCPError("Invalid response: missing 'result' field")
+
+        return data["result"]
+
+    except (KeyError, TypeError) as e:
+        logger.error(f"Invalid response format: {e}")
+        raise MCPError(f"Invalid response format: {e}")
 
 
 class MCPClient:
     """Client for interacting with an MCP server."""
 
-    def __init__(self, server_url: str):
+    def __init__(
+        self,
+        server_url: str,
+        transport: Optional[Transport] = None,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        connect_timeout: Optional[float] = DEFAULT_CONNECT_TIMEOUT,
+        read_timeout: Optional[float] = DEFAULT_READ_TIMEOUT,
+        cache: Optional[ResponseCache] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ):
         """Initialize the client.
 
+        The transport is picked from the URL when none is given: ``ws://`` and
+        ``wss://`` URLs use a WebSocket, URLs whose path ends in ``/sse`` use
+        HTTP with Server-Sent Events, and anything else uses pooled HTTP POST.
+
         Args:
             server_url: URL of the MCP server
+            transport: Transport to use instead of the one implied by the URL
+            pool_size: Maximum number of keep-alive HTTP connections to the server
+            connect_timeout: Seconds to wait for a connection, or None to wait forever
+            read_timeout: Seconds to wait for a response, or None to wait forever
+            cache: Cache for list and capability results. It is invalidated
+                by list_changed notifications when the transport receives them
+            headers: Extra HTTP headers for the transport picked from the URL,
+                such as ``X-Client-Id`` to name the client's namespace on the
+                mock server
         """
         self.server_url = server_url
-        self.request_id = 0
+        self._ids = RequestIdAllocator()
+        if transport is None and server_url.startswith(("ws://", "wss://")):
+            transport = WebSocketTransport(
+                server_url,
+                connect_timeout=connect_timeout,
+                read_timeout=read_timeout,
+                headers=headers,
+            )
+        elif transport is None and urlparse(server_url).path.endswith("/sse"):
+            transport = SSETransport(
+                server_url,
+                pool_size=pool_size,
+                connect_timeout=connect_timeout,
+                read_timeout=read_timeout,
+                headers=headers,
+            )
+        elif transport is None:
+            transport = HTTPTransport(
+                server_url,
+                pool_size=pool_size,
+                connect_timeout=connect_timeout,
+                read_timeout=read_timeout,
+                headers=headers,
+            )
+        self.transport = transport
+        self.cache = cache
+        if cache is not None and transport.supports_notifications:
+            transport.on_notification(None, cache.handle_notification)
+
+    @property
+    def request_id(self) -> int:
+        """The id of the most recently sent request."""
+        return self._ids.last
+
+    def __enter__(self) -> "MCPClient":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Shut down the transport and release its connections."""
+        self.transport.close()
+
+    def connection_stats(self) -> Dict[str, int]:
+        """Return counters for new and reused transport connections.
+
+        Returns:
+            A dict with ``new`` and ``reused`` counts, plus ``stale`` for
+            requests retried because their connection could not be opened,
+            empty if the transport does not track connections.
+        """
+        stats = getattr(self.transport, "connection_stats", None)
+        return stats() if stats else {}
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Return response cache statistics, empty if caching is off."""
+        return self.cache.stats() if self.cache is not None else {}
+
+    def on_notification(
+        self, method: Optional[str], handler: NotificationHandler
+    ) -> None:
+        """Register a handler for server notifications.
+
+        Args:
+            method: Notification method to handle, or None for all notifications
+            handler: Called with the full notification message
+
+        Raises:
+            MCPError: If the transport cannot receive notifications
+        """
+        self.transport.on_notification(method, handler)
+
+    def remove_notification_handler(
+        self, method: Optional[str], handler: NotificationHandler
+    ) -> None:
+        """Unregister a handler added with ``on_notification``."""
+        self.transport.remove_notification_handler(method, handler)
+
+    def wait_for_notification(
+        self, method: Optional[str], timeout: Optional[float] = 10.0
+    ) -> Optional[Dict[str, Any]]:
+        """Block until the server sends a notification.
+
+        Args:
+            method: Notification method to wait for, or None for any
+            timeout: Seconds to wait, or None to wait forever
+
+        Returns:
+            The notification message, or None if the timeout expired
+
+        Raises:
+            MCPError: If the transport cannot receive notifications
+        """
+        return self.transport.wait_for_notification(method, timeout)
 
     def send(self, method: str, params: Optional[Dict[str, Any]] = None) -> Any:
         """Send a JSON-RPC request to the server.
 
+        When the client has a cache, list and capability results are served
+        from it while fresh.
+
         Args:
             method: The method name to call
             params: Optional parameters for the method
@@ -49,32 +210,167 @@ class MCPClient:
             JSONRPCError: If the server returns a JSON-RPC error
             MCPError: For other errors
         """
-        self.request_id += 1
-        request = {"jsonrpc": "2.0", "method": method, "id": self.request_id}
+        if self.cache is None or method not in CACHEABLE_METHODS:
+            return self._call(method, params)
+
+        hit, result = self.cache.lookup(method, params)
+        if hit:
+            return result
+        generation = self.cache.generation
+        result = self._call(method, params)
+        self.cache.store(method, params, result, generation)
+        return result
+
+    def _call(self, method: str, params: Optional[Dict[str, Any]]) -> Any:
+        """Send a request to the server, bypassing the cache."""
+        request = {"jsonrpc": "2.0", "method": method, "id": self._ids.next()}
         if params:
             request["params"] = params
 
+        return extract_result(self.transport.send(request))
+
+    def send_batch(
+        self, calls: Sequence[BatchCall], return_exceptions: bool = False
+    ) -> List[Any]:
+        """Send several JSON-RPC requests in a single batch message.
+
+        Responses are matched to requests by id, so the server may answer
+        them in any order.
+
+        Args:
+            calls: Method names or ``(method, params)`` tuples
+            return_exceptions: If True, a failed call's JSONRPCError is placed
+                in its result slot instead of being raised
+
+        Returns:
+            The results, in the same order as ``calls``
+
+        Raises:
+            JSONRPCError: If a call failed and ``return_exceptions`` is False
+            MCPError: For other errors
+        """
+        if not calls:
+            return []
+
+        batch = []
+        for call in calls:
+            method, params = (call, None) if isinstance(call, str) else call
+            request = {"jsonrpc": "2.0", "method": method, "id": self._ids.next()}
+            if params:
+                request["params"] = params
+            batch.append(request)
+
+        data = self.transport.send(batch)
+        if not isinstance(data, list):
+            # Servers without batch support answer with a single error object
+            extract_result(data)
+            raise MCPError("Invalid response: expected a batch array")
+
+        responses = {r.get("id"): r for r in data if isinstance(r, dict)}
+        results = []
+        for request in batch:
+            response = responses.get(request["id"])
+            if response is None:
+                raise MCPError(f"Invalid response: no reply for id {request['id']}")
+            try:
+                results.append(extract_result(response))
+            except JSONRPCError as e:
+                if not return_exceptions:
+                    raise
+                results.append(e)
+        return results
+
+    def iter_pages(
+        self,
+        method: str,
+        params: Optional[Dict[str, Any]] = None,
+        prefetch: bool = True,
+    ) -> Iterator[Dict[str, Any]]:
+        """Lazily yield each page of a paginated list method.
+
+        ``nextCursor`` is followed until the server stops returning one. With
+        ``prefetch``, the next page is requested in the background while the
+        caller consumes the current one, so at most two pages are held.
+
+        Args:
+            method: A paginated list method such as ``tools/list``
+            params: Parameters sent with every page request
+            prefetch: Whether to fetch the next page ahead of time
+
+        Raises:
+            JSONRPCError: If the server returns a JSON-RPC error
+            MCPError: If the server repeats a cursor, or for other errors
+        """
+        seen_cursors = set()
+        executor = None
+        if prefetch:
+            executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="mcp-prefetch"
+            )
         try:
-            logger.debug(f"Sending request to {self.server_url}: {request}")
-            response = requests.post(self.server_url, json=request)
-            data = response.json()
-            logger.debug(f"Received response: {data}")
-
-            if "error" in data:
-                error = data["error"]
-                raise JSONRPCError(error["code"], error["message"])
-
-            if "result" not in data:
-                raise MCPError("Invalid response: missing 'result' field")
-
-            return data["result"]
-
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Request failed: {e}")
-            raise MCPError(f"Request failed: {e}")
-        except json.JSONDecodeError as e:
-            logger.error(f"Invalid JSON response: {e}")
-            raise MCPError(f"Invalid JSON response: {e}")
-        except KeyError as e:
-            logger.error(f"Invalid response format: {e}")
-            raise MCPError(f"Invalid response format: {e}")
+            page = self.send(method, params)
+            while True:
+                if not isinstance(page, dict):
+                    raise MCPError(f"Invalid response: {method} page is not an object")
+                cursor = page.get("nextCursor")
+                next_page = None
+                if cursor:
+                    if cursor in seen_cursors:
+                        raise MCPError(
+                            f"Cursor loop detected in {method}: "
+                            f"{cursor!r} was returned twice"
+                        )
+                    seen_cursors.add(cursor)
+                    page_params = {**(params or {}), "cursor": cursor}
+                    if executor is not None:
+                        next_page = executor.submit(self.send, method, page_params)
+
+                yield page
+                if not cursor:
+                    return
+                if next_page is not None:
+                    page = next_page.result()
+                else:
+                    page = self.send(method, page_params)
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=False)
+
+    def iter_items(
+        self,
+        method: str,
+        key: str,
+        params: Optional[Dict[str, Any]] = None,
+        prefetch: bool = True,
+    ) -> Iterator[Dict[str, Any]]:
+        """Lazily yield the items of a paginated list method across all pages.
+
+        Args:
+            method: A paginated list method such as ``tools/list``
+            key: Result field holding the page's items, e.g. ``tools``
+            params: Parameters sent with every page request
+            prefetch: Whether to fetch the next page ahead of time
+        """
+        for page in self.iter_pages(method, params, prefetch):
+            items = page.get(key)
+            if not isinstance(items, list):
+                raise MCPError(f"Invalid response: missing '{key}' list")
+            yield from items
+
+    def iter_tools(self, **kwargs) -> Iterator[Dict[str, Any]]:
+        """Lazily yield every tool, following pagination."""
+        return self.iter_items("tools/list", "tools", **kwargs)
+
+    def iter_prompts(self, **kwargs) -> Iterator[Dict[str, Any]]:
+        """Lazily yield every prompt, following pagination."""
+        return self.iter_items("prompts/list", "prompts", **kwargs)
+
+    def iter_resources(self, **kwargs) -> Iterator[Dict[str, Any]]:
+        """Lazily yield every resource, following pagination."""
+        return self.iter_items("resources/list", "resources", **kwargs)
+
+    def iter_resource_templates(self, **kwargs) -> Iterator[Dict[str, Any]]:
+        """Lazily yield every resource template, following pagination."""
+        return self.iter_items(
+            "resources/templates/list", "resourceTemplates", **kwargs
+        )
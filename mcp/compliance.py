@@ -0,0 +1,86 @@
+"""Compliance report built from the results of the test suite."""
+
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Union
+
+DEFAULT_REPORT = "reports/summary.json"
+
+
+def build_report(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Count the outcomes of the test results.
+
+    Args:
+        results: One entry per test, as recorded by the suite's conftest
+
+    Returns:
+        The report, with a summary of the counts and the results themselves
+    """
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "summary": {
+            "total": len(results),
+            "passed": len([r for r in results if r["outcome"] == "PASS"]),
+            "failed": len([r for r in results if r["outcome"] == "FAIL"]),
+            "skipped": len([r for r in results if r["outcome"] == "SKIPPED"]),
+            "must_failures": len(
+                [r for r in results if r["outcome"] == "FAIL" and r["level"] == "MUST"]
+            ),
+            "should_failures": len(
+                [
+                    r
+                    for r in results
+                    if r["outcome"] == "FAIL" and r["level"] == "SHOULD"
+                ]
+            ),
+        },
+        "results": results,
+    }
+
+
+def save_report(report: Dict[str, Any], path: Union[str, Path] = DEFAULT_REPORT):
+    """Save a report as JSON."""
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    """Print the results by feature, then the counts."""
+    results = report["results"]
+    print("\n=== MCP COMPLIANCE SUMMARY ===\n")
+
+    # Print feature-wise summary
+    features = sorted(set(r["feature"] for r in results))
+    for feature in features:
+        print(f"\n🔍 {feature}")
+        feature_results = [r for r in results if r["feature"] == feature]
+        for result in feature_results:
+            status_icon = {
+                "PASS": "✅",
+                "FAIL": "❌",
+                "SKIPPED": "⚠️",
+                "XFAIL": "🔸",
+                "XPASS": "🔹",
+            }.get(result["outcome"], "❓")
+
+            print(
+                f"{status_icon} [{result['level']}] {result['req_id'] or 'unknown'}: "
+                f"{result['description'] or result['nodeid']}"
+            )
+            if result["reason"]:
+                print(f"   └─ {result['reason']}")
+
+    # Print overall summary
+    print("\n=== SUMMARY ===")
+    print(f"Total Tests: {report['summary']['total']}")
+    print(f"✅ Passed: {report['summary']['passed']}")
+    print(f"❌ Failed: {report['summary']['failed']}")
+    print(f"⚠️ Skipped: {report['summary']['skipped']}")
+
+    if report["summary"]["must_failures"] > 0:
+        print(f"\n❌ {report['summary']['must_failures']} MUST requirements failed!")
+
+    if report["summary"]["should_failures"] > 0:
+        print(f"\n⚠️ {report['summary']['should_failures']} SHOULD requirements failed")
@@ -0,0 +1,16 @@
+"""Exceptions raised by the MCP client and its transports."""
+
+
+class MCPError(Exception):
+    """Base class for MCP errors."""
+
+    pass
+
+
+class JSONRPCError(MCPError):
+    """JSON-RPC error response."""
+
+    def __init__(self, code: int, message: str):
+        self.code = code
+        self.message = message
+        super().__init__(f"JSON-RPC error {code}: {message}")
@@ -0,0 +1 @@
+"""Benchmark and load tools for MCP servers."""
@@ -0,0 +1,206 @@
+"""Closed-loop benchmark of an MCP server, one method at a time.
+
+Each method is driven by ``concurrency`` threads sharing one client. Every
+thread sends a request, waits for its reply and sends the next, for a warmup
+period followed by the measured duration. Latencies go into a per-thread
+HdrHistogram, merged once the method is done.
+"""
+
+import json
+import logging
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Sequence, Union
+
+from mcp.client import MCPClient
+from mcp.errors import JSONRPCError, MCPError
+from mcp.load.histogram import SUMMARY_PERCENTILES, HdrHistogram
+from mcp.load.workload import Call
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONCURRENCY = 8
+DEFAULT_DURATION = 10.0
+DEFAULT_WARMUP = 1.0
+
+# Error key of requests that got no JSON-RPC reply at all
+TRANSPORT_ERROR = "transport"
+
+
+@dataclass
+class MethodResult:
+    """Measurements of one method."""
+
+    method: str
+    duration: float
+    latency: HdrHistogram = field(default_factory=HdrHistogram)
+    errors: Counter = field(default_factory=Counter)
+
+    @property
+    def requests(self) -> int:
+        """Requests completed in the measured period, failed ones included."""
+        return self.latency.total
+
+    @property
+    def error_count(self) -> int:
+        """Requests that failed."""
+        return sum(self.errors.values())
+
+    @property
+    def throughput(self) -> float:
+        """Completed requests per second."""
+        return self.requests / self.duration if self.duration else 0.0
+
+    @property
+    def error_rate(self) -> float:
+        """Share of requests that failed."""
+        return self.error_count / self.requests if self.requests else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the measurements as JSON-serializable data."""
+        return {
+            "method": self.method,
+            "requests": self.requests,
+            "duration_s": self.duration,
+            "throughput_rps": self.throughput,
+            "errors": self.error_count,
+            "error_rate": self.error_rate,
+            "errors_by_code": {str(code): n for code, n in self.errors.items()},
+            "latency": self.latency.summary(),
+        }
+
+
+def send_call(client: MCPClient, call: Call) -> Union[None, int, str]:
+    """Send a call, returning None on success, else its error code."""
+    try:
+        call.send(client)
+    except JSONRPCError as e:
+        return e.code
+    except MCPError:
+        return TRANSPORT_ERROR
+    return None
+
+
+def benchmark_method(
+    client: MCPClient,
+    call: Call,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    duration: float = DEFAULT_DURATION,
+    warmup: float = DEFAULT_WARMUP,
+) -> MethodResult:
+    """Drive one call closed-loop and measure it.
+
+    Args:
+        client: Client to send through. It must allow ``concurrency``
+            requests in flight, e.g. an HTTP pool at least that large
+        call: Request to send repeatedly
+        concurrency: Number of requests kept in flight
+        duration: Seconds to measure for
+        warmup: Seconds to send for before measuring
+
+    Returns:
+        The latencies and errors of the requests sent after the warmup
+    """
+    start = time.perf_counter()
+    measure_from = start + warmup
+    stop = measure_from + duration
+    results: List[MethodResult] = []
+    lock = threading.Lock()
+
+    def worker() -> None:
+        result = MethodResult(call.method, duration)
+        while True:
+            sent = time.perf_counter()
+            if sent >= stop:
+                break
+            error = send_call(client, call)
+            if sent >= measure_from:
+                result.latency.record_seconds(time.perf_counter() - sent)
+                if error is not None:
+                    result.errors[error] += 1
+        with lock:
+            results.append(result)
+
+    threads = [
+        threading.Thread(target=worker, name=f"mcp-bench-{i}", daemon=True)
+        for i in range(concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    total = MethodResult(call.method, duration)
+    for result in results:
+        total.latency.merge(result.latency)
+        total.errors.update(result.errors)
+    return total
+
+
+def run_benchmark(
+    client: MCPClient,
+    calls: Sequence[Call],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    duration: float = DEFAULT_DURATION,
+    warmup: float = DEFAULT_WARMUP,
+) -> List[MethodResult]:
+    """Benchmark each call in turn. See benchmark_method."""
+    results = []
+    for call in calls:
+        logger.info(
+            f"Benchmarking {call.method} for {duration:g}s "
+            f"at concurrency {concurrency}"
+        )
+        results.append(benchmark_method(client, call, concurrency, duration, warmup))
+    return results
+
+
+def write_report(
+    path: Union[str, Path],
+    results: Sequence[MethodResult],
+    settings: Dict[str, Any],
+) -> Dict[str, Any]:
+    """Save benchmark results as JSON.
+
+    Args:
+        path: File to write
+        results: Results of each method
+        settings: Run settings recorded with the results, such as the server
+            and concurrency
+
+    Returns:
+        The report written
+    """
+    report = {
+        "timestamp": datetime.now().isoformat(),
+        "settings": settings,
+        "results": [result.to_dict() for result in results],
+    }
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+    return report
+
+
+def format_results(results: Sequence[MethodResult]) -> str:
+    """Format results as a table for the terminal."""
+    percentile_names = [f"p{p:g}" for p in SUMMARY_PERCENTILES]
+    header = (
+        f"{'method':<28}{'req/s':>10}{'errors':>9}"
+        + "".join(f"{name + ' ms':>11}" for name in percentile_names)
+        + f"{'max ms':>11}"
+    )
+    lines = [header, "-" * len(header)]
+    for result in results:
+        summary = result.latency.summary()
+        lines.append(
+            f"{result.method:<28}{result.throughput:>10.1f}"
+            f"{result.error_rate:>9.2%}"
+            + "".join(f"{summary[name + '_ms']:>11.3f}" for name in percentile_names)
+            + f"{summary['max_ms']:>11.3f}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,283 @@
+"""Search for the highest throughput a server sustains within an SLO.
+
+Each method is benchmarked closed-loop at a series of concurrencies, a few
+seconds each, until the latency or error-rate objective is breached:
+
+- ``bisect`` doubles the concurrency until the SLO is breached, then bisects
+  between the last concurrency that met it and the first that did not.
+- ``aimd`` raises the concurrency by a fixed step while the SLO holds and
+  halves it when the SLO is breached, stopping after a few breaches. It
+  re-measures levels it has already visited, which suits noisy servers.
+
+Every measurement is kept as a point of the throughput/latency curve, and the
+knee is the point with the highest throughput that met the SLO.
+"""
+
+import csv
+import json
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+from mcp.client import MCPClient
+from mcp.load.bench import DEFAULT_WARMUP, MethodResult, benchmark_method
+from mcp.load.histogram import SUMMARY_PERCENTILES
+from mcp.load.workload import Call
+
+logger = logging.getLogger(__name__)
+
+STRATEGIES = ("bisect", "aimd")
+
+DEFAULT_STEP_DURATION = 5.0
+DEFAULT_MAX_CONCURRENCY = 256
+DEFAULT_LATENCY_SLO_MS = 100.0
+DEFAULT_SLO_PERCENTILE = 99.0
+DEFAULT_ERROR_RATE_SLO = 0.01
+
+# Concurrency added after each AIMD step that met the SLO
+AIMD_INCREASE = 4
+
+# SLO breaches after which an AIMD search stops
+AIMD_BREACHES = 3
+
+# Columns of the CSV curve, after the method and step
+_CSV_LATENCIES = ["mean_ms"] + [f"p{p:g}_ms" for p in SUMMARY_PERCENTILES] + ["max_ms"]
+
+
+@dataclass(frozen=True)
+class Slo:
+    """Service level objective a concurrency level must meet."""
+
+    latency_ms: float = DEFAULT_LATENCY_SLO_MS
+    percentile: float = DEFAULT_SLO_PERCENTILE
+    error_rate: float = DEFAULT_ERROR_RATE_SLO
+
+    def breach(self, result: MethodResult) -> Optional[str]:
+        """Return how a result breaches the objective, or None if it meets it."""
+        if not result.requests:
+            return "no request completed"
+        if result.error_rate > self.error_rate:
+            return f"error rate {result.error_rate:.2%} > {self.error_rate:.2%}"
+        latency_ms = result.latency.percentile(self.percentile) / 1000
+        if latency_ms > self.latency_ms:
+            return f"p{self.percentile:g} {latency_ms:.3f}ms > {self.latency_ms:g}ms"
+        return None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the objective as JSON-serializable data."""
+        return {
+            "latency_ms": self.latency_ms,
+            "percentile": self.percentile,
+            "error_rate": self.error_rate,
+        }
+
+
+@dataclass
+class CurvePoint:
+    """One measurement of the throughput/latency curve."""
+
+    concurrency: int
+    result: MethodResult
+    breach: Optional[str] = None
+
+    @property
+    def meets_slo(self) -> bool:
+        """Whether the measurement met the SLO."""
+        return self.breach is None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the measurement as JSON-serializable data."""
+        return {
+            "concurrency": self.concurrency,
+            "throughput_rps": self.result.throughput,
+            "requests": self.result.requests,
+            "error_rate": self.result.error_rate,
+            "latency": self.result.latency.summary(),
+            "meets_slo": self.meets_slo,
+            "breach": self.breach,
+        }
+
+
+@dataclass
+class CapacityResult:
+    """Curve and knee of one method."""
+
+    method: str
+    points: List[CurvePoint] = field(default_factory=list)
+
+    @property
+    def knee(self) -> Optional[CurvePoint]:
+        """The point with the highest throughput that met the SLO."""
+        passing = [point for point in self.points if point.meets_slo]
+        return max(passing, key=lambda p: p.result.throughput, default=None)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the curve and knee as JSON-serializable data."""
+        knee = self.knee
+        return {
+            "method": self.method,
+            "knee": knee.to_dict() if knee else None,
+            "curve": [point.to_dict() for point in self.points],
+        }
+
+
+def _bisect(measure: Callable[[int], CurvePoint], max_concurrency: int) -> None:
+    good = 0
+    concurrency = 1
+    while measure(concurrency).meets_slo:
+        good = concurrency
+        if concurrency >= max_concurrency:
+            return
+        concurrency = min(concurrency * 2, max_concurrency)
+    if not good:
+        return
+    bad = concurrency
+    while bad - good > 1:
+        middle = (good + bad) // 2
+        if measure(middle).meets_slo:
+            good = middle
+        else:
+            bad = middle
+
+
+def _aimd(measure: Callable[[int], CurvePoint], max_concurrency: int) -> None:
+    concurrency = 1
+    breaches = 0
+    while breaches < AIMD_BREACHES:
+        if measure(concurrency).meets_slo:
+            if concurrency >= max_concurrency:
+                return
+            concurrency = min(concurrency + AIMD_INCREASE, max_concurrency)
+        else:
+            breaches += 1
+            if concurrency == 1:
+                return
+            concurrency = max(1, concurrency // 2)
+
+
+def search_capacity(
+    client: MCPClient,
+    call: Call,
+    slo: Slo = Slo(),
+    strategy: str = "bisect",
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    step_duration: float = DEFAULT_STEP_DURATION,
+    warmup: float = DEFAULT_WARMUP,
+) -> CapacityResult:
+    """Find the concurrency at which one method's throughput peaks within the SLO.
+
+    Args:
+        client: Client to send through. It must allow ``max_concurrency``
+            requests in flight, e.g. an HTTP pool at least that large
+        call: Request to send
+        slo: Objective each concurrency level must meet
+        strategy: One of STRATEGIES
+        max_concurrency: Highest concurrency to try
+        step_duration: Seconds to measure each concurrency level for
+        warmup: Seconds to send at each level before measuring
+
+    Returns:
+        Every measurement, in the order taken
+
+    Raises:
+        ValueError: If the strategy is unknown
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(
+            f"Unknown search strategy '{strategy}', "
+            f"expected one of {', '.join(STRATEGIES)}"
+        )
+    capacity = CapacityResult(call.method)
+    measured: Dict[int, CurvePoint] = {}
+
+    def measure(concurrency: int) -> CurvePoint:
+        # Bisection never needs a level twice; AIMD re-measures on purpose
+        if strategy == "bisect" and concurrency in measured:
+            return measured[concurrency]
+        result = benchmark_method(client, call, concurrency, step_duration, warmup)
+        point = CurvePoint(concurrency, result, slo.breach(result))
+        measured[concurrency] = point
+        capacity.points.append(point)
+        logger.info(
+            f"{call.method} at concurrency {concurrency}: "
+            f"{result.throughput:.1f} req/s, " + (point.breach or "SLO met")
+        )
+        return point
+
+    if strategy == "bisect":
+        _bisect(measure, max_concurrency)
+    else:
+        _aimd(measure, max_concurrency)
+    return capacity
+
+
+def write_curve(
+    json_path: Union[str, Path],
+    csv_path: Union[str, Path],
+    results: Sequence[CapacityResult],
+    settings: Dict[str, Any],
+) -> None:
+    """Save the curves and knees as JSON, and the curves as CSV.
+
+    Args:
+        json_path: JSON file to write
+        csv_path: CSV file to write, one row per measurement
+        results: Results of each method
+        settings: Run settings recorded with the results, such as the SLO
+    """
+    report = {
+        "timestamp": datetime.now().isoformat(),
+        "settings": settings,
+        "results": [result.to_dict() for result in results],
+    }
+    Path(json_path).parent.mkdir(parents=True, exist_ok=True)
+    with open(json_path, "w") as f:
+        json.dump(report, f, indent=2)
+
+    Path(csv_path).parent.mkdir(parents=True, exist_ok=True)
+    with open(csv_path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(
+            ["method", "step", "concurrency", "throughput_rps", "error_rate"]
+            + _CSV_LATENCIES
+            + ["meets_slo"]
+        )
+        for result in results:
+            for step, point in enumerate(result.points, 1):
+                summary = point.result.latency.summary()
+                writer.writerow(
+                    [
+                        result.method,
+                        step,
+                        point.concurrency,
+                        f"{point.result.throughput:.3f}",
+                        f"{point.result.error_rate:.6f}",
+                    ]
+                    + [f"{summary[key]:.3f}" for key in _CSV_LATENCIES]
+                    + [int(point.meets_slo)]
+                )
+
+
+def format_knees(results: Sequence[CapacityResult], slo: Slo) -> str:
+    """Format the knee of each method as a table for the terminal."""
+    latency_name = f"p{slo.percentile:g} ms"
+    header = (
+        f"{'method':<28}{'concurrency':>12}{'req/s':>10}{latency_name:>11}"
+        f"{'errors':>9}  first breach"
+    )
+    lines = [header, "-" * len(header)]
+    for result in results:
+        knee = result.knee
+        breach = next((p.breach for p in result.points if p.breach), "-")
+        if knee is None:
+            lines.append(f"{result.method:<28}{'SLO never met':>42}  {breach}")
+            continue
+        latency_ms = knee.result.latency.percentile(slo.percentile) / 1000
+        lines.append(
+            f"{result.method:<28}{knee.concurrency:>12}"
+            f"{knee.result.throughput:>10.1f}{latency_ms:>11.3f}"
+            f"{knee.result.error_rate:>9.2%}  {breach}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,145 @@
+"""High-dynamic-range latency histogram.
+
+Latencies are recorded in whole microseconds into log-linear buckets, in the
+style of HdrHistogram: values below 2048 get a bucket each, and every doubling
+above that is split into 1024 equal buckets. Any recorded value is therefore
+reported within 0.1% of its true value, from one microsecond up to hours,
+using a fixed and small amount of memory. Recording is O(1), and histograms
+recorded by separate threads can be merged by adding their counts.
+"""
+
+import math
+from typing import Any, Dict, List, Optional
+
+# Buckets per doubling above the linear range; 1024 gives three significant
+# decimal digits
+_SUB_BUCKET_BITS = 11
+_SUB_BUCKET_COUNT = 1 << _SUB_BUCKET_BITS
+_SUB_BUCKET_HALF = _SUB_BUCKET_COUNT >> 1
+
+# Largest value tracked by default: one day, in microseconds
+DEFAULT_HIGHEST_VALUE = 24 * 3600 * 1_000_000
+
+# Percentiles reported by summary()
+SUMMARY_PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+
+
+def _index(value: int) -> int:
+    if value < _SUB_BUCKET_COUNT:
+        return value
+    shift = value.bit_length() - _SUB_BUCKET_BITS
+    return shift * _SUB_BUCKET_HALF + (value >> shift)
+
+
+def _highest_equivalent(index: int) -> int:
+    """Return the largest value recorded into the bucket at ``index``."""
+    if index < _SUB_BUCKET_COUNT:
+        return index
+    shift = index // _SUB_BUCKET_HALF - 1
+    sub_bucket = index - shift * _SUB_BUCKET_HALF
+    return ((sub_bucket + 1) << shift) - 1
+
+
+class HdrHistogram:
+    """Counts of microsecond values with three significant digits of precision."""
+
+    def __init__(self, highest_value: int = DEFAULT_HIGHEST_VALUE):
+        """Initialize an empty histogram.
+
+        Args:
+            highest_value: Largest value tracked, in microseconds. Larger
+                values are counted as this value
+        """
+        self.highest_value = highest_value
+        self.counts: List[int] = [0] * (_index(highest_value) + 1)
+        self.total = 0
+        self.min: Optional[int] = None
+        self.max = 0
+        self._sum = 0
+
+    def record(self, microseconds: float, count: int = 1) -> None:
+        """Record a value, or the same value ``count`` times."""
+        value = min(max(int(microseconds), 0), self.highest_value)
+        self.counts[_index(value)] += count
+        self.total += count
+        self._sum += value * count
+        if self.min is None or value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def record_seconds(self, seconds: float) -> None:
+        """Record a duration given in seconds."""
+        self.record(seconds * 1_000_000)
+
+    def merge(self, other: "HdrHistogram") -> None:
+        """Add the counts of another histogram with the same range."""
+        if other.highest_value != self.highest_value:
+            raise ValueError("Histograms must track the same range to be merged")
+        if not other.total:
+            return
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.total += other.total
+        self._sum += other._sum
+        if self.min is None or other.min < self.min:
+            self.min = other.min
+        self.max = max(self.max, other.max)
+
+    @property
+    def mean(self) -> float:
+        """Mean of the recorded values, in microseconds."""
+        return self._sum / self.total if self.total else 0.0
+
+    def percentile(self, percentile: float) -> int:
+        """Return the value at or below which ``percentile`` % of values fall.
+
+        Returns:
+            The value in microseconds, 0 if nothing was recorded
+        """
+        if not self.total:
+            return 0
+        rank = max(1, math.ceil(percentile / 100 * self.total))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(_highest_equivalent(index), self.max)
+        return self.max
+
+    def percentiles(self, percentiles: List[float]) -> Dict[float, int]:
+        """Return several percentiles in one pass over the counts."""
+        result: Dict[float, int] = {}
+        if not self.total:
+            return {p: 0 for p in percentiles}
+        targets = sorted(
+            (max(1, math.ceil(p / 100 * self.total)), p) for p in percentiles
+        )
+        seen = 0
+        pending = iter(targets)
+        rank, percentile = next(pending)
+        for index, count in enumerate(self.counts):
+            if not count:
+                continue
+            seen += count
+            while seen >= rank:
+                result[percentile] = min(_highest_equivalent(index), self.max)
+                try:
+                    rank, percentile = next(pending)
+                except StopIteration:
+                    return result
+        for _, percentile in pending:
+            result[percentile] = self.max
+        return result
+
+    def summary(self) -> Dict[str, Any]:
+        """Return count, mean, min, max and the SUMMARY_PERCENTILES, in milliseconds."""
+        values = self.percentiles(list(SUMMARY_PERCENTILES))
+        summary: Dict[str, Any] = {
+            "count": self.total,
+            "mean_ms": self.mean / 1000,
+            "min_ms": (self.min or 0) / 1000,
+            "max_ms": self.max / 1000,
+        }
+        for percentile in SUMMARY_PERCENTILES:
+            summary[f"p{percentile:g}_ms"] = values[percentile] / 1000
+        return summary
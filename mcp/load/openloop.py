@@ -0,0 +1,219 @@
+"""Open-loop load generation, free of coordinated omission.
+
+A closed-loop benchmark only sends a request once an earlier one has returned,
+so when the server stalls it also stops sending, and the requests that would
+have queued up behind the stall are never measured. Here requests are sent on
+the scenario's schedule whether or not earlier ones have returned, and each
+latency is measured from the time the request was due to be sent. A request
+that waits because every sender is busy, or because the generator fell behind,
+is charged for the wait, as a real client arriving at that time would be.
+
+The time from the actual send is recorded as well, as the service time, so
+the two can be compared.
+"""
+
+import logging
+import random
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from mcp.client import MCPClient
+from mcp.load.bench import MethodResult, send_call
+from mcp.load.histogram import HdrHistogram
+from mcp.load.scenario import Scenario
+from mcp.load.workload import Call, discover_calls
+
+logger = logging.getLogger(__name__)
+
+# Requests that may be on the wire at once; later ones wait for a sender
+DEFAULT_MAX_IN_FLIGHT = 256
+
+# Stage name of the results that cover the whole scenario
+TOTAL = "total"
+
+# Seconds the generator may fall behind its schedule before it warns
+LAG_WARNING = 0.01
+
+
+@dataclass
+class OpenLoopResult(MethodResult):
+    """Measurements of one method in one stage of an open-loop run.
+
+    ``latency`` is measured from each request's intended send time and
+    ``service`` from its actual send time.
+    """
+
+    stage: str = TOTAL
+    scheduled: int = 0
+    service: HdrHistogram = field(default_factory=HdrHistogram)
+
+    @property
+    def target_rate(self) -> float:
+        """Requests per second the scenario scheduled."""
+        return self.scheduled / self.duration if self.duration else 0.0
+
+    def merge(self, other: "OpenLoopResult") -> None:
+        """Add the measurements of another result."""
+        self.scheduled += other.scheduled
+        self.latency.merge(other.latency)
+        self.service.merge(other.service)
+        self.errors.update(other.errors)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the measurements as JSON-serializable data."""
+        data = super().to_dict()
+        data["stage"] = self.stage
+        data["scheduled"] = self.scheduled
+        data["target_rps"] = self.target_rate
+        data["service_time"] = self.service.summary()
+        return data
+
+
+def resolve_calls(
+    client: MCPClient, scenario: Scenario
+) -> Tuple[List[Call], List[float]]:
+    """Build the calls of a scenario, picking targets the scenario leaves out.
+
+    Calls whose target cannot be picked are left out with a warning.
+
+    Returns:
+        The calls and their weights
+    """
+    calls = []
+    weights = []
+    for entry in scenario.calls:
+        if entry.params is not None:
+            found = [Call(entry.method, entry.params)]
+        else:
+            found = discover_calls(client, [entry.method])
+        if found and entry.weight:
+            calls.append(found[0])
+            weights.append(entry.weight)
+    return calls, weights
+
+
+def run_open_loop(
+    client: MCPClient,
+    scenario: Scenario,
+    calls: Sequence[Call],
+    weights: Sequence[float],
+    max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+) -> List[OpenLoopResult]:
+    """Send requests on the scenario's schedule and measure them.
+
+    Args:
+        client: Client to send through. It must allow ``max_in_flight``
+            requests in flight, e.g. an HTTP pool at least that large
+        scenario: Arrival process and rate profile
+        calls: Requests to pick from
+        weights: Relative frequency of each call
+        max_in_flight: Number of threads sending requests
+
+    Returns:
+        Results per stage and method, in stage order, followed by totals per
+        method when the scenario has several stages
+    """
+    rng = random.Random(scenario.seed)
+    stages = scenario.stages
+    shards: List[Dict[Tuple[int, str], OpenLoopResult]] = []
+    local = threading.local()
+    lock = threading.Lock()
+
+    def execute(call: Call, stage: int, intended: float) -> None:
+        sent = time.perf_counter()
+        error = send_call(client, call)
+        done = time.perf_counter()
+        results: Optional[Dict[Tuple[int, str], OpenLoopResult]]
+        results = getattr(local, "results", None)
+        if results is None:
+            results = local.results = {}
+            with lock:
+                shards.append(results)
+        key = (stage, call.method)
+        result = results.get(key)
+        if result is None:
+            result = results[key] = OpenLoopResult(
+                call.method, stages[stage].duration, stage=stages[stage].name
+            )
+        result.latency.record_seconds(done - intended)
+        result.service.record_seconds(done - sent)
+        if error is not None:
+            result.errors[error] += 1
+
+    cum_weights = []
+    running = 0.0
+    for weight in weights:
+        running += weight
+        cum_weights.append(running)
+    scheduled: Counter = Counter()
+    max_lag = 0.0
+    logger.info(
+        f"Running {len(stages)} stage(s) for {scenario.duration:g}s "
+        f"with {scenario.arrival} arrivals"
+    )
+    with ThreadPoolExecutor(max_in_flight, thread_name_prefix="mcp-load") as executor:
+        start = time.perf_counter()
+        for offset, stage in scenario.arrivals(rng):
+            intended = start + offset
+            delay = intended - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                max_lag = max(max_lag, -delay)
+            call = rng.choices(calls, cum_weights=cum_weights)[0]
+            scheduled[(stage, call.method)] += 1
+            executor.submit(execute, call, stage, intended)
+    if max_lag > LAG_WARNING:
+        logger.warning(
+            f"The load generator fell up to {max_lag * 1000:.1f}ms behind "
+            "schedule; latencies include this delay"
+        )
+
+    merged: Dict[Tuple[int, str], OpenLoopResult] = {}
+    for (stage, method), count in scheduled.items():
+        merged[(stage, method)] = OpenLoopResult(
+            method, stages[stage].duration, stage=stages[stage].name, scheduled=count
+        )
+    for shard in shards:
+        for key, result in shard.items():
+            merged[key].merge(result)
+    results = [merged[key] for key in sorted(merged)]
+    if len(stages) > 1:
+        totals: Dict[str, OpenLoopResult] = {}
+        for result in results:
+            total = totals.get(result.method)
+            if total is None:
+                total = totals[result.method] = OpenLoopResult(
+                    result.method, scenario.duration
+                )
+            total.merge(result)
+        results.extend(totals[method] for method in sorted(totals))
+    return results
+
+
+def format_open_loop(results: Sequence[OpenLoopResult]) -> str:
+    """Format open-loop results as a table for the terminal.
+
+    Latency percentiles are measured from the intended send time; the last
+    column is the p99 of the service time, for comparison.
+    """
+    header = (
+        f"{'stage':<16}{'method':<24}{'target/s':>10}{'req/s':>10}{'errors':>9}"
+        f"{'p50 ms':>11}{'p99 ms':>11}{'p99.9 ms':>11}{'max ms':>11}"
+        f"{'svc p99':>11}"
+    )
+    lines = [header, "-" * len(header)]
+    for result in results:
+        summary = result.latency.summary()
+        lines.append(
+            f"{result.stage:<16}{result.method:<24}{result.target_rate:>10.1f}"
+            f"{result.throughput:>10.1f}{result.error_rate:>9.2%}"
+            f"{summary['p50_ms']:>11.3f}{summary['p99_ms']:>11.3f}"
+            f"{summary['p99.9_ms']:>11.3f}{summary['max_ms']:>11.3f}"
+            f"{result.service.percentile(99) / 1000:>11.3f}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,72 @@
+"""Resource usage of a local server process, read from /proc.
+
+Only Linux exposes /proc; elsewhere a sampler cannot be created.
+"""
+
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+_PROC = "/proc"
+
+
+@dataclass(frozen=True)
+class ProcessSample:
+    """Resource usage of a process at one point in time."""
+
+    rss_bytes: int
+    cpu_seconds: float
+    open_fds: Optional[int]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the sample as JSON-serializable data."""
+        return {
+            "rss_bytes": self.rss_bytes,
+            "cpu_seconds": self.cpu_seconds,
+            "open_fds": self.open_fds,
+        }
+
+
+class ProcessSampler:
+    """Reads the memory, CPU time and open files of one process."""
+
+    def __init__(self, pid: int):
+        """Initialize the sampler.
+
+        Args:
+            pid: Id of the process to sample
+
+        Raises:
+            ValueError: If the process does not exist or /proc is unavailable
+        """
+        self.pid = pid
+        self._dir = os.path.join(_PROC, str(pid))
+        if not os.path.isdir(self._dir):
+            raise ValueError(f"Cannot read process {pid} from {_PROC}")
+        self._page_size = os.sysconf("SC_PAGE_SIZE")
+        self._ticks = os.sysconf("SC_CLK_TCK")
+
+    def sample(self) -> Optional[ProcessSample]:
+        """Read the process's current usage.
+
+        Returns:
+            The usage, or None if the process has exited. The open file count
+            is None if the process belongs to another user
+        """
+        try:
+            with open(os.path.join(self._dir, "statm")) as f:
+                rss_pages = int(f.read().split()[1])
+            with open(os.path.join(self._dir, "stat")) as f:
+                # The command name may contain spaces; fields follow its ")"
+                fields = f.read().rsplit(")", 1)[1].split()
+        except (OSError, IndexError, ValueError):
+            return None
+        # utime and stime are the 14th and 15th fields of the whole line
+        cpu_ticks = int(fields[11]) + int(fields[12])
+        try:
+            open_fds: Optional[int] = len(os.listdir(os.path.join(self._dir, "fd")))
+        except OSError:
+            open_fds = None
+        return ProcessSample(
+            rss_pages * self._page_size, cpu_ticks / self._ticks, open_fds
+        )
@@ -0,0 +1,220 @@
+"""Open-loop load scenarios: which calls to send, and at what rate over time.
+
+A scenario is a JSON object with:
+
+- ``arrival``: ``"poisson"`` (the default) for exponentially distributed gaps
+  between requests, as independent clients would produce, or ``"fixed"`` for
+  evenly spaced requests.
+- ``seed``: seed of the arrival times and of the call picked for each request.
+- ``calls``: the requests to send, each ``{"method": ..., "params": ...,
+  "weight": ...}``. Each request picks a call at random in proportion to its
+  weight (1 by default). Calls to methods that need a target, such as
+  ``tools/call``, may leave ``params`` out to use the first one the server
+  lists.
+- ``stages``: the rate profile, run one stage after the other. Rates are in
+  requests per second:
+    - ``{"profile": "constant", "rate": 50, "duration_s": 30}``
+    - ``{"profile": "ramp", "from": 10, "to": 200, "duration_s": 60}``
+    - ``{"profile": "step", "from": 50, "to": 250, "steps": 5, "duration_s": 50}``
+    - ``{"profile": "spike", "rate": 50, "peak": 400, "at_s": 10,
+      "length_s": 2, "duration_s": 30}``
+
+  Any stage accepts a ``name`` to label its results.
+
+Example scenario::
+
+    {
+        "arrival": "poisson",
+        "seed": 7,
+        "calls": [
+            {"method": "tools/call", "weight": 3},
+            {"method": "resources/read", "params": {"uri": "file:///readme.md"}}
+        ],
+        "stages": [
+            {"name": "baseline", "profile": "constant", "rate": 20,
+             "duration_s": 10},
+            {"profile": "ramp", "from": 20, "to": 200, "duration_s": 30}
+        ]
+    }
+"""
+
+import json
+import random
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+ARRIVALS = ("fixed", "poisson")
+PROFILES = ("constant", "ramp", "step", "spike")
+
+# Seconds over which the rate is taken as constant when scheduling requests
+SCHEDULE_RESOLUTION = 0.001
+
+_PROFILE_PARAMS = {
+    "constant": ("rate",),
+    "ramp": ("from", "to"),
+    "step": ("from", "to", "steps"),
+    "spike": ("rate", "peak", "at_s", "length_s"),
+}
+
+
+def _number(config: Dict[str, Any], key: str, default: Optional[float] = None):
+    value = config.get(key, default)
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+        raise ValueError(f"'{key}' must be a non-negative number")
+    return value
+
+
+class Stage:
+    """A period of the scenario with a rate that follows one profile."""
+
+    def __init__(self, config: Dict[str, Any], index: int = 0):
+        """Parse a stage.
+
+        Args:
+            config: Stage configuration
+            index: Position of the stage, used to name it when it has no name
+
+        Raises:
+            ValueError: If the configuration is invalid
+        """
+        if not isinstance(config, dict):
+            raise ValueError("A stage must be an object")
+        self.profile = config.get("profile", "constant")
+        if self.profile not in PROFILES:
+            raise ValueError(
+                f"Unknown profile '{self.profile}', "
+                f"expected one of {', '.join(PROFILES)}"
+            )
+        self.name = str(config.get("name", f"{index + 1}:{self.profile}"))
+        self.duration = _number(config, "duration_s")
+        if not self.duration:
+            raise ValueError("'duration_s' must be positive")
+        self.params = [_number(config, key) for key in _PROFILE_PARAMS[self.profile]]
+        if self.profile == "step" and int(self.params[2]) < 1:
+            raise ValueError("'steps' must be at least 1")
+
+    def rate_at(self, t: float) -> float:
+        """Return the scheduled rate ``t`` seconds into the stage."""
+        if self.profile == "constant":
+            return self.params[0]
+        if self.profile == "ramp":
+            start, end = self.params
+            return start + (end - start) * t / self.duration
+        if self.profile == "step":
+            start, end, steps = self.params
+            steps = int(steps)
+            if steps == 1:
+                return start
+            step = min(int(t / self.duration * steps), steps - 1)
+            return start + (end - start) * step / (steps - 1)
+        rate, peak, at, length = self.params
+        return peak if at <= t < at + length else rate
+
+
+class ScenarioCall:
+    """A request of the scenario, and how often it is picked."""
+
+    def __init__(self, config: Dict[str, Any]):
+        """Parse a call.
+
+        Raises:
+            ValueError: If the configuration is invalid
+        """
+        if not isinstance(config, dict) or not isinstance(config.get("method"), str):
+            raise ValueError("A call must be an object with a 'method'")
+        self.method: str = config["method"]
+        self.params: Optional[Dict[str, Any]] = config.get("params")
+        if self.params is not None and not isinstance(self.params, dict):
+            raise ValueError("'params' must be an object")
+        self.weight = _number(config, "weight", 1)
+
+
+class Scenario:
+    """An open-loop load scenario."""
+
+    def __init__(self, config: Dict[str, Any]):
+        """Parse a scenario.
+
+        Raises:
+            ValueError: If the configuration is invalid
+        """
+        if not isinstance(config, dict):
+            raise ValueError("The scenario must be an object")
+        self.arrival = config.get("arrival", "poisson")
+        if self.arrival not in ARRIVALS:
+            raise ValueError(
+                f"Unknown arrival process '{self.arrival}', "
+                f"expected one of {', '.join(ARRIVALS)}"
+            )
+        self.seed = config.get("seed", 0)
+        calls = config.get("calls")
+        if not isinstance(calls, list) or not calls:
+            raise ValueError("'calls' must be a non-empty list")
+        self.calls = [ScenarioCall(call) for call in calls]
+        if not any(call.weight for call in self.calls):
+            raise ValueError("At least one call must have a positive weight")
+        stages = config.get("stages")
+        if not isinstance(stages, list) or not stages:
+            raise ValueError("'stages' must be a non-empty list")
+        self.stages = [Stage(stage, i) for i, stage in enumerate(stages)]
+
+    @property
+    def duration(self) -> float:
+        """Total length of the stages, in seconds."""
+        return sum(stage.duration for stage in self.stages)
+
+    def arrivals(self, rng: random.Random) -> Iterator[Tuple[float, int]]:
+        """Generate the intended send time of every request.
+
+        The rate is integrated over time and a request is due each time the
+        integral grows by one (fixed arrivals) or by an exponentially
+        distributed amount (Poisson arrivals), which follows any profile,
+        including rates that start from zero.
+
+        Args:
+            rng: Generator to draw Poisson gaps from
+
+        Yields:
+            Seconds from the start of the scenario, and the index of the stage
+        """
+        poisson = self.arrival == "poisson"
+        target = rng.expovariate(1.0) if poisson else 1.0
+        area = 0.0
+        offset = 0.0
+        for index, stage in enumerate(self.stages):
+            t = 0.0
+            while t < stage.duration:
+                end = min(t + SCHEDULE_RESOLUTION, stage.duration)
+                rate = stage.rate_at((t + end) / 2)
+                while rate > 0 and area + rate * (end - t) >= target:
+                    t += (target - area) / rate
+                    yield offset + t, index
+                    area = 0.0
+                    target = rng.expovariate(1.0) if poisson else 1.0
+                area += rate * (end - t)
+                t = end
+            offset += stage.duration
+
+
+def load_scenario(path: Union[str, Path]) -> Scenario:
+    """Read a scenario file.
+
+    Raises:
+        OSError: If the file cannot be read
+        ValueError: If it is not a valid scenario
+    """
+    with open(path) as f:
+        return Scenario(json.load(f))
+
+
+def constant_scenario(
+    methods: List[str], rate: float, duration: float, arrival: str = "poisson"
+) -> Scenario:
+    """Build a scenario that sends the methods at a constant total rate."""
+    return Scenario(
+        {
+            "arrival": arrival,
+            "calls": [{"method": method} for method in methods],
+            "stages": [{"profile": "constant", "rate": rate, "duration_s": duration}],
+        }
+    )
@@ -0,0 +1,422 @@
+"""Soak testing: hours of steady traffic, watched for slow degradation.
+
+Threads cycle through the workload's calls closed-loop for the whole run.
+Latencies and errors are collected per window of a fixed length, and each
+window is summarized as it closes, together with the resource usage of the
+server process when it runs on this machine. Only the summaries are kept, so
+memory stays flat however long the run.
+
+At the end, the first and last quarters of the run are compared:
+
+- latency drift: the Mann-Whitney test on each method's latencies, flagged
+  when late requests are significantly slower and the median moved by at
+  least DRIFT_MIN_CHANGE;
+- resource growth: the Mann-Kendall trend test on the RSS and open file
+  count of each window, flagged when the upward trend is significant and adds
+  up to at least GROWTH_MIN_CHANGE over the run.
+"""
+
+import csv
+import logging
+import math
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+from mcp.client import MCPClient
+from mcp.load.bench import DEFAULT_CONCURRENCY, MethodResult, send_call
+from mcp.load.histogram import SUMMARY_PERCENTILES, HdrHistogram
+from mcp.load.process import ProcessSample, ProcessSampler
+from mcp.load.stats import mann_kendall, mann_whitney
+from mcp.load.workload import Call
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WINDOW = 60.0
+
+# Significance level of the drift and growth tests
+DRIFT_ALPHA = 0.01
+
+# Smallest relative change of the median latency reported as drift
+DRIFT_MIN_CHANGE = 0.1
+
+# Smallest relative growth of a resource over the run reported as a leak
+GROWTH_MIN_CHANGE = 0.1
+
+# Fewest windows a resource trend is tested on
+MIN_TREND_WINDOWS = 8
+
+_DURATION_UNITS = {"": 1, "s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_duration(text: str) -> float:
+    """Parse a duration such as ``90``, ``90s``, ``30m``, ``2h`` or ``1d``.
+
+    Returns:
+        The duration in seconds
+
+    Raises:
+        ValueError: If the text is not a positive duration
+    """
+    match = re.fullmatch(r"\s*(\d+(?:\.\d*)?)\s*([smhd]?)\s*", text.lower())
+    if not match or not float(match.group(1)):
+        raise ValueError(f"Invalid duration '{text}', expected e.g. 90s, 30m or 2h")
+    return float(match.group(1)) * _DURATION_UNITS[match.group(2)]
+
+
+@dataclass
+class SoakWindow:
+    """Measurements of one window of a soak run."""
+
+    index: int
+    start: float
+    duration: float
+    results: Dict[str, MethodResult] = field(default_factory=dict)
+    process: Optional[ProcessSample] = None
+    cpu_percent: Optional[float] = None
+
+
+@dataclass
+class Drift:
+    """Comparison of one method's latencies early and late in the run."""
+
+    method: str
+    early: Dict[str, Any]
+    late: Dict[str, Any]
+    slower_probability: float
+    p_value: float
+
+    @property
+    def change(self) -> float:
+        """Relative change of the median latency."""
+        early = self.early["p50_ms"]
+        return (self.late["p50_ms"] - early) / early if early else 0.0
+
+    @property
+    def significant(self) -> bool:
+        """Whether late requests are significantly and noticeably slower."""
+        return (
+            self.p_value < DRIFT_ALPHA
+            and self.slower_probability > 0.5
+            and self.change >= DRIFT_MIN_CHANGE
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the comparison as JSON-serializable data."""
+        return {
+            "method": self.method,
+            "early": self.early,
+            "late": self.late,
+            "p50_change": self.change,
+            "slower_probability": self.slower_probability,
+            "p_value": self.p_value,
+            "significant": self.significant,
+        }
+
+
+@dataclass
+class Growth:
+    """Trend of one server resource over the run."""
+
+    resource: str
+    first: float
+    last: float
+    slope_per_hour: float
+    p_value: float
+    hours: float
+
+    @property
+    def change(self) -> float:
+        """Growth over the run estimated from the trend, relative to the start."""
+        return self.slope_per_hour * self.hours / self.first if self.first else 0.0
+
+    @property
+    def significant(self) -> bool:
+        """Whether the resource grows significantly and noticeably."""
+        return (
+            self.p_value < DRIFT_ALPHA
+            and self.slope_per_hour > 0
+            and self.change >= GROWTH_MIN_CHANGE
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the trend as JSON-serializable data."""
+        return {
+            "resource": self.resource,
+            "first": self.first,
+            "last": self.last,
+            "slope_per_hour": self.slope_per_hour,
+            "change": self.change,
+            "p_value": self.p_value,
+            "significant": self.significant,
+        }
+
+
+@dataclass
+class SoakReport:
+    """Outcome of a soak run."""
+
+    windows: int
+    drift: List[Drift] = field(default_factory=list)
+    growth: List[Growth] = field(default_factory=list)
+
+    @property
+    def degraded(self) -> bool:
+        """Whether any latency drift or resource growth was flagged."""
+        return any(d.significant for d in self.drift) or any(
+            g.significant for g in self.growth
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the outcome as JSON-serializable data."""
+        return {
+            "windows": self.windows,
+            "degraded": self.degraded,
+            "drift": [d.to_dict() for d in self.drift],
+            "growth": [g.to_dict() for g in self.growth],
+        }
+
+
+class TimeSeriesWriter:
+    """Writes one CSV row per method and window, as each window closes.
+
+    Rows are flushed as they are written, so the series survives a run that
+    is cut short.
+    """
+
+    LATENCIES = [f"p{p:g}_ms" for p in SUMMARY_PERCENTILES] + ["max_ms"]
+    COLUMNS = (
+        ["window", "t_s", "method", "requests", "rps", "error_rate"]
+        + LATENCIES
+        + ["rss_mb", "cpu_percent", "open_fds"]
+    )
+
+    def __init__(self, path: Union[str, Path]):
+        """Create the file and write the header."""
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(path, "w", newline="")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(self.COLUMNS)
+
+    def __enter__(self) -> "TimeSeriesWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the file."""
+        self._file.close()
+
+    def write(self, window: SoakWindow) -> None:
+        """Write the rows of a window."""
+        process = window.process
+        usage = [
+            f"{process.rss_bytes / 2**20:.1f}" if process else "",
+            f"{window.cpu_percent:.1f}" if window.cpu_percent is not None else "",
+            process.open_fds if process and process.open_fds is not None else "",
+        ]
+        for method in sorted(window.results):
+            result = window.results[method]
+            summary = result.latency.summary()
+            self._writer.writerow(
+                [
+                    window.index,
+                    f"{window.start:g}",
+                    method,
+                    result.requests,
+                    f"{result.throughput:.2f}",
+                    f"{result.error_rate:.6f}",
+                ]
+                + [f"{summary[key]:.3f}" for key in self.LATENCIES]
+                + usage
+            )
+        if not window.results:
+            self._writer.writerow(
+                [window.index, f"{window.start:g}", "", 0, "0", ""]
+                + [""] * len(self.LATENCIES)
+                + usage
+            )
+        self._file.flush()
+
+
+class _WindowRecorder:
+    """Results of the open windows, shared by the sending threads."""
+
+    def __init__(self, start: float, window: float, count: int):
+        self.start = start
+        self.window = window
+        self.count = count
+        self._closed = 0
+        self._lock = threading.Lock()
+        self._windows: Dict[int, Dict[str, MethodResult]] = {}
+
+    def record(self, method: str, seconds: float, error: Any, now: float) -> None:
+        index = min(int((now - self.start) / self.window), self.count - 1)
+        with self._lock:
+            # A request that completes as its window closes counts in the next
+            index = max(index, self._closed)
+            results = self._windows.setdefault(index, {})
+            result = results.get(method)
+            if result is None:
+                result = results[method] = MethodResult(method, self.window)
+            result.latency.record_seconds(seconds)
+            if error is not None:
+                result.errors[error] += 1
+
+    def close(self, index: int) -> Dict[str, MethodResult]:
+        with self._lock:
+            self._closed = index + 1
+            return self._windows.pop(index, {})
+
+
+def _growth(resource: str, values: Sequence[float], window: float) -> Optional[Growth]:
+    if len(values) < MIN_TREND_WINDOWS:
+        return None
+    slope, p_value = mann_kendall(values)
+    per_hour = 3600 / window
+    hours = (len(values) - 1) / per_hour
+    return Growth(resource, values[0], values[-1], slope * per_hour, p_value, hours)
+
+
+def run_soak(
+    client: MCPClient,
+    calls: Sequence[Call],
+    duration: float,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    window: float = DEFAULT_WINDOW,
+    sampler: Optional[ProcessSampler] = None,
+    on_window: Optional[Callable[[SoakWindow], None]] = None,
+) -> SoakReport:
+    """Cycle through the calls for a long time and look for degradation.
+
+    Args:
+        client: Client to send through. It must allow ``concurrency``
+            requests in flight, e.g. an HTTP pool at least that large
+        calls: Workload to cycle through
+        duration: Seconds to run for
+        concurrency: Number of requests kept in flight
+        window: Seconds covered by each window of statistics
+        sampler: Sampler of the server process, if it runs on this machine
+        on_window: Called with each window as it closes, e.g. to save it
+
+    Returns:
+        The drift and growth found
+    """
+    count = max(1, math.ceil(duration / window))
+    # Windows compared for drift: the first and last quarter of the run
+    edge = max(1, count // 4)
+    early: Dict[str, HdrHistogram] = {}
+    late: Dict[str, HdrHistogram] = {}
+    rss: List[float] = []
+    fds: List[float] = []
+
+    start = time.perf_counter()
+    stop = start + duration
+    recorder = _WindowRecorder(start, window, count)
+
+    def worker(offset: int) -> None:
+        turn = offset
+        while True:
+            sent = time.perf_counter()
+            if sent >= stop:
+                break
+            call = calls[turn % len(calls)]
+            turn += 1
+            error = send_call(client, call)
+            done = time.perf_counter()
+            recorder.record(call.method, done - sent, error, done)
+
+    threads = [
+        threading.Thread(target=worker, args=(i,), name=f"mcp-soak-{i}", daemon=True)
+        for i in range(concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    logger.info(
+        f"Soaking {len(calls)} method(s) for {duration:g}s in {count} "
+        f"window(s) of {window:g}s at concurrency {concurrency}"
+    )
+
+    previous = sampler.sample() if sampler else None
+    previous_at = start
+    for index in range(count):
+        if index == count - 1:
+            for thread in threads:
+                thread.join()
+        else:
+            time.sleep(max(0.0, start + (index + 1) * window - time.perf_counter()))
+        length = min(window, duration - index * window)
+        current = SoakWindow(index, index * window, length, recorder.close(index))
+        for result in current.results.values():
+            result.duration = length
+
+        if sampler is not None:
+            now = time.perf_counter()
+            current.process = sampler.sample()
+            if current.process is None:
+                logger.warning(f"Server process {sampler.pid} is gone")
+                sampler = None
+            else:
+                if previous is not None:
+                    used = current.process.cpu_seconds - previous.cpu_seconds
+                    current.cpu_percent = used / (now - previous_at) * 100
+                previous, previous_at = current.process, now
+                rss.append(current.process.rss_bytes)
+                if current.process.open_fds is not None:
+                    fds.append(current.process.open_fds)
+
+        if index < edge or index >= count - edge:
+            totals = early if index < edge else late
+            for method, result in current.results.items():
+                totals.setdefault(method, HdrHistogram()).merge(result.latency)
+        if on_window is not None:
+            on_window(current)
+
+    report = SoakReport(count)
+    if count < 2:
+        logger.warning("The run is a single window; no drift can be measured")
+    else:
+        for method in early.keys() & late.keys():
+            probability, p_value = mann_whitney(early[method], late[method])
+            report.drift.append(
+                Drift(
+                    method,
+                    early[method].summary(),
+                    late[method].summary(),
+                    probability,
+                    p_value,
+                )
+            )
+        report.drift.sort(key=lambda d: d.method)
+    for resource, values in (("rss_bytes", rss), ("open_fds", fds)):
+        growth = _growth(resource, values, window)
+        if growth is not None:
+            report.growth.append(growth)
+    return report
+
+
+def format_report(report: SoakReport) -> str:
+    """Format the drift and growth found as text for the terminal."""
+    lines = [
+        f"{'method':<28}{'early p50':>11}{'late p50':>11}{'early p99':>11}"
+        f"{'late p99':>11}{'change':>9}{'p-value':>10}  verdict"
+    ]
+    lines.append("-" * len(lines[0]))
+    for drift in report.drift:
+        lines.append(
+            f"{drift.method:<28}{drift.early['p50_ms']:>11.3f}"
+            f"{drift.late['p50_ms']:>11.3f}{drift.early['p99_ms']:>11.3f}"
+            f"{drift.late['p99_ms']:>11.3f}{drift.change:>9.1%}"
+            f"{drift.p_value:>10.2g}  " + ("DRIFT" if drift.significant else "stable")
+        )
+    for growth in report.growth:
+        lines.append(
+            f"{growth.resource}: {growth.first:g} -> {growth.last:g}, "
+            f"{growth.slope_per_hour:+.4g}/h (p={growth.p_value:.2g}): "
+            + ("GROWING" if growth.significant else "stable")
+        )
+    return "\n".join(lines)
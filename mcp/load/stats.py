@@ -0,0 +1,94 @@
+"""Nonparametric tests used to tell real drift from noise.
+
+Latencies are heavily skewed and process samples are few and noisy, so
+neither is assumed to follow any distribution:
+
+- The Mann-Whitney U test compares two latency histograms and tells whether
+  values from one tend to be larger than values from the other. It is computed
+  from the bucket counts, with buckets treated as ties.
+- The Mann-Kendall test tells whether a series trends up or down over time,
+  and Sen's slope estimates by how much.
+
+Both use the normal approximation, which is accurate from a few dozen values
+for Mann-Whitney and about ten for Mann-Kendall.
+"""
+
+import math
+from typing import Dict, Sequence, Tuple
+
+from mcp.load.histogram import HdrHistogram
+
+
+def _two_sided_p(z: float) -> float:
+    return math.erfc(abs(z) / math.sqrt(2))
+
+
+def mann_whitney(before: HdrHistogram, after: HdrHistogram) -> Tuple[float, float]:
+    """Compare two histograms with the Mann-Whitney U test.
+
+    Args:
+        before: Values of the first sample
+        after: Values of the second sample, with the same range
+
+    Returns:
+        The probability that a value of ``after`` is larger than one of
+        ``before`` (0.5 when neither tends to be larger), and the two-sided
+        p-value of the difference
+    """
+    n1, n2 = before.total, after.total
+    if not n1 or not n2:
+        return 0.5, 1.0
+    u = 0.0
+    below = 0
+    ties = 0
+    for a, b in zip(before.counts, after.counts):
+        t = a + b
+        if t > 1:
+            ties += t**3 - t
+        if b:
+            u += b * (below + a / 2)
+        below += a
+    n = n1 + n2
+    variance = n1 * n2 / 12 * ((n + 1) - ties / (n * (n - 1) or 1))
+    if variance <= 0:
+        return u / (n1 * n2), 1.0
+    z = (u - n1 * n2 / 2) / math.sqrt(variance)
+    return u / (n1 * n2), _two_sided_p(z)
+
+
+def mann_kendall(values: Sequence[float]) -> Tuple[float, float]:
+    """Test a series taken at regular intervals for a monotonic trend.
+
+    Args:
+        values: The series, in time order
+
+    Returns:
+        Sen's slope, the median change per interval, and the two-sided
+        p-value of the trend
+    """
+    n = len(values)
+    if n < 3:
+        return 0.0, 1.0
+    s = 0
+    slopes = []
+    for i in range(n - 1):
+        for j in range(i + 1, n):
+            diff = values[j] - values[i]
+            s += (diff > 0) - (diff < 0)
+            slopes.append(diff / (j - i))
+    slopes.sort()
+    middle = len(slopes) // 2
+    if len(slopes) % 2:
+        slope = slopes[middle]
+    else:
+        slope = (slopes[middle - 1] + slopes[middle]) / 2
+
+    counts: Dict[float, int] = {}
+    for value in values:
+        counts[value] = counts.get(value, 0) + 1
+    ties = sum(t * (t - 1) * (2 * t + 5) for t in counts.values())
+    variance = (n * (n - 1) * (2 * n + 5) - ties) / 18
+    if variance <= 0 or s == 0:
+        return slope, 1.0
+    z = (s - 1 if s > 0 else s + 1) / math.sqrt(variance)
+    return slope, _two_sided_p(z)
@@ -0,0 +1,114 @@
+"""Calls that exercise each MCP method of a server under load."""
+
+import logging
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from mcp.client import MCPClient
+from mcp.errors import MCPError
+
+logger = logging.getLogger(__name__)
+
+# Methods exercised when none are named, in the order they are run
+DEFAULT_METHODS = (
+    "capabilities/get",
+    "tools/list",
+    "tools/call",
+    "resources/list",
+    "resources/read",
+    "resources/templates/list",
+    "prompts/list",
+    "prompts/get",
+    "completion/complete",
+)
+
+
+@dataclass(frozen=True)
+class Call:
+    """One JSON-RPC request to send repeatedly."""
+
+    method: str
+    params: Optional[Dict[str, Any]] = None
+
+    def send(self, client: MCPClient) -> Any:
+        """Send the request and return its result."""
+        return client.send(self.method, self.params)
+
+
+def _first_tool_call(client: MCPClient) -> Optional[Dict[str, Any]]:
+    tools = client.send("tools/list").get("tools") or []
+    if not tools:
+        return None
+    tool = tools[0]
+    required = tool.get("inputSchema", {}).get("required", [])
+    return {"name": tool["name"], "arguments": {key: "test" for key in required}}
+
+
+def _first_resource_read(client: MCPClient) -> Optional[Dict[str, Any]]:
+    resources = client.send("resources/list").get("resources") or []
+    return {"uri": resources[0]["uri"]} if resources else None
+
+
+def _first_prompt(client: MCPClient) -> Optional[Dict[str, Any]]:
+    prompts = client.send("prompts/list").get("prompts") or []
+    return next((p for p in prompts if p.get("arguments")), None)
+
+
+def _first_prompt_get(client: MCPClient) -> Optional[Dict[str, Any]]:
+    prompt = _first_prompt(client)
+    if prompt is None:
+        return None
+    arguments = {a["name"]: "test" for a in prompt["arguments"] if a.get("required")}
+    return {"name": prompt["name"], "arguments": arguments}
+
+
+def _first_completion(client: MCPClient) -> Optional[Dict[str, Any]]:
+    prompt = _first_prompt(client)
+    if prompt is None:
+        return None
+    return {
+        "ref": {"type": "ref/prompt", "name": prompt["name"]},
+        "argument": {"name": prompt["arguments"][0]["name"], "value": "ex"},
+    }
+
+
+# Builders of the params of methods that need some, from what the server lists
+PARAM_BUILDERS: Dict[str, Callable[[MCPClient], Optional[Dict[str, Any]]]] = {
+    "tools/call": _first_tool_call,
+    "resources/read": _first_resource_read,
+    "prompts/get": _first_prompt_get,
+    "completion/complete": _first_completion,
+}
+
+
+def discover_calls(
+    client: MCPClient, methods: Sequence[str] = DEFAULT_METHODS
+) -> List[Call]:
+    """Build a call for each method, picking targets from the server's lists.
+
+    Methods that need a tool, resource or prompt the server does not have, or
+    whose lists cannot be fetched, are left out with a warning.
+
+    Args:
+        client: Client connected to the server under test
+        methods: Methods to build calls for
+
+    Returns:
+        The calls, in the order of ``methods``
+    """
+    calls = []
+    for method in methods:
+        builder = PARAM_BUILDERS.get(method)
+        if builder is None:
+            calls.append(Call(method))
+            continue
+        try:
+            params = builder(client)
+        except (MCPError, KeyError, TypeError, AttributeError) as e:
+            logger.warning(f"Skipping {method}: could not pick a target: {e}")
+            continue
+        if params is None:
+            logger.warning(f"Skipping {method}: the server lists nothing to call")
+            continue
+        calls.append(Call(method, params))
+    return calls
@@ -0,0 +1,125 @@
+"""Splitting the compliance suite into shards for parallel workers.
+
+Test files are grouped by the feature their name starts with (``prompts``,
+``resources``, ``tools``, ``completion``, ...), and each group runs whole on
+one worker, so tests of one feature never race each other for server state.
+Groups are handed out longest first, each to the worker with the least work
+so far, using the durations recorded in the previous compliance report. This
+greedy schedule finishes within 4/3 of the best possible makespan.
+
+Groups in EXCLUSIVE_GROUPS load the server on purpose. A server that limits
+per address or account, rather than per X-Client-Id, would throttle the tests
+of other workers running meanwhile, so they run alone after the others.
+"""
+
+import json
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# Estimated seconds of a group that has never run, when no group has
+DEFAULT_GROUP_DURATION = 1.0
+
+# Groups run alone once every other group is done
+EXCLUSIVE_GROUPS = ("rate",)
+
+
+@dataclass
+class Shard:
+    """Test files run by one worker."""
+
+    files: List[str] = field(default_factory=list)
+    groups: List[str] = field(default_factory=list)
+    estimate: float = 0.0
+
+
+def file_group(path: Union[str, Path]) -> str:
+    """Return the group of a test file: the first word after ``test_``."""
+    stem = Path(path).stem
+    if stem.startswith("test_"):
+        stem = stem[len("test_") :]
+    return stem.split("_", 1)[0]
+
+
+def discover_groups(test_dir: Union[str, Path]) -> Dict[str, List[str]]:
+    """Group the test files of a directory.
+
+    Returns:
+        The files of each group, sorted
+    """
+    groups: Dict[str, List[str]] = {}
+    for path in sorted(Path(test_dir).glob("test_*.py")):
+        groups.setdefault(file_group(path), []).append(path.as_posix())
+    return groups
+
+
+def split_exclusive(
+    groups: Dict[str, List[str]],
+) -> Tuple[Dict[str, List[str]], Dict[str, List[str]]]:
+    """Separate the groups that must run alone from the others.
+
+    Returns:
+        The groups that may run in parallel, and the groups to run alone
+    """
+    shared = {g: files for g, files in groups.items() if g not in EXCLUSIVE_GROUPS}
+    exclusive = {g: files for g, files in groups.items() if g in EXCLUSIVE_GROUPS}
+    return shared, exclusive
+
+
+def load_durations(report_path: Union[str, Path]) -> Dict[str, float]:
+    """Read how long each test file took from a previous compliance report.
+
+    Returns:
+        Seconds per test file, empty if there is no usable report
+    """
+    try:
+        with open(report_path) as f:
+            results = json.load(f)["results"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return {}
+    durations: Dict[str, float] = {}
+    for result in results:
+        path = result.get("nodeid", "").split("::", 1)[0]
+        durations[path] = durations.get(path, 0.0) + (result.get("duration") or 0.0)
+    return durations
+
+
+def schedule(
+    groups: Dict[str, List[str]], durations: Dict[str, float], workers: int
+) -> List[Shard]:
+    """Assign groups to workers, longest first, to the least loaded one.
+
+    Args:
+        groups: Files of each group
+        durations: Past seconds per test file; groups with no history are
+            estimated at the mean of the others
+        workers: Number of workers
+
+    Returns:
+        One shard per worker that has work, at most one per group
+    """
+    estimates = {}
+    for group, files in groups.items():
+        known = [durations[f] for f in files if f in durations]
+        if known:
+            estimates[group] = sum(known)
+    fallback = (
+        sum(estimates.values()) / len(estimates)
+        if estimates
+        else DEFAULT_GROUP_DURATION
+    )
+    for group in groups:
+        if group not in estimates:
+            logger.debug(f"No past duration for the {group} tests")
+            estimates[group] = fallback
+
+    shards = [Shard() for _ in range(max(1, min(workers, len(groups))))]
+    for group in sorted(groups, key=lambda g: (-estimates[g], g)):
+        shard = min(shards, key=lambda s: s.estimate)
+        shard.files.extend(groups[group])
+        shard.groups.append(group)
+        shard.estimate += estimates[group]
+    return [shard for shard in shards if shard.files]
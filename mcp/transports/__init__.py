@@ -0,0 +1,8 @@
+"""Transports that carry JSON-RPC messages between MCPClient and a server."""
+
+from .asgi import ASGITransport
+from .base import MultiplexingTransport, Transport
+from .http import HTTPTransport
+from .sse import SSETransport
+from .stdio import StdioTransport
+from .websocket import WebSocketTransport
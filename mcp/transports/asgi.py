@@ -0,0 +1,163 @@
+"""In-process transport that calls an ASGI application directly."""
+
+import asyncio
+import json
+import logging
+import threading
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from mcp.errors import MCPError
+from .base import DEFAULT_CONNECT_TIMEOUT, DEFAULT_READ_TIMEOUT, Message, Transport
+
+logger = logging.getLogger(__name__)
+
+
+class ASGITransport(Transport):
+    """Deliver JSON-RPC messages to an ASGI app in this process.
+
+    Each message is handed to the app as an HTTP POST scope on a private event
+    loop thread, so there are no sockets, ports or server startup to wait for.
+    The app's lifespan startup runs when the transport is created and its
+    shutdown runs on close.
+    """
+
+    def __init__(
+        self,
+        app: Callable,
+        path: str = "/",
+        read_timeout: Optional[float] = DEFAULT_READ_TIMEOUT,
+    ):
+        """Start the event loop thread and the app's lifespan.
+
+        Args:
+            app: ASGI application, e.g. ``mock_server.server.app``
+            path: Path the JSON-RPC endpoint is mounted at
+            read_timeout: Seconds to wait for each reply, or None to wait forever
+        """
+        super().__init__()
+        self.app = app
+        self.path = path
+        self.read_timeout = read_timeout
+        self._state: Dict[str, Any] = {}
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="mcp-asgi-loop", daemon=True
+        )
+        self._thread.start()
+        self._lifespan_task: Optional[asyncio.Future] = None
+        self._call(self._lifespan("startup"), DEFAULT_CONNECT_TIMEOUT)
+
+    def _call(self, coroutine, timeout: Optional[float]) -> Any:
+        """Run a coroutine on the loop thread and wait for its result."""
+        future = asyncio.run_coroutine_threadsafe(coroutine, self._loop)
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise MCPError(f"Request timed out after {timeout}s")
+
+    async def _lifespan(self, event: str) -> None:
+        """Send a lifespan event and wait for the app to acknowledge it."""
+        if self._lifespan_task is None:
+            self._lifespan_in: asyncio.Queue = asyncio.Queue()
+            self._lifespan_out: asyncio.Queue = asyncio.Queue()
+            scope = {
+                "type": "lifespan",
+                "asgi": {"version": "3.0"},
+                "state": self._state,
+            }
+            self._lifespan_task = asyncio.ensure_future(
+                self.app(scope, self._lifespan_in.get, self._lifespan_out.put)
+            )
+        elif self._lifespan_task.done():
+            return
+
+        await self._lifespan_in.put({"type": f"lifespan.{event}"})
+        reply = asyncio.ensure_future(self._lifespan_out.get())
+        await asyncio.wait(
+            {reply, self._lifespan_task}, return_when=asyncio.FIRST_COMPLETED
+        )
+        if not reply.done():
+            # The app returned or raised instead of answering: no lifespan support
+            reply.cancel()
+            return
+        message = reply.result()
+        if message["type"] == f"lifespan.{event}.failed":
+            raise MCPError(f"ASGI app {event} failed: {message.get('message', '')}")
+
+    async def _request(self, body: bytes) -> Tuple[int, bytes]:
+        """Run one HTTP POST through the app and return its status and body."""
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "POST",
+            "scheme": "http",
+            "path": self.path,
+            "raw_path": self.path.encode("ascii"),
+            "query_string": b"",
+            "root_path": "",
+            "headers": [
+                (b"host", b"in-process"),
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("ascii")),
+            ],
+            "client": ("127.0.0.1", 0),
+            "server": ("in-process", 80),
+            "state": dict(self._state),
+        }
+        request_sent = False
+        response_complete = asyncio.Event()
+        status = 500
+        chunks = []
+
+        async def receive() -> Dict[str, Any]:
+            nonlocal request_sent
+            if not request_sent:
+                request_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            await response_complete.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message: Dict[str, Any]) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+                if not message.get("more_body", False):
+                    response_complete.set()
+
+        await self.app(scope, receive, send)
+        return status, b"".join(chunks)
+
+    def send(self, message: Message) -> Any:
+        """Pass a message to the app and return the decoded JSON reply."""
+        try:
+            logger.debug(f"Sending request to ASGI app: {message}")
+            status, content = self._call(
+                self._request(json.dumps(message).encode("utf-8")), self.read_timeout
+            )
+            data = json.loads(content)
+            logger.debug(f"Received response: {data}")
+            return data
+        except json.JSONDecodeError as e:
+            logger.error(f"Invalid JSON response (status {status}): {e}")
+            raise MCPError(f"Invalid JSON response: {e}")
+        except MCPError:
+            raise
+        except Exception as e:
+            logger.error(f"Request failed: {e}")
+            raise MCPError(f"Request failed: {e}")
+
+    def close(self) -> None:
+        """Run the app's lifespan shutdown and stop the event loop thread."""
+        if not self._loop.is_running():
+            return
+        try:
+            self._call(self._lifespan("shutdown"), DEFAULT_CONNECT_TIMEOUT)
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=DEFAULT_CONNECT_TIMEOUT)
+            self._loop.close()
@@ -0,0 +1,212 @@
+"""Base transport interfaces."""
+
+import json
+import logging
+import threading
+from collections import defaultdict
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from mcp.errors import MCPError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_SIZE = 10
+DEFAULT_CONNECT_TIMEOUT = 10.0
+DEFAULT_READ_TIMEOUT = 60.0
+
+Message = Union[Dict[str, Any], List[Dict[str, Any]]]
+NotificationHandler = Callable[[Dict[str, Any]], None]
+
+
+class Transport:
+    """Delivers JSON-RPC messages to an MCP server.
+
+    A transport takes one outgoing message (a request object or a batch array),
+    delivers it, and returns the decoded reply. Transport failures are raised as
+    MCPError; JSON-RPC level errors are left for the client to interpret.
+
+    Transports that hold a channel open to the server also deliver server
+    notifications to handlers registered with ``on_notification``.
+    """
+
+    supports_notifications = False
+
+    def __init__(self):
+        self._notification_handlers: Dict[Optional[str], List[NotificationHandler]] = (
+            defaultdict(list)
+        )
+        self._handlers_lock = threading.Lock()
+
+    def send(self, message: Message) -> Any:
+        """Send a message and return the decoded reply."""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Release any resources held by the transport."""
+        pass
+
+    def __enter__(self) -> "Transport":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def on_notification(
+        self, method: Optional[str], handler: NotificationHandler
+    ) -> None:
+        """Register a handler for server notifications.
+
+        Args:
+            method: Notification method to handle, or None for all notifications
+            handler: Called with the full notification message
+
+        Raises:
+            MCPError: If the transport cannot receive notifications
+        """
+        if not self.supports_notifications:
+            raise MCPError(f"{type(self).__name__} cannot receive server notifications")
+        with self._handlers_lock:
+            self._notification_handlers[method].append(handler)
+
+    def remove_notification_handler(
+        self, method: Optional[str], handler: NotificationHandler
+    ) -> None:
+        """Unregister a handler added with ``on_notification``."""
+        with self._handlers_lock:
+            handlers = self._notification_handlers.get(method, [])
+            if handler in handlers:
+                handlers.remove(handler)
+
+    def wait_for_notification(
+        self, method: Optional[str], timeout: Optional[float] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Block until a notification arrives.
+
+        Args:
+            method: Notification method to wait for, or None for any
+            timeout: Seconds to wait, or None to wait forever
+
+        Returns:
+            The notification message, or None if the timeout expired
+        """
+        received = []
+        event = threading.Event()
+
+        def handler(message: Dict[str, Any]) -> None:
+            received.append(message)
+            event.set()
+
+        self.on_notification(method, handler)
+        try:
+            event.wait(timeout)
+            return received[0] if received else None
+        finally:
+            self.remove_notification_handler(method, handler)
+
+    def _dispatch_notification(self, message: Dict[str, Any]) -> None:
+        """Call the handlers registered for a notification."""
+        method = message.get("method")
+        with self._handlers_lock:
+            handlers = list(self._notification_handlers.get(method, []))
+            handlers += self._notification_handlers.get(None, [])
+        for handler in handlers:
+            try:
+                handler(message)
+            except Exception:
+                logger.exception(f"Notification handler failed for {method}")
+
+
+class MultiplexingTransport(Transport):
+    """Base class for transports that share one long-lived channel.
+
+    Requests are written as they are sent, without waiting for earlier
+    replies. A reader passes every incoming message to ``_handle_incoming``,
+    which resolves the waiting request by id or dispatches it as a
+    notification. Subclasses implement ``_write`` and start the reader.
+    """
+
+    supports_notifications = True
+
+    def __init__(self, read_timeout: Optional[float] = DEFAULT_READ_TIMEOUT):
+        super().__init__()
+        self.read_timeout = read_timeout
+        self._pending: Dict[Any, Future] = {}
+        self._pending_lock = threading.Lock()
+        self._closed = False
+
+    def _write(self, text: str) -> None:
+        """Write one encoded message to the channel."""
+        raise NotImplementedError
+
+    def send(self, message: Message) -> Any:
+        """Send a message and wait for its reply.
+
+        Batch entries are pipelined as individual requests and their replies
+        collected into a list. Notifications are written without waiting.
+        """
+        if isinstance(message, list):
+            submitted = [(m.get("id"), self._submit(m)) for m in message]
+            return [self._wait(id, future) for id, future in submitted if future]
+        future = self._submit(message)
+        if future is None:
+            return None
+        return self._wait(message.get("id"), future)
+
+    def _submit(self, message: Dict[str, Any]) -> Optional[Future]:
+        """Write a message and return the future its reply will resolve."""
+        future = None
+        with self._pending_lock:
+            if self._closed:
+                raise MCPError("Transport is closed")
+            if "id" in message:
+                future = Future()
+                self._pending[message["id"]] = future
+        try:
+            logger.debug(f"Sending message: {message}")
+            self._write(json.dumps(message))
+        except Exception as e:
+            with self._pending_lock:
+                self._pending.pop(message.get("id"), None)
+            logger.error(f"Request failed: {e}")
+            raise MCPError(f"Request failed: {e}")
+        return future
+
+    def _wait(self, id: Any, future: Future) -> Any:
+        """Wait for a submitted request's reply."""
+        try:
+            return future.result(timeout=self.read_timeout)
+        except FutureTimeoutError:
+            with self._pending_lock:
+                self._pending.pop(id, None)
+            raise MCPError(f"Request {id} timed out after {self.read_timeout}s")
+
+    def _handle_incoming(self, text: str) -> None:
+        """Route one incoming message to its waiting request or handlers."""
+        try:
+            data = json.loads(text)
+        except json.JSONDecodeError as e:
+            logger.error(f"Invalid JSON message: {e}")
+            return
+        logger.debug(f"Received message: {data}")
+
+        for message in data if isinstance(data, list) else [data]:
+            if not isinstance(message, dict):
+                logger.warning(f"Ignoring malformed message: {message}")
+            elif "method" in message and message.get("id") is None:
+                self._dispatch_notification(message)
+            else:
+                with self._pending_lock:
+                    future = self._pending.pop(message.get("id"), None)
+                if future is None:
+                    logger.warning(f"Ignoring reply for unknown id: {message}")
+                else:
+                    future.set_result(message)
+
+    def _fail_pending(self, error: MCPError) -> None:
+        """Fail every outstanding request, e.g. when the channel closes."""
+        with self._pending_lock:
+            self._closed = True
+            pending, self._pending = self._pending, {}
+        for future in pending.values():
+            future.set_exception(error)
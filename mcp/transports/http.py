@@ -0,0 +1,182 @@
+"""HTTP POST transport backed by a pooled keep-alive session."""
+
+import json
+import logging
+import threading
+from typing import Any, Callable, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.util.retry import Retry
+
+from mcp.errors import MCPError
+from .base import (
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_POOL_SIZE,
+    DEFAULT_READ_TIMEOUT,
+    Message,
+    Transport,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _counting_connection(base: type, count: Callable[[bool], None]) -> type:
+    """Subclass an urllib3 connection class to report if each request opened it.
+
+    Args:
+        base: Connection class to extend
+        count: Called as each request is sent, with True if the connection
+            was opened for it
+    """
+
+    class CountingConnection(base):
+        _fresh = False
+
+        def connect(self) -> None:
+            super().connect()
+            self._fresh = True
+
+        def request(self, *args, **kwargs):
+            # HTTPS connections are opened before the request, plain HTTP
+            # ones while it is sent
+            count(self._fresh or self.sock is None)
+            try:
+                return super().request(*args, **kwargs)
+            finally:
+                self._fresh = False
+
+    return CountingConnection
+
+
+class CountingHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter that records whether each request opened or reused a connection.
+
+    Each connection tells, as a request is sent on it, whether it was opened
+    for that request, so the counts hold however many threads share the pool.
+
+    Pooled keep-alive connections the server closed while idle are noticed
+    and replaced before a request is sent on them. A request is tried once
+    more only when its connection could not be opened at all, so nothing was
+    sent. A connection that fails once the request is on its way, such as a
+    reset while waiting for the reply, is not retried, since the server may
+    already have acted on the request.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.new_connections = 0
+        self.reused_connections = 0
+        self.stale_connections = 0
+        self._stats_lock = threading.Lock()
+        self._connection_classes = {
+            HTTPConnection: _counting_connection(HTTPConnection, self._count),
+            HTTPSConnection: _counting_connection(HTTPSConnection, self._count),
+        }
+        kwargs.setdefault(
+            "max_retries",
+            Retry(total=1, connect=1, read=False, status=0, other=0, redirect=False),
+        )
+        super().__init__(*args, **kwargs)
+
+    def send(
+        self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None
+    ):
+        pool = self.get_connection_with_tls_context(
+            request, verify, proxies=proxies, cert=cert
+        )
+        counting = self._connection_classes.get(pool.ConnectionCls)
+        if counting is not None:
+            pool.ConnectionCls = counting
+        response = super().send(
+            request,
+            stream=stream,
+            timeout=timeout,
+            verify=verify,
+            cert=cert,
+            proxies=proxies,
+        )
+        retries = getattr(response.raw, "retries", None)
+        if retries is not None and retries.history:
+            logger.debug(f"Connection to {request.url} failed to open, retried")
+            with self._stats_lock:
+                self.stale_connections += len(retries.history)
+        return response
+
+    def _count(self, new: bool) -> None:
+        with self._stats_lock:
+            if new:
+                self.new_connections += 1
+            else:
+                self.reused_connections += 1
+
+
+class HTTPTransport(Transport):
+    """Send JSON-RPC messages as HTTP POST requests over pooled connections."""
+
+    def __init__(
+        self,
+        server_url: str,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        connect_timeout: Optional[float] = DEFAULT_CONNECT_TIMEOUT,
+        read_timeout: Optional[float] = DEFAULT_READ_TIMEOUT,
+        headers: Optional[Dict[str, str]] = None,
+    ):
+        """Initialize the transport.
+
+        Args:
+            server_url: URL of the MCP server
+            pool_size: Maximum number of keep-alive connections kept per host
+            connect_timeout: Seconds to wait for a connection, or None to wait forever
+            read_timeout: Seconds to wait for a response, or None to wait forever
+            headers: Extra HTTP headers sent with every request
+        """
+        super().__init__()
+        self.server_url = server_url
+        self.timeout = (connect_timeout, read_timeout)
+        self.adapter = CountingHTTPAdapter(
+            pool_connections=1, pool_maxsize=pool_size, pool_block=False
+        )
+        self.session = requests.Session()
+        self.session.headers.update(headers or {})
+        self.session.mount("http://", self.adapter)
+        self.session.mount("https://", self.adapter)
+
+    @property
+    def new_connections(self) -> int:
+        """Number of requests that had to open a new connection."""
+        return self.adapter.new_connections
+
+    @property
+    def reused_connections(self) -> int:
+        """Number of requests served over an existing keep-alive connection."""
+        return self.adapter.reused_connections
+
+    def connection_stats(self) -> Dict[str, int]:
+        """Return connection counters for this transport."""
+        return {
+            "new": self.new_connections,
+            "reused": self.reused_connections,
+            "stale": self.adapter.stale_connections,
+        }
+
+    def send(self, message: Message) -> Any:
+        """POST a message to the server and return the decoded JSON reply."""
+        try:
+            logger.debug(f"Sending request to {self.server_url}: {message}")
+            response = self.session.post(
+                self.server_url, json=message, timeout=self.timeout
+            )
+            data = response.json()
+            logger.debug(f"Received response: {data}")
+            return data
+        except json.JSONDecodeError as e:
+            logger.error(f"Invalid JSON response: {e}")
+            raise MCPError(f"Invalid JSON response: {e}")
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Request failed: {e}")
+            raise MCPError(f"Request failed: {e}")
+
+    def close(self) -> None:
+        """Close all pooled connections."""
+        self.session.close()
@@ -0,0 +1,209 @@
+"""HTTP+SSE transport: a Server-Sent Events stream plus a POST endpoint."""
+
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urljoin
+
+import requests
+
+from mcp.errors import MCPError
+from .base import (
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_POOL_SIZE,
+    DEFAULT_READ_TIMEOUT,
+    MultiplexingTransport,
+)
+from .http import CountingHTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SSEEvent:
+    """A single Server-Sent Event."""
+
+    event: str = "message"
+    data: str = ""
+    id: Optional[str] = None
+
+
+class SSEParser:
+    """Incremental parser for a text/event-stream body.
+
+    Bytes are fed in as they arrive and complete events are returned as soon
+    as their terminating blank line is seen. Only the current unfinished line
+    and event are held in memory.
+    """
+
+    def __init__(self):
+        self._pending: List[bytes] = []
+        self._event = "message"
+        self._data: List[str] = []
+        self._id: Optional[str] = None
+        self.last_event_id: Optional[str] = None
+        self.retry: Optional[int] = None
+
+    def feed(self, chunk: bytes) -> List[SSEEvent]:
+        """Consume a chunk of the stream and return the events it completes."""
+        ends_with_cr = self._pending and self._pending[-1].endswith(b"\r")
+        if not ends_with_cr and b"\n" not in chunk and b"\r" not in chunk:
+            # Part of a long line; defer joining until the line is complete
+            self._pending.append(chunk)
+            return []
+
+        buffer = b"".join(self._pending) + chunk
+        events = []
+        start = 0
+        while True:
+            end = self._find_line_end(buffer, start)
+            if end is None:
+                break
+            line = buffer[start : end[0]].decode("utf-8", errors="replace")
+            start = end[1]
+            event = self._process_line(line)
+            if event is not None:
+                events.append(event)
+        self._pending = [buffer[start:]] if start < len(buffer) else []
+        return events
+
+    @staticmethod
+    def _find_line_end(buffer: bytes, start: int) -> Optional[Tuple[int, int]]:
+        """Return (line end, next line start) for the line at ``start``."""
+        lf = buffer.find(b"\n", start)
+        cr = buffer.find(b"\r", start, lf if lf != -1 else len(buffer))
+        if cr == -1:
+            return None if lf == -1 else (lf, lf + 1)
+        if cr + 1 == len(buffer):
+            # Wait for the next chunk to tell \r from \r\n
+            return None
+        return cr, cr + 2 if buffer[cr + 1 : cr + 2] == b"\n" else cr + 1
+
+    def _process_line(self, line: str) -> Optional[SSEEvent]:
+        if not line:
+            return self._dispatch()
+        if line.startswith(":"):
+            return None
+
+        field, _, value = line.partition(":")
+        if value.startswith(" "):
+            value = value[1:]
+
+        if field == "event":
+            self._event = value
+        elif field == "data":
+            self._data.append(value)
+        elif field == "id" and "\0" not in value:
+            self._id = value
+        elif field == "retry" and value.isdigit():
+            self.retry = int(value)
+        return None
+
+    def _dispatch(self) -> Optional[SSEEvent]:
+        if self._id is not None:
+            self.last_event_id = self._id
+        event = None
+        if self._data:
+            event = SSEEvent(self._event, "\n".join(self._data), self.last_event_id)
+        self._event, self._data, self._id = "message", [], None
+        return event
+
+
+class SSETransport(MultiplexingTransport):
+    """Talk to a server over the HTTP with Server-Sent Events transport.
+
+    The client opens a long-lived GET on the SSE endpoint. The server's first
+    ``endpoint`` event names the URL messages are POSTed to. Replies and
+    server notifications then arrive as ``message`` events on the stream and
+    are matched to requests by id.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        connect_timeout: Optional[float] = DEFAULT_CONNECT_TIMEOUT,
+        read_timeout: Optional[float] = DEFAULT_READ_TIMEOUT,
+        headers: Optional[Dict[str, str]] = None,
+    ):
+        """Open the event stream and wait for the server's message endpoint.
+
+        Args:
+            url: URL of the server's SSE endpoint
+            pool_size: Maximum number of keep-alive connections for POSTs
+            connect_timeout: Seconds to wait for the stream and endpoint event
+            read_timeout: Seconds to wait for each reply, or None to wait forever
+            headers: Extra HTTP headers sent with the stream request and POSTs
+        """
+        super().__init__(read_timeout=read_timeout)
+        self.url = url
+        self.endpoint_url: Optional[str] = None
+        self._connect_timeout = connect_timeout
+        self._endpoint_ready = threading.Event()
+        self.session = requests.Session()
+        self.session.headers.update(headers or {})
+        adapter = CountingHTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        try:
+            self._stream = self.session.get(
+                url,
+                stream=True,
+                headers={"Accept": "text/event-stream"},
+                timeout=(connect_timeout, None),
+            )
+            self._stream.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            self.session.close()
+            logger.error(f"Connection failed: {e}")
+            raise MCPError(f"Connection failed: {e}")
+
+        self._reader = threading.Thread(
+            target=self._read_loop, name="mcp-sse-reader", daemon=True
+        )
+        self._reader.start()
+        if not self._endpoint_ready.wait(connect_timeout) or not self.endpoint_url:
+            self.close()
+            raise MCPError(f"Server at {url} did not send an endpoint event")
+
+    def _write(self, text: str) -> None:
+        response = self.session.post(
+            self.endpoint_url,
+            data=text.encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            timeout=(self._connect_timeout, self.read_timeout),
+        )
+        response.raise_for_status()
+
+    def _read_loop(self) -> None:
+        parser = SSEParser()
+        try:
+            for chunk in self._stream.iter_content(chunk_size=None):
+                for event in parser.feed(chunk):
+                    self._handle_event(event)
+        except Exception as e:
+            # Closing the stream from another thread surfaces as assorted errors
+            logger.debug(f"SSE reader stopped: {e!r}")
+        finally:
+            self._endpoint_ready.set()
+            self._fail_pending(MCPError("SSE stream closed"))
+
+    def _handle_event(self, event: SSEEvent) -> None:
+        if event.event == "endpoint":
+            self.endpoint_url = urljoin(self.url, event.data.strip())
+            logger.debug(f"Message endpoint: {self.endpoint_url}")
+            self._endpoint_ready.set()
+        elif event.event == "message":
+            self._handle_incoming(event.data)
+        else:
+            logger.debug(f"Ignoring SSE event {event.event!r}")
+
+    def close(self) -> None:
+        """Close the event stream and all pooled connections."""
+        # Shut the socket down first to interrupt the reader's blocking read
+        self._stream.raw.shutdown()
+        self._stream.close()
+        self.session.close()
+        self._reader.join(timeout=DEFAULT_CONNECT_TIMEOUT)
@@ -0,0 +1,95 @@
+"""Stdio transport that talks to a server running as a local subprocess."""
+
+import logging
+import subprocess
+import threading
+from typing import Dict, List, Optional
+
+from mcp.errors import MCPError
+from .base import DEFAULT_CONNECT_TIMEOUT, DEFAULT_READ_TIMEOUT, MultiplexingTransport
+
+logger = logging.getLogger(__name__)
+
+STDOUT_BUFFER_SIZE = 1 << 16
+
+
+class StdioTransport(MultiplexingTransport):
+    """Send newline-delimited JSON-RPC messages to a subprocess over stdio.
+
+    The server command is launched once and kept running until the transport
+    is closed. A reader thread consumes the server's stdout through a buffered
+    pipe and dispatches replies by id, so several requests may be in flight.
+    The server's stderr is passed through to ours.
+    """
+
+    def __init__(
+        self,
+        command: List[str],
+        env: Optional[Dict[str, str]] = None,
+        cwd: Optional[str] = None,
+        read_timeout: Optional[float] = DEFAULT_READ_TIMEOUT,
+    ):
+        """Launch the server and start the reader thread.
+
+        Args:
+            command: Server command and its arguments
+            env: Environment for the server process, defaults to ours
+            cwd: Working directory for the server process
+            read_timeout: Seconds to wait for each reply, or None to wait forever
+        """
+        super().__init__(read_timeout=read_timeout)
+        self.command = command
+        self._write_lock = threading.Lock()
+        try:
+            self.process = subprocess.Popen(
+                command,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                env=env,
+                cwd=cwd,
+                bufsize=STDOUT_BUFFER_SIZE,
+            )
+        except OSError as e:
+            logger.error(f"Failed to launch server {command}: {e}")
+            raise MCPError(f"Failed to launch server {command}: {e}")
+        self._reader = threading.Thread(
+            target=self._read_loop, name="mcp-stdio-reader", daemon=True
+        )
+        self._reader.start()
+
+    @property
+    def pid(self) -> int:
+        """Process id of the server."""
+        return self.process.pid
+
+    def _write(self, text: str) -> None:
+        with self._write_lock:
+            self.process.stdin.write(text.encode("utf-8") + b"\n")
+            self.process.stdin.flush()
+
+    def _read_loop(self) -> None:
+        try:
+            for line in self.process.stdout:
+                line = line.strip()
+                if line:
+                    self._handle_incoming(line.decode("utf-8", errors="replace"))
+        except (OSError, ValueError) as e:
+            logger.debug(f"Stdio reader stopped: {e}")
+        finally:
+            self._fail_pending(
+                MCPError(f"Server process exited with code {self.process.poll()}")
+            )
+
+    def close(self) -> None:
+        """Close the server's stdin and wait for it to exit, killing it if needed."""
+        try:
+            self.process.stdin.close()
+        except OSError:
+            pass
+        try:
+            self.process.wait(timeout=DEFAULT_CONNECT_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            logger.warning(f"Server {self.command} did not exit, terminating it")
+            self.process.kill()
+            self.process.wait()
+        self._reader.join(timeout=DEFAULT_CONNECT_TIMEOUT)
@@ -0,0 +1,70 @@
+"""WebSocket transport that multiplexes requests over one socket."""
+
+import logging
+import threading
+from contextlib import ExitStack
+from typing import Dict, Optional
+
+from websockets.exceptions import WebSocketException
+from websockets.sync.client import connect
+
+from mcp.errors import MCPError
+from .base import DEFAULT_CONNECT_TIMEOUT, DEFAULT_READ_TIMEOUT, MultiplexingTransport
+
+logger = logging.getLogger(__name__)
+
+
+class WebSocketTransport(MultiplexingTransport):
+    """Send JSON-RPC messages as text frames over a single WebSocket.
+
+    Requests from several threads are pipelined on the socket and replies are
+    matched back by id, so they may arrive in any order. Server notifications
+    are delivered to registered handlers on the reader thread.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        connect_timeout: Optional[float] = DEFAULT_CONNECT_TIMEOUT,
+        read_timeout: Optional[float] = DEFAULT_READ_TIMEOUT,
+        headers: Optional[Dict[str, str]] = None,
+    ):
+        """Open the socket and start the reader thread.
+
+        Args:
+            url: ws:// or wss:// URL of the server's WebSocket endpoint
+            connect_timeout: Seconds to wait for the handshake
+            read_timeout: Seconds to wait for each reply, or None to wait forever
+            headers: Extra HTTP headers sent with the opening handshake
+        """
+        super().__init__(read_timeout=read_timeout)
+        self.url = url
+        self._exit_stack = ExitStack()
+        try:
+            self._ws = self._exit_stack.enter_context(
+                connect(url, open_timeout=connect_timeout, additional_headers=headers)
+            )
+        except (OSError, WebSocketException) as e:
+            logger.error(f"Connection failed: {e}")
+            raise MCPError(f"Connection failed: {e}")
+        self._reader = threading.Thread(
+            target=self._read_loop, name="mcp-websocket-reader", daemon=True
+        )
+        self._reader.start()
+
+    def _write(self, text: str) -> None:
+        self._ws.send(text)
+
+    def _read_loop(self) -> None:
+        try:
+            for frame in self._ws:
+                self._handle_incoming(frame)
+        except (OSError, WebSocketException) as e:
+            logger.debug(f"WebSocket reader stopped: {e}")
+        finally:
+            self._fail_pending(MCPError("WebSocket connection closed"))
+
+    def close(self) -> None:
+        """Close the socket and fail any outstanding requests."""
+        self._exit_stack.close()
+        self._reader.join(timeout=DEFAULT_CONNECT_TIMEOUT)
@@ -0,0 +1,289 @@
+"""Local message broker keeping mock server worker processes coherent.
+
+With ``--workers N`` every worker accepts connections on the same listening
+socket, so a client's requests may land on any of them. Each worker connects
+to one Broker, which runs in the supervising process and speaks
+newline-delimited JSON over a localhost socket. The broker:
+
+- relays published events, such as resource updates, to every worker;
+- records which worker owns a key, such as an SSE session or a subscription;
+- forwards a request to the owner of a key and relays its answer back;
+- asks every worker the same request and relays the list of answers back.
+
+Messages from a worker:
+    {"op": "publish", "event": E}
+    {"op": "claim" | "release", "key": K, "ref": R}
+    {"op": "forward", "key": K, "event": E, "ref": R}
+    {"op": "gather", "event": E, "ref": R}
+    {"op": "result", "ref": R, "value": V}   (answer to a forwarded request)
+
+Messages to a worker:
+    {"op": "event", "event": E}
+    {"op": "request", "ref": R, "event": E}
+    {"op": "result", "ref": R, "value": V}
+"""
+
+import asyncio
+import itertools
+import json
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+EventHandler = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+# Longest message line, which may carry a whole forwarded request body
+BROKER_LINE_LIMIT = 64 * 1024 * 1024
+
+
+def _encode(message: Dict[str, Any]) -> bytes:
+    return json.dumps(message, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+class Broker:
+    """Relays events between worker processes and tracks key ownership."""
+
+    def __init__(self):
+        self.address: Optional[Tuple[str, int]] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._workers: Dict[int, asyncio.StreamWriter] = {}
+        self._owners: Dict[str, int] = {}
+        # Forwarded request ref -> (asking worker, its ref)
+        self._forwarded: Dict[int, Tuple[int, Any]] = {}
+        # Gathered request ref -> (asking worker, its ref, workers yet to
+        # answer, answers so far)
+        self._gathers: Dict[int, Tuple[int, Any, Set[int], List[Any]]] = {}
+        self._worker_ids = itertools.count(1)
+        self._refs = itertools.count(1)
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        """Start listening for workers on a localhost port."""
+        self._server = await asyncio.start_server(
+            self._serve, host, port, limit=BROKER_LINE_LIMIT
+        )
+        self.address = self._server.sockets[0].getsockname()[:2]
+
+    async def close(self) -> None:
+        """Stop accepting workers and drop the ones connected."""
+        if self._server is not None:
+            self._server.close()
+            for writer in self._workers.values():
+                writer.close()
+            await self._server.wait_closed()
+
+    async def _serve(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        worker = next(self._worker_ids)
+        self._workers[worker] = writer
+        try:
+            while line := await reader.readline():
+                self._handle(worker, json.loads(line))
+        except (ConnectionError, ValueError) as e:
+            logger.warning(f"Worker {worker} connection failed: {e}")
+        finally:
+            del self._workers[worker]
+            self._owners = {k: w for k, w in self._owners.items() if w != worker}
+            for ref, (asker, asker_ref) in list(self._forwarded.items()):
+                if asker == worker:
+                    del self._forwarded[ref]
+            for ref, (asker, *_) in list(self._gathers.items()):
+                if asker == worker:
+                    del self._gathers[ref]
+                else:
+                    self._collect(ref, worker, None)
+            writer.close()
+
+    def _send(self, worker: int, message: Dict[str, Any]) -> None:
+        writer = self._workers.get(worker)
+        if writer is not None:
+            writer.write(_encode(message))
+
+    def _handle(self, worker: int, message: Dict[str, Any]) -> None:
+        op = message["op"]
+        if op == "publish":
+            line = _encode({"op": "event", "event": message["event"]})
+            for writer in self._workers.values():
+                writer.write(line)
+        elif op == "claim":
+            self._owners[message["key"]] = worker
+            self._send(worker, {"op": "result", "ref": message["ref"], "value": True})
+        elif op == "release":
+            if self._owners.get(message["key"]) == worker:
+                del self._owners[message["key"]]
+            self._send(worker, {"op": "result", "ref": message["ref"], "value": True})
+        elif op == "forward":
+            owner = self._owners.get(message["key"])
+            if owner is None or owner not in self._workers:
+                self._send(
+                    worker, {"op": "result", "ref": message["ref"], "value": None}
+                )
+                return
+            ref = next(self._refs)
+            self._forwarded[ref] = (worker, message["ref"])
+            self._send(owner, {"op": "request", "ref": ref, "event": message["event"]})
+        elif op == "gather":
+            ref = next(self._refs)
+            self._gathers[ref] = (worker, message["ref"], set(self._workers), [])
+            for other in self._workers:
+                self._send(
+                    other, {"op": "request", "ref": ref, "event": message["event"]}
+                )
+        elif op == "result":
+            asker = self._forwarded.pop(message["ref"], None)
+            if asker is not None:
+                worker, ref = asker
+                self._send(
+                    worker, {"op": "result", "ref": ref, "value": message["value"]}
+                )
+            elif message["ref"] in self._gathers:
+                self._collect(message["ref"], worker, message["value"], answered=True)
+        else:
+            logger.warning(f"Unknown broker operation from worker {worker}: {op}")
+
+    def _collect(
+        self, ref: int, worker: int, value: Any, answered: bool = False
+    ) -> None:
+        """Record a worker's answer to a gathered request, or its departure."""
+        asker, asker_ref, waiting, values = self._gathers[ref]
+        if worker not in waiting:
+            return
+        waiting.discard(worker)
+        if answered:
+            values.append(value)
+        if not waiting:
+            del self._gathers[ref]
+            self._send(asker, {"op": "result", "ref": asker_ref, "value": values})
+
+
+class BrokerClient:
+    """A worker's connection to the Broker."""
+
+    def __init__(self, handler: EventHandler):
+        """Initialize the client.
+
+        Args:
+            handler: Coroutine called with every event published by any
+                worker and every request forwarded to this worker. Its return
+                value answers forwarded requests
+        """
+        self._handler = handler
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._refs = itertools.count(1)
+        self._tasks = set()
+        self._closed = asyncio.Event()
+
+    async def connect(self, address: Tuple[str, int]) -> None:
+        """Connect to the broker and start receiving events."""
+        reader, self._writer = await asyncio.open_connection(
+            *address, limit=BROKER_LINE_LIMIT
+        )
+        self._reader_task = asyncio.create_task(self._read(reader))
+
+    async def close(self) -> None:
+        """Disconnect from the broker."""
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+        if self._writer is not None:
+            self._writer.close()
+
+    async def _read(self, reader: asyncio.StreamReader) -> None:
+        try:
+            while line := await reader.readline():
+                message = json.loads(line)
+                op = message["op"]
+                if op == "result":
+                    future = self._pending.pop(message["ref"], None)
+                    if future is not None and not future.done():
+                        future.set_result(message["value"])
+                elif op in ("event", "request"):
+                    task = asyncio.create_task(self._dispatch(message))
+                    self._tasks.add(task)
+                    task.add_done_callback(self._tasks.discard)
+        except (ConnectionError, ValueError) as e:
+            logger.error(f"Lost connection to the broker: {e}")
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_result(None)
+            self._pending.clear()
+            self._closed.set()
+
+    async def wait_closed(self) -> None:
+        """Wait until the connection to the broker is lost or closed."""
+        await self._closed.wait()
+
+    async def _dispatch(self, message: Dict[str, Any]) -> None:
+        try:
+            value = await self._handler(message["event"])
+        except Exception as e:
+            logger.error(f"Error handling broker event: {e}")
+            value = None
+        if message["op"] == "request":
+            result = {"op": "result", "ref": message["ref"], "value": value}
+            try:
+                self._write(result)
+            except ValueError as e:
+                logger.error(f"Cannot answer broker request: {e}")
+                self._write({**result, "value": None})
+
+    def _write(self, message: Dict[str, Any]) -> None:
+        """Send a message to the broker.
+
+        Raises:
+            ValueError: If the message is longer than the broker accepts
+        """
+        line = _encode(message)
+        if len(line) > BROKER_LINE_LIMIT:
+            raise ValueError(
+                f"Broker message of {len(line)} bytes exceeds {BROKER_LINE_LIMIT}"
+            )
+        self._writer.write(line)
+
+    async def _ask(self, message: Dict[str, Any]) -> Any:
+        ref = next(self._refs)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[ref] = future
+        try:
+            self._write({**message, "ref": ref})
+        except ValueError:
+            del self._pending[ref]
+            raise
+        return await future
+
+    def publish(self, event: Dict[str, Any]) -> None:
+        """Deliver an event to every worker, this one included."""
+        self._write({"op": "publish", "event": event})
+
+    async def claim(self, key: str) -> None:
+        """Record this worker as the owner of a key."""
+        await self._ask({"op": "claim", "key": key})
+
+    async def release(self, key: str) -> None:
+        """Give up ownership of a key."""
+        await self._ask({"op": "release", "key": key})
+
+    async def forward(self, key: str, event: Dict[str, Any]) -> Any:
+        """Have the owner of a key handle an event.
+
+        Returns:
+            The owner's answer, or None if nobody owns the key
+
+        Raises:
+            ValueError: If the event is longer than the broker accepts
+        """
+        return await self._ask({"op": "forward", "key": key, "event": event})
+
+    async def gather(self, event: Dict[str, Any]) -> List[Any]:
+        """Have every worker, this one included, handle an event.
+
+        Returns:
+            The answers of the workers, in no particular order
+
+        Raises:
+            ValueError: If the event is longer than the broker accepts
+        """
+        return await self._ask({"op": "gather", "event": event}) or []
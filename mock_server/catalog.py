@@ -0,0 +1,203 @@
+"""Synthetic large catalogs for the mock server.
+
+A SyntheticCatalog describes millions of tools and resources without storing
+them, plus an optional synthetic completion vocabulary. Each item is
+generated on demand from the catalog seed and its index, so serving a page
+costs O(page size) and memory stays flat however large the catalog is.
+
+Pages are addressed with opaque keyset cursors. A cursor encodes the kind of
+list and the index of the next item, signed with an HMAC so clients cannot
+forge positions or replay cursors against a differently configured catalog.
+"""
+
+import base64
+import hashlib
+import hmac
+import struct
+from typing import Any, Dict, List, Optional, Tuple
+
+from mock_server.completion import MAX_SYNTHETIC_VOCABULARY, synthetic_vocabulary
+
+DEFAULT_PAGE_SIZE = 100
+
+TOOL_PREFIX = "tool_"
+RESOURCE_URI_PREFIX = "mock://catalog/resources/"
+
+# Cursor layout: list kind, next index, then a truncated HMAC of both
+_CURSOR_FORMAT = ">BQ"
+_CURSOR_SIZE = struct.calcsize(_CURSOR_FORMAT)
+_SIGNATURE_SIZE = 12
+_KINDS = {"tools": 1, "resources": 2}
+
+_VERBS = ["get", "list", "search", "create", "update", "delete", "sync", "export"]
+_NOUNS = ["weather", "invoice", "ticket", "user", "report", "order", "file", "event"]
+_MIME_TYPES = ["text/plain", "application/json", "text/markdown", "text/csv"]
+
+
+class InvalidCursor(ValueError):
+    """Raised when a cursor is malformed, tampered with or from another catalog."""
+
+
+class SyntheticCatalog:
+    """Tools and resources generated on demand from a seed and an index."""
+
+    def __init__(
+        self,
+        tools: int = 0,
+        resources: int = 0,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        seed: int = 0,
+        secret: Optional[bytes] = None,
+        completions: int = 0,
+    ):
+        """Initialize the catalog.
+
+        Args:
+            tools: Number of tools to serve, 0 to keep the built-in tools
+            resources: Number of resources to serve, 0 to keep the built-in ones
+            page_size: Maximum number of items per list page
+            seed: Seed the generated item attributes are derived from
+            secret: Key used to sign cursors. Defaults to one derived from the
+                seed, so every process started with the same options accepts
+                the same cursors
+            completions: Number of synthetic values added to every completion
+                vocabulary
+        """
+        if tools < 0 or resources < 0 or completions < 0:
+            raise ValueError("Catalog sizes must not be negative")
+        if completions > MAX_SYNTHETIC_VOCABULARY:
+            raise ValueError(
+                f"At most {MAX_SYNTHETIC_VOCABULARY} completion values can be generated"
+            )
+        if page_size < 1:
+            raise ValueError("page_size must be at least 1")
+        self.tools = tools
+        self.resources = resources
+        self.page_size = page_size
+        self.seed = seed
+        self.completions = completions
+        if secret is None:
+            secret = hashlib.sha256(f"mcp-mock-catalog:{seed}".encode()).digest()
+        # Bind signatures to the catalog shape so stale cursors are rejected
+        # after a restart with different sizes
+        self._key = hmac.new(
+            secret, f"{seed}:{tools}:{resources}:{page_size}".encode(), "sha256"
+        ).digest()
+
+    def _size(self, kind: str) -> int:
+        return self.tools if kind == "tools" else self.resources
+
+    def _digest(self, kind: str, index: int) -> bytes:
+        """Return stable pseudo-random bytes for an item."""
+        return hashlib.blake2b(
+            f"{self.seed}:{kind}:{index}".encode(), digest_size=8
+        ).digest()
+
+    def encode_cursor(self, kind: str, index: int) -> str:
+        """Return the opaque cursor for the page starting at ``index``."""
+        payload = struct.pack(_CURSOR_FORMAT, _KINDS[kind], index)
+        signature = hmac.new(self._key, payload, "sha256").digest()[:_SIGNATURE_SIZE]
+        return base64.urlsafe_b64encode(payload + signature).decode().rstrip("=")
+
+    def decode_cursor(self, kind: str, cursor: str) -> int:
+        """Return the index a cursor points at.
+
+        Raises:
+            InvalidCursor: If the cursor was not issued by this catalog for
+                this kind of list
+        """
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        except ValueError:
+            raise InvalidCursor("Cursor is not valid base64")
+        if len(raw) != _CURSOR_SIZE + _SIGNATURE_SIZE:
+            raise InvalidCursor("Cursor has the wrong length")
+
+        payload, signature = raw[:_CURSOR_SIZE], raw[_CURSOR_SIZE:]
+        expected = hmac.new(self._key, payload, "sha256").digest()[:_SIGNATURE_SIZE]
+        if not hmac.compare_digest(signature, expected):
+            raise InvalidCursor("Cursor signature does not match")
+
+        kind_code, index = struct.unpack(_CURSOR_FORMAT, payload)
+        if kind_code != _KINDS[kind] or not 0 < index < self._size(kind):
+            raise InvalidCursor("Cursor does not belong to this list")
+        return index
+
+    def page(
+        self, kind: str, cursor: Optional[str]
+    ) -> Tuple[List[Dict], Optional[str]]:
+        """Return one page of a list and the cursor of the page after it.
+
+        Args:
+            kind: ``tools`` or ``resources``
+            cursor: Cursor from the previous page, or None for the first page
+
+        Raises:
+            InvalidCursor: If the cursor is not valid for this list
+        """
+        start = self.decode_cursor(kind, cursor) if cursor else 0
+        end = min(start + self.page_size, self._size(kind))
+        make_item = self.tool if kind == "tools" else self.resource
+        items = [make_item(index) for index in range(start, end)]
+        next_cursor = self.encode_cursor(kind, end) if end < self._size(kind) else None
+        return items, next_cursor
+
+    def completion_values(self) -> List[str]:
+        """Generate the synthetic completion vocabulary."""
+        return synthetic_vocabulary(self.completions, self.seed)
+
+    def tool(self, index: int) -> Dict[str, Any]:
+        """Generate the tool at ``index``."""
+        digest = self._digest("tools", index)
+        verb = _VERBS[digest[0] % len(_VERBS)]
+        noun = _NOUNS[digest[1] % len(_NOUNS)]
+        return {
+            "name": f"{TOOL_PREFIX}{index:09d}",
+            "description": f"{verb.capitalize()} {noun} records (synthetic #{index})",
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    noun: {"type": "string", "description": f"The {noun} to {verb}"},
+                    "limit": {"type": "integer", "default": 1 + digest[2] % 100},
+                },
+                "required": [noun],
+            },
+        }
+
+    def tool_index(self, name: str) -> Optional[int]:
+        """Return the index of a generated tool name, or None if there is none."""
+        digits = name[len(TOOL_PREFIX) :]
+        if not name.startswith(TOOL_PREFIX) or not digits.isdigit():
+            return None
+        index = int(digits)
+        canonical = name == f"{TOOL_PREFIX}{index:09d}"
+        return index if canonical and index < self.tools else None
+
+    def resource(self, index: int) -> Dict[str, Any]:
+        """Generate the resource at ``index``."""
+        digest = self._digest("resources", index)
+        noun = _NOUNS[digest[0] % len(_NOUNS)]
+        return {
+            "uri": f"{RESOURCE_URI_PREFIX}{index}",
+            "name": f"{noun.capitalize()} {index}",
+            "description": f"Synthetic {noun} resource #{index}",
+            "mimeType": _MIME_TYPES[digest[1] % len(_MIME_TYPES)],
+        }
+
+    def resource_index(self, uri: str) -> Optional[int]:
+        """Return the index of a generated resource URI, or None if there is none."""
+        digits = uri[len(RESOURCE_URI_PREFIX) :]
+        if not uri.startswith(RESOURCE_URI_PREFIX) or not digits.isdigit():
+            return None
+        index = int(digits)
+        return index if index < self.resources and str(index) == digits else None
+
+    def read_resource(self, index: int) -> Dict[str, Any]:
+        """Generate the text content of the resource at ``index``."""
+        resource = self.resource(index)
+        return {
+            "type": "resource_text",
+            "uri": resource["uri"],
+            "mimeType": resource["mimeType"],
+            "text": f"{resource['description']} (seed {self.seed})",
+        }
@@ -0,0 +1,220 @@
+"""Indexed, ranked completion for the mock server's completion/complete.
+
+A CompletionIndex holds one vocabulary, such as the values of a prompt
+argument. Its values are kept sorted by case-folded key, so the set of
+prefix matches is one contiguous range found by binary search. This is the
+sorted-array form of a prefix trie, and it answers keystroke-style queries in
+O(log n) whatever the vocabulary size.
+
+When prefix matches do not fill a response, values starting with a one-edit
+misspelling of the query are found by probing the sorted keys with every edit
+variant, and values containing the query are found through a trigram inverted
+index. The trigram index is built on first use, so prefix-only workloads never
+pay for it.
+"""
+
+import hashlib
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Maximum number of values in a completion/complete response
+MAX_COMPLETION_VALUES = 100
+
+_NGRAM = 3
+
+# Shortest query for which one-edit misspellings are matched
+_MIN_TYPO_LENGTH = 4
+
+# Two-letter syllables, so generated words split back into one index each
+_SYLLABLES = [c + v for c in "bcdfghjklmnprstvwz" for v in "aeiouy"]
+
+# Largest vocabulary synthetic_vocabulary can generate
+MAX_SYNTHETIC_VOCABULARY = len(_SYLLABLES) ** 4
+
+
+def _trigrams(text: str) -> Iterable[str]:
+    return {text[i : i + _NGRAM] for i in range(len(text) - _NGRAM + 1)}
+
+
+def _merge(ranges: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Merge overlapping half-open ranges into a sorted, disjoint list."""
+    merged: List[Tuple[int, int]] = []
+    for lo, hi in sorted(r for r in ranges if r[0] < r[1]):
+        if merged and lo <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], hi))
+        else:
+            merged.append((lo, hi))
+    return merged
+
+
+class CompletionIndex:
+    """Ranked prefix, substring and typo-tolerant lookups over a vocabulary."""
+
+    def __init__(self, values: Iterable[str]):
+        """Index a vocabulary.
+
+        Args:
+            values: Completion values. Duplicates are dropped
+        """
+        entries = sorted({(value.casefold(), value) for value in values})
+        self._keys = [key for key, _ in entries]
+        self._values = [value for _, value in entries]
+        self._postings: Optional[Dict[str, array]] = None
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def _prefix_range(
+        self, prefix: str, lo: int = 0, hi: Optional[int] = None
+    ) -> Tuple[int, int]:
+        """Return the range of keys starting with ``prefix``, searching [lo, hi)."""
+        if hi is None:
+            hi = len(self._keys)
+        lo = bisect_left(self._keys, prefix, lo, hi)
+        hi = bisect_left(self._keys, prefix[:-1] + chr(ord(prefix[-1]) + 1), lo, hi)
+        return lo, hi
+
+    def _trigram_postings(self) -> Dict[str, array]:
+        """Return the trigram index, building it on first use."""
+        if self._postings is None:
+            postings: Dict[str, array] = {}
+            for position, key in enumerate(self._keys):
+                for gram in _trigrams(key):
+                    posting = postings.get(gram)
+                    if posting is None:
+                        posting = postings[gram] = array("I")
+                    posting.append(position)
+            self._postings = postings
+        return self._postings
+
+    def _typo_ranges(self, key: str, exclude: Tuple[int, int]) -> List[Tuple[int, int]]:
+        """Return the ranges of values starting with a one-edit variant of ``key``.
+
+        Edits are walked like a trie: a substitution or insertion at position
+        ``i`` only tries the characters that follow ``key[:i]`` in some value,
+        and positions past the longest prefix of ``key`` in the vocabulary are
+        never tried, since no value could match there.
+        """
+        keys = self._keys
+        ranges = []
+        lo, hi = 0, len(keys)
+        for i in range(len(key)):
+            ranges.append(self._prefix_range(key[:i] + key[i + 1 :]))
+
+            # Visit each distinct character following key[:i] once
+            position = lo
+            while position < hi:
+                if len(keys[position]) == i:
+                    position += 1
+                    continue
+                char = keys[position][i]
+                end = bisect_left(keys, key[:i] + chr(ord(char) + 1), position, hi)
+                if char != key[i]:
+                    ranges.append(
+                        self._prefix_range(key[:i] + char + key[i + 1 :], position, end)
+                    )
+                ranges.append(
+                    self._prefix_range(key[:i] + char + key[i:], position, end)
+                )
+                position = end
+
+            lo, hi = self._prefix_range(key[: i + 1], lo, hi)
+            if lo == hi:
+                break
+
+        # Drop the exact prefix matches, which rank in the tier above
+        lo, hi = exclude
+        remaining = []
+        for start, end in _merge(ranges):
+            remaining.extend([(start, min(end, lo)), (max(start, hi), end)])
+        return [r for r in remaining if r[0] < r[1]]
+
+    def complete(
+        self, query: str, limit: int = MAX_COMPLETION_VALUES
+    ) -> Tuple[List[str], int]:
+        """Return the best matches for a partial value.
+
+        Matches are ranked in tiers: values starting with the query in lexical
+        order (an exact match comes first), then values starting with a
+        one-edit misspelling of it, then values containing it anywhere. A tier
+        is only searched when the tiers above it leave room in the response,
+        and ``total`` counts the matches of the tiers searched. Matching ignores
+        case. Misspellings are tolerated from four characters on and
+        substrings from three.
+
+        Args:
+            query: The partial value typed so far
+            limit: Maximum number of values to return
+
+        Returns:
+            The ranked values and the total number of matches
+        """
+        key = query.casefold()
+        if not key:
+            return self._values[:limit], len(self._values)
+
+        lo, hi = self._prefix_range(key)
+        values = self._values[lo : min(hi, lo + limit)]
+        total = hi - lo
+        if len(values) >= limit or len(key) < _NGRAM:
+            return values, total
+
+        matched = [(lo, hi)]
+        if len(key) >= _MIN_TYPO_LENGTH:
+            typo_ranges = self._typo_ranges(key, (lo, hi))
+            for start, end in typo_ranges:
+                total += end - start
+                values.extend(
+                    self._values[start : min(end, start + limit - len(values))]
+                )
+            if len(values) >= limit:
+                return values, total
+            matched.extend(typo_ranges)
+
+        # Values containing the query contain its rarest trigram, so only that
+        # posting list needs to be read
+        postings = self._trigram_postings()
+        rarest = min(_trigrams(key), key=lambda gram: len(postings.get(gram, ())))
+        matched = _merge(matched)
+        starts = [start for start, _ in matched]
+        contains = []
+        keys = self._keys
+        for position in postings.get(rarest, ()):
+            offset = keys[position].find(key)
+            if offset < 0:
+                continue
+            i = bisect_right(starts, position) - 1
+            if i < 0 or position >= matched[i][1]:
+                contains.append((offset, len(keys[position]), position))
+
+        total += len(contains)
+        contains.sort()
+        values.extend(self._values[p] for *_, p in contains[: limit - len(values)])
+        return values, total
+
+
+def synthetic_vocabulary(size: int, seed: int = 0) -> List[str]:
+    """Generate ``size`` distinct word-like completion values.
+
+    Each index maps to a distinct combination of four syllables through a
+    seeded permutation, so the same size and seed always give the same
+    vocabulary.
+    """
+    base = len(_SYLLABLES)
+    space = MAX_SYNTHETIC_VOCABULARY
+    if size > space:
+        raise ValueError(f"Synthetic vocabularies hold at most {space} values")
+    # The space is 2**8 * 3**12, so a multiplier of the form 6x + 1 is coprime
+    # with it and multiplying permutes the indexes
+    digest = hashlib.sha256(str(seed).encode()).digest()
+    multiplier = 6 * int.from_bytes(digest[:4], "big") + 1
+    words = []
+    for index in range(size):
+        n = (index * multiplier) % space
+        syllables = []
+        for _ in range(4):
+            n, digit = divmod(n, base)
+            syllables.append(_SYLLABLES[digit])
+        words.append("".join(syllables))
+    return words
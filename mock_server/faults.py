@@ -0,0 +1,223 @@
+"""Latency and fault injection for the mock server.
+
+A fault configuration maps JSON-RPC methods (``*`` for any other method) to a
+profile. A profile can set:
+
+- ``latency``: a delay drawn from a distribution, in milliseconds
+    - ``{"distribution": "fixed", "ms": 20}``
+    - ``{"distribution": "normal", "mean_ms": 20, "stddev_ms": 5}``
+    - ``{"distribution": "lognormal", "median_ms": 20, "sigma": 0.8}``
+    - ``{"distribution": "pareto", "scale_ms": 5, "alpha": 1.5}`` (heavy tail)
+
+  Any distribution accepts ``max_ms`` to cap the delay.
+- ``error_rate`` and ``error_codes``: the share of calls answered with a
+  JSON-RPC error, and the codes to pick from.
+- ``drop_rate``: the share of responses whose connection is closed before any
+  body is sent.
+- ``truncate_rate``: the share of responses cut off partway through the body.
+- ``drip_rate``, ``drip_chunk_bytes`` and ``drip_interval_ms``: the share of
+  responses sent a few bytes at a time.
+
+Example configuration::
+
+    {
+        "seed": 42,
+        "methods": {
+            "tools/call": {"latency": {"distribution": "lognormal",
+                                       "median_ms": 40, "sigma": 1.0},
+                           "error_rate": 0.02, "error_codes": [-32603]},
+            "*": {"latency": {"distribution": "fixed", "ms": 2}}
+        }
+    }
+
+Each decision is drawn from a generator seeded with the seed, the client, the
+method and how many times that client has called that method. A given
+sequence of calls to a method therefore always sees the same faults, however
+calls to different methods, or from other clients, interleave. This holds for
+parallel test workers that each name their own client.
+"""
+
+import math
+import random
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+DISTRIBUTIONS = ("fixed", "normal", "lognormal", "pareto")
+
+# Transport-level faults
+DROP = "drop"
+TRUNCATE = "truncate"
+DRIP = "drip"
+
+_DISTRIBUTION_PARAMS = {
+    "fixed": ("ms",),
+    "normal": ("mean_ms", "stddev_ms"),
+    "lognormal": ("median_ms", "sigma"),
+    "pareto": ("scale_ms", "alpha"),
+}
+
+
+def _number(config: Dict[str, Any], key: str, default: Optional[float] = None):
+    value = config.get(key, default)
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+        raise ValueError(f"'{key}' must be a non-negative number")
+    return value
+
+
+def _rate(config: Dict[str, Any], key: str) -> float:
+    value = _number(config, key, 0)
+    if value > 1:
+        raise ValueError(f"'{key}' must be between 0 and 1")
+    return value
+
+
+class Latency:
+    """A distribution of response delays."""
+
+    def __init__(self, config: Dict[str, Any]):
+        """Parse a latency configuration.
+
+        Raises:
+            ValueError: If the configuration is invalid
+        """
+        if not isinstance(config, dict):
+            raise ValueError("'latency' must be an object")
+        self.distribution = config.get("distribution", "fixed")
+        if self.distribution not in DISTRIBUTIONS:
+            raise ValueError(
+                f"Unknown latency distribution '{self.distribution}', "
+                f"expected one of {', '.join(DISTRIBUTIONS)}"
+            )
+        self.params = [
+            _number(config, key) for key in _DISTRIBUTION_PARAMS[self.distribution]
+        ]
+        if self.distribution == "pareto" and self.params[1] == 0:
+            raise ValueError("'alpha' must be positive")
+        self.max_ms = _number(config, "max_ms", math.inf)
+
+    def sample(self, rng: random.Random) -> float:
+        """Draw a delay, in seconds."""
+        if self.distribution == "fixed":
+            ms = self.params[0]
+        elif self.distribution == "normal":
+            ms = rng.gauss(*self.params)
+        elif self.distribution == "lognormal":
+            median, sigma = self.params
+            ms = rng.lognormvariate(math.log(median), sigma) if median else 0.0
+        else:
+            scale, alpha = self.params
+            ms = scale * rng.paretovariate(alpha)
+        return min(max(ms, 0.0), self.max_ms) / 1000
+
+
+class FaultProfile:
+    """The faults injected into calls of one method."""
+
+    def __init__(self, config: Dict[str, Any]):
+        """Parse a profile.
+
+        Raises:
+            ValueError: If the configuration is invalid
+        """
+        if not isinstance(config, dict):
+            raise ValueError("A fault profile must be an object")
+        self.latency = Latency(config["latency"]) if "latency" in config else None
+        self.error_rate = _rate(config, "error_rate")
+        self.error_codes: List[int] = config.get("error_codes", [-32603])
+        if not self.error_codes or not all(
+            isinstance(c, int) and not isinstance(c, bool) for c in self.error_codes
+        ):
+            raise ValueError("'error_codes' must be a non-empty list of integers")
+        self.drop_rate = _rate(config, "drop_rate")
+        self.truncate_rate = _rate(config, "truncate_rate")
+        self.drip_rate = _rate(config, "drip_rate")
+        if self.drop_rate + self.truncate_rate + self.drip_rate > 1:
+            raise ValueError("drop, truncate and drip rates must add up to at most 1")
+        self.drip_chunk_bytes = int(_number(config, "drip_chunk_bytes", 16)) or 1
+        self.drip_interval = _number(config, "drip_interval_ms", 50) / 1000
+
+
+class FaultPlan:
+    """The faults decided for one call."""
+
+    __slots__ = ("delay", "error", "transport", "profile", "rng")
+
+    def __init__(
+        self,
+        delay: float = 0.0,
+        error: Optional[Tuple[int, str]] = None,
+        transport: Optional[str] = None,
+        profile: Optional[FaultProfile] = None,
+        rng: Optional[random.Random] = None,
+    ):
+        self.delay = delay
+        self.error = error
+        self.transport = transport
+        self.profile = profile
+        self.rng = rng
+
+
+NO_FAULTS = FaultPlan()
+
+
+class FaultInjector:
+    """Decides, reproducibly, which faults each call gets."""
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """Parse a fault configuration.
+
+        Args:
+            config: The configuration described in the module docstring, or
+                None to inject nothing
+
+        Raises:
+            ValueError: If the configuration is invalid
+        """
+        config = config or {}
+        if not isinstance(config, dict):
+            raise ValueError("The fault configuration must be an object")
+        self.config = config
+        self.seed = config.get("seed", 0)
+        methods = config.get("methods", {})
+        if not isinstance(methods, dict):
+            raise ValueError("'methods' must map method names to profiles")
+        self.profiles = {
+            method: FaultProfile(profile) for method, profile in methods.items()
+        }
+        self._calls: Dict[Tuple[str, str], int] = defaultdict(int)
+
+    def plan(self, method: str, client: str = "") -> FaultPlan:
+        """Decide the faults of the next call to ``method``.
+
+        Args:
+            method: Method called
+            client: Namespace of the caller; each client's calls are counted
+                separately
+        """
+        profile = self.profiles.get(method) or self.profiles.get("*")
+        if profile is None:
+            return NO_FAULTS
+
+        key = (client, method)
+        call = self._calls[key]
+        self._calls[key] = call + 1
+        rng = random.Random(f"{self.seed}:{client}:{method}:{call}")
+
+        delay = profile.latency.sample(rng) if profile.latency else 0.0
+        error = None
+        if rng.random() < profile.error_rate:
+            code = rng.choice(profile.error_codes)
+            error = (code, f"Injected fault: error {code}")
+
+        transport = None
+        draw = rng.random()
+        for kind, rate in (
+            (DROP, profile.drop_rate),
+            (TRUNCATE, profile.truncate_rate),
+            (DRIP, profile.drip_rate),
+        ):
+            if draw < rate:
+                transport = kind
+                break
+            draw -= rate
+        return FaultPlan(delay, error, transport, profile, rng)
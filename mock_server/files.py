@@ -0,0 +1,360 @@
+"""Filesystem-backed resources for the mock server.
+
+A FileProvider serves the regular files under a directory as resources, so
+hosts can be exercised with real payloads of any size.
+
+- ``resources/list`` walks the tree lazily. Pages are addressed with signed
+  keyset cursors holding the path of the last file served, and each page only
+  reads the directories it needs, so listing a huge tree never indexes all of
+  it and files added or removed between pages are picked up.
+- ``resources/read`` memory-maps the file. Binary files are base64-encoded a
+  chunk at a time straight into the response buffer. Encoded responses are
+  cached, keyed by URI and validated by an ETag made of the file's mtime, size
+  and inode, up to a byte budget.
+- Subscribed files are polled for changes by the server.
+"""
+
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+import mimetypes
+import mmap
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import unquote, urlsplit
+
+from mock_server.catalog import DEFAULT_PAGE_SIZE, InvalidCursor
+
+DEFAULT_CACHE_BYTES = 256 * 1024 * 1024
+
+# Bytes encoded per base64 step; a multiple of 3 so chunks need no padding
+_ENCODE_CHUNK = 3 * 256 * 1024
+
+# Bytes inspected to tell text from binary when the extension is unknown
+_SNIFF_BYTES = 1024
+
+_SIGNATURE_SIZE = 12
+
+# Non-text/* types served as text
+_TEXT_TYPES = {
+    "application/json",
+    "application/xml",
+    "application/javascript",
+    "application/x-sh",
+    "application/toml",
+    "application/yaml",
+}
+
+ETag = Tuple[int, int, int]
+
+
+def _etag(stat: os.stat_result) -> ETag:
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+
+def _is_text_type(mime_type: str) -> bool:
+    return (
+        mime_type.startswith("text/")
+        or mime_type in _TEXT_TYPES
+        or mime_type.endswith(("+json", "+xml"))
+    )
+
+
+class FileProvider:
+    """Resources backed by the files under a directory."""
+
+    def __init__(
+        self,
+        root: str,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        cache_bytes: int = DEFAULT_CACHE_BYTES,
+    ):
+        """Initialize the provider.
+
+        Args:
+            root: Directory whose files are served
+            page_size: Maximum number of resources per list page
+            cache_bytes: Budget for cached encoded read results. Files whose
+                encoding is larger are never cached
+
+        Raises:
+            ValueError: If root is not a directory
+        """
+        self.root = Path(root).resolve()
+        if not self.root.is_dir():
+            raise ValueError(f"Not a directory: {root}")
+        if page_size < 1:
+            raise ValueError("page_size must be at least 1")
+        self.page_size = page_size
+        self.cache_bytes = cache_bytes
+        self.uri_prefix = self.root.as_uri() + "/"
+        # Same key in every worker process serving this root
+        self._key = hashlib.sha256(f"mcp-mock-files:{self.root}".encode()).digest()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[str, Tuple[ETag, bytearray]]" = OrderedDict()
+        self._cached_bytes = 0
+        self._watched: Dict[str, Optional[ETag]] = {}
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Worker processes start with their own cache
+        return {
+            "root": self.root,
+            "page_size": self.page_size,
+            "cache_bytes": self.cache_bytes,
+            "uri_prefix": self.uri_prefix,
+            "_key": self._key,
+        }
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._reset()
+
+    def uri(self, parts: Tuple[str, ...]) -> str:
+        """Return the file:// URI of a path relative to the root."""
+        return self.root.joinpath(*parts).as_uri()
+
+    def path(self, uri: str) -> Optional[Path]:
+        """Return the file a URI names, or None if it is not served.
+
+        Paths escaping the root, through ``..`` or symbolic links, are not
+        served.
+        """
+        if not uri.startswith(self.uri_prefix):
+            return None
+        path = Path(unquote(urlsplit(uri).path))
+        try:
+            resolved = path.resolve()
+        except (OSError, RuntimeError):
+            return None
+        if self.root not in resolved.parents or not resolved.is_file():
+            return None
+        return resolved
+
+    def owns(self, uri: str) -> bool:
+        """Return True if a URI points inside the served directory."""
+        return uri.startswith(self.uri_prefix)
+
+    def mime_type(self, path: Path) -> str:
+        """Guess a file's MIME type from its name, or its content if unknown."""
+        mime_type, _ = mimetypes.guess_type(path.name)
+        if mime_type is not None:
+            return mime_type
+        try:
+            with open(path, "rb") as f:
+                head = f.read(_SNIFF_BYTES)
+        except OSError:
+            return "application/octet-stream"
+        if b"\0" in head:
+            return "application/octet-stream"
+        try:
+            head.decode("utf-8")
+        except UnicodeDecodeError as e:
+            # A multi-byte character may be cut off at the end of the sample
+            if e.start < len(head) - 3:
+                return "application/octet-stream"
+        return "text/plain"
+
+    # Listing
+
+    def _walk(
+        self, directory: Path, parts: Tuple[str, ...], after: Tuple[str, ...]
+    ) -> Iterator[Tuple[Tuple[str, ...], os.DirEntry]]:
+        """Yield the files under a directory in path order, after ``after``."""
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except OSError:
+            return
+        for entry in entries:
+            entry_parts = parts + (entry.name,)
+            # Skip subtrees and files that sort entirely before the cursor
+            if entry_parts < after[: len(entry_parts)]:
+                continue
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    yield from self._walk(Path(entry.path), entry_parts, after)
+                elif entry.is_file(follow_symlinks=False) and entry_parts > after:
+                    yield entry_parts, entry
+            except OSError:
+                continue
+
+    def encode_cursor(self, parts: Tuple[str, ...]) -> str:
+        """Return the opaque cursor for the page following a file."""
+        payload = json.dumps(parts, separators=(",", ":")).encode("utf-8")
+        signature = hmac.new(self._key, payload, "sha256").digest()[:_SIGNATURE_SIZE]
+        return base64.urlsafe_b64encode(signature + payload).decode().rstrip("=")
+
+    def decode_cursor(self, cursor: str) -> Tuple[str, ...]:
+        """Return the path a cursor resumes after.
+
+        Raises:
+            InvalidCursor: If the cursor was not issued for this directory
+        """
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        except ValueError:
+            raise InvalidCursor("Cursor is not valid base64")
+        signature, payload = raw[:_SIGNATURE_SIZE], raw[_SIGNATURE_SIZE:]
+        expected = hmac.new(self._key, payload, "sha256").digest()[:_SIGNATURE_SIZE]
+        if not hmac.compare_digest(signature, expected):
+            raise InvalidCursor("Cursor signature does not match")
+        return tuple(json.loads(payload))
+
+    def page(
+        self, cursor: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Return a page of resources and the cursor of the next one.
+
+        Raises:
+            InvalidCursor: If the cursor was not issued for this directory
+        """
+        after = self.decode_cursor(cursor) if cursor is not None else ()
+        walk = self._walk(self.root, (), after)
+        resources = []
+        last: Tuple[str, ...] = ()
+        for parts, entry in walk:
+            if len(resources) == self.page_size:
+                return resources, self.encode_cursor(last)
+            path = Path(entry.path)
+            try:
+                size = entry.stat(follow_symlinks=False).st_size
+            except OSError:
+                continue
+            resources.append(
+                {
+                    "uri": self.uri(parts),
+                    "name": "/".join(parts),
+                    "description": f"{size} bytes",
+                    "mimeType": self.mime_type(path),
+                }
+            )
+            last = parts
+        return resources, None
+
+    # Reading
+
+    def read(self, uri: str) -> Optional[bytearray]:
+        """Return the JSON-encoded resources/read result for a file.
+
+        Returns:
+            The encoded result, or None if the URI names no served file
+        """
+        path = self.path(uri)
+        if path is None:
+            return None
+        try:
+            etag = _etag(path.stat())
+        except OSError:
+            return None
+
+        with self._lock:
+            cached = self._cache.get(uri)
+            if cached is not None and cached[0] == etag:
+                self._cache.move_to_end(uri)
+                return cached[1]
+
+        try:
+            encoded = self._encode(uri, path)
+        except OSError:
+            return None
+        self._store(uri, etag, encoded)
+        return encoded
+
+    def _encode(self, uri: str, path: Path) -> bytearray:
+        mime_type = self.mime_type(path)
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+            try:
+                if _is_text_type(mime_type):
+                    content = {
+                        "type": "resource_text",
+                        "uri": uri,
+                        "mimeType": mime_type,
+                        "text": data[:].decode("utf-8", errors="replace"),
+                    }
+                    return bytearray(
+                        json.dumps(
+                            {"contents": [content]}, separators=(",", ":")
+                        ).encode("utf-8")
+                    )
+                return self._encode_blob(uri, mime_type, data, size)
+            finally:
+                if size:
+                    data.close()
+
+    def _encode_blob(self, uri: str, mime_type: str, data, size: int) -> bytearray:
+        """Encode a blob result, base64-encoding the file a chunk at a time."""
+        head = json.dumps(
+            {"type": "resource_blob", "uri": uri, "mimeType": mime_type},
+            separators=(",", ":"),
+        ).encode("utf-8")
+        prefix = b'{"contents":[' + head[:-1] + b',"blob":"'
+        suffix = b'"}]}'
+        out = bytearray(len(prefix) + 4 * ((size + 2) // 3) + len(suffix))
+        out[: len(prefix)] = prefix
+        position = len(prefix)
+        view = memoryview(data) if size else b""
+        try:
+            for start in range(0, size, _ENCODE_CHUNK):
+                chunk = binascii.b2a_base64(
+                    view[start : start + _ENCODE_CHUNK], newline=False
+                )
+                out[position : position + len(chunk)] = chunk
+                position += len(chunk)
+        finally:
+            if size:
+                view.release()
+        out[position:] = suffix
+        return out
+
+    def _store(self, uri: str, etag: ETag, encoded: bytearray) -> None:
+        if len(encoded) > self.cache_bytes:
+            return
+        with self._lock:
+            previous = self._cache.pop(uri, None)
+            if previous is not None:
+                self._cached_bytes -= len(previous[1])
+            self._cache[uri] = (etag, encoded)
+            self._cached_bytes += len(encoded)
+            while self._cached_bytes > self.cache_bytes:
+                _, (_, evicted) = self._cache.popitem(last=False)
+                self._cached_bytes -= len(evicted)
+
+    # Watching
+
+    def _current_etag(self, uri: str) -> Optional[ETag]:
+        path = self.path(uri)
+        try:
+            return _etag(path.stat()) if path is not None else None
+        except OSError:
+            return None
+
+    def watch(self, uri: str) -> None:
+        """Start tracking changes to a file, if not already tracked."""
+        if uri not in self._watched:
+            self._watched[uri] = self._current_etag(uri)
+
+    def changed(self, uris: List[str]) -> List[str]:
+        """Return which of the given files changed since the last call.
+
+        Files no longer in ``uris`` stop being tracked. A deleted file counts
+        as changed.
+        """
+        changed = []
+        watched = {}
+        for uri in uris:
+            etag = self._current_etag(uri)
+            if uri in self._watched and self._watched[uri] != etag:
+                changed.append(uri)
+            watched[uri] = etag
+        self._watched = watched
+        return changed
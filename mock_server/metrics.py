@@ -0,0 +1,185 @@
+"""Request metrics for the mock server, in the Prometheus text format.
+
+Every JSON-RPC request is counted in a fixed-bucket latency histogram keyed by
+method and transport, and every error response by its code. Recording is a
+dict lookup, a bisect over the bucket bounds and a few additions, so it costs
+well under a microsecond. Cumulative bucket counts and the text exposition
+are only computed when metrics are scraped.
+
+With several workers each process records its own metrics. A scrape gathers
+every worker's snapshot and merges them, so the totals cover the whole server.
+"""
+
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Upper bounds of the latency histogram buckets, in seconds
+DEFAULT_BUCKETS = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+# A gauge or counter computed at scrape time: type, help text and value
+Sample = Tuple[str, str, float]
+
+
+class Histogram:
+    """Latency counts of one method on one transport."""
+
+    __slots__ = ("counts", "sum")
+
+    def __init__(self, size: int):
+        # One count per bucket plus one for values above the last bound
+        self.counts = [0] * size
+        self.sum = 0.0
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels: Any) -> str:
+    return ",".join(f'{key}="{_escape(str(value))}"' for key, value in labels.items())
+
+
+def _format_bound(bound: float) -> str:
+    return repr(float(bound))
+
+
+class Metrics:
+    """Request counters and latency histograms per method and transport."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """Initialize empty metrics.
+
+        Args:
+            buckets: Increasing upper bounds of the latency buckets, in seconds
+        """
+        self.buckets = tuple(buckets)
+        self._histograms: Dict[Tuple[str, str], Histogram] = {}
+        self._errors: Dict[Tuple[str, str, int], int] = {}
+
+    def observe(
+        self,
+        method: str,
+        transport: str,
+        seconds: float,
+        error_code: Optional[int] = None,
+    ) -> None:
+        """Record one request.
+
+        Args:
+            method: JSON-RPC method, or a placeholder for invalid requests
+            transport: Transport the request arrived on
+            seconds: Time taken to produce the response
+            error_code: JSON-RPC error code of the response, if it is an error
+        """
+        key = (method, transport)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            histogram = self._histograms[key] = Histogram(len(self.buckets) + 1)
+        histogram.counts[bisect_left(self.buckets, seconds)] += 1
+        histogram.sum += seconds
+        if error_code is not None:
+            error_key = (method, transport, error_code)
+            self._errors[error_key] = self._errors.get(error_key, 0) + 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the recorded metrics as JSON-serializable data."""
+        return {
+            "buckets": list(self.buckets),
+            "requests": [
+                [method, transport, list(h.counts), h.sum]
+                for (method, transport), h in self._histograms.items()
+            ],
+            "errors": [
+                [method, transport, code, count]
+                for (method, transport, code), count in self._errors.items()
+            ],
+        }
+
+
+def merge_snapshots(snapshots: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Add up the snapshots of several workers with the same buckets."""
+    buckets: List[float] = []
+    requests: Dict[Tuple[str, str], List[Any]] = {}
+    errors: Dict[Tuple[str, str, int], int] = {}
+    for snapshot in snapshots:
+        buckets = snapshot["buckets"]
+        for method, transport, counts, total in snapshot["requests"]:
+            entry = requests.get((method, transport))
+            if entry is None:
+                requests[(method, transport)] = [list(counts), total]
+            else:
+                entry[0] = [a + b for a, b in zip(entry[0], counts)]
+                entry[1] += total
+        for method, transport, code, count in snapshot["errors"]:
+            key = (method, transport, code)
+            errors[key] = errors.get(key, 0) + count
+    return {
+        "buckets": buckets,
+        "requests": [
+            [m, t, counts, total] for (m, t), (counts, total) in requests.items()
+        ],
+        "errors": [[m, t, code, count] for (m, t, code), count in errors.items()],
+    }
+
+
+def render(snapshot: Dict[str, Any], samples: Dict[str, Sample]) -> str:
+    """Format metrics in the Prometheus text exposition format.
+
+    Args:
+        snapshot: Request metrics, from Metrics.snapshot or merge_snapshots
+        samples: Other metrics by name, such as connection gauges
+    """
+    lines = []
+    requests = sorted(snapshot["requests"])
+    bounds = [_format_bound(b) for b in snapshot["buckets"]] + ["+Inf"]
+
+    lines.append("# HELP mcp_requests_total JSON-RPC requests processed.")
+    lines.append("# TYPE mcp_requests_total counter")
+    for method, transport, counts, _ in requests:
+        labels = _labels(method=method, transport=transport)
+        lines.append(f"mcp_requests_total{{{labels}}} {sum(counts)}")
+
+    lines.append("# HELP mcp_request_errors_total JSON-RPC error responses, by code.")
+    lines.append("# TYPE mcp_request_errors_total counter")
+    for method, transport, code, count in sorted(snapshot["errors"]):
+        labels = _labels(method=method, transport=transport, code=code)
+        lines.append(f"mcp_request_errors_total{{{labels}}} {count}")
+
+    lines.append(
+        "# HELP mcp_request_duration_seconds Time to produce JSON-RPC responses."
+    )
+    lines.append("# TYPE mcp_request_duration_seconds histogram")
+    for method, transport, counts, total in requests:
+        labels = _labels(method=method, transport=transport)
+        cumulative = 0
+        for bound, count in zip(bounds, counts):
+            cumulative += count
+            lines.append(
+                f'mcp_request_duration_seconds_bucket{{{labels},le="{bound}"}} '
+                f"{cumulative}"
+            )
+        lines.append(f"mcp_request_duration_seconds_sum{{{labels}}} {total!r}")
+        lines.append(f"mcp_request_duration_seconds_count{{{labels}}} {cumulative}")
+
+    for name, (kind, help_text, value) in samples.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        lines.append(f"{name} {value}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,165 @@
+"""Token-bucket rate limiting for the mock server.
+
+A rate limit configuration sets a bucket per client for each JSON-RPC method
+(``*`` for any other method), and optionally one per client across all
+methods::
+
+    {
+        "client": {"rate": 500, "burst": 1000},
+        "methods": {
+            "tools/call": {"rate": 100, "burst": 50},
+            "*": {"rate": 1000, "burst": 1000}
+        }
+    }
+
+``rate`` is the number of requests per second a bucket refills with and
+``burst`` how many it holds. A bucket starts full, each request takes a
+token, and a request finding its bucket empty is refused. Buckets refill
+lazily when used, so a check is O(1) and idle clients cost nothing but their
+last state. Buckets are kept in least-recently-used order and the oldest are
+forgotten past ``max_buckets``, which at worst lets a forgotten client start
+over with a full bucket.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+# The tools/call and completion/complete limits the specification requires
+DEFAULT_RATE_LIMITS = {
+    "methods": {
+        "tools/call": {"rate": 100, "burst": 50},
+        "completion/complete": {"rate": 200, "burst": 100},
+    }
+}
+
+DEFAULT_MAX_BUCKETS = 100_000
+
+
+class Limit:
+    """The refill rate and capacity of a kind of bucket."""
+
+    __slots__ = ("rate", "burst")
+
+    def __init__(self, config: Dict[str, Any]):
+        """Parse a limit.
+
+        Raises:
+            ValueError: If the configuration is invalid
+        """
+        if not isinstance(config, dict):
+            raise ValueError("A rate limit must be an object")
+        for key in ("rate", "burst"):
+            value = config.get(key)
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                raise ValueError(f"'{key}' must be a number")
+            if value <= 0:
+                raise ValueError(f"'{key}' must be positive")
+        self.rate = float(config["rate"])
+        self.burst = float(config["burst"])
+
+
+class TokenBucket:
+    """Tokens available to one client, refilled as time passes."""
+
+    __slots__ = ("limit", "tokens", "updated")
+
+    def __init__(self, limit: Limit, now: float):
+        self.limit = limit
+        self.tokens = limit.burst
+        self.updated = now
+
+    def take(self, now: float) -> float:
+        """Take a token if one is available.
+
+        Returns:
+            0 if a token was taken, else the seconds until one is available
+        """
+        limit = self.limit
+        self.tokens = min(limit.burst, self.tokens + (now - self.updated) * limit.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / limit.rate
+
+    def refund(self) -> None:
+        """Give back a token taken by a request that was refused anyway."""
+        self.tokens = min(self.limit.burst, self.tokens + 1)
+
+
+class RateLimiter:
+    """Decides which requests are over their client's limits."""
+
+    def __init__(
+        self,
+        config: Optional[Dict[str, Any]] = None,
+        max_buckets: int = DEFAULT_MAX_BUCKETS,
+    ):
+        """Parse a rate limit configuration.
+
+        Args:
+            config: The configuration described in the module docstring, or
+                None to limit nothing
+            max_buckets: Number of buckets kept before the least recently
+                used are forgotten
+
+        Raises:
+            ValueError: If the configuration is invalid
+        """
+        config = config or {}
+        if not isinstance(config, dict):
+            raise ValueError("The rate limit configuration must be an object")
+        methods = config.get("methods", {})
+        if not isinstance(methods, dict):
+            raise ValueError("'methods' must map method names to limits")
+        self.config = config
+        self.methods = {method: Limit(limit) for method, limit in methods.items()}
+        self.client = Limit(config["client"]) if "client" in config else None
+        self.max_buckets = max_buckets
+        self._buckets: "OrderedDict[Hashable, TokenBucket]" = OrderedDict()
+
+    def _bucket(self, key: Hashable, limit: Limit, now: float) -> TokenBucket:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = TokenBucket(limit, now)
+            if len(self._buckets) > self.max_buckets:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+        return bucket
+
+    def applies(self, method: str) -> bool:
+        """Tell whether any limit applies to a method."""
+        return self.client is not None or method in self.methods or "*" in self.methods
+
+    def check(self, client: str, method: str, now: Optional[float] = None) -> float:
+        """Count a request against its limits.
+
+        Args:
+            client: Identity of the caller
+            method: JSON-RPC method called
+            now: Current time on the monotonic clock, read if not given
+
+        Returns:
+            0 if the request is allowed, else the seconds until it would be
+        """
+        limit = self.methods.get(method) or self.methods.get("*")
+        if limit is None and self.client is None:
+            return 0.0
+        if now is None:
+            now = time.monotonic()
+
+        method_bucket = None
+        if limit is not None:
+            method_bucket = self._bucket((client, method), limit, now)
+            wait = method_bucket.take(now)
+            if wait:
+                return wait
+        if self.client is not None:
+            wait = self._bucket(client, self.client, now).take(now)
+            if wait:
+                if method_bucket is not None:
+                    method_bucket.refund()
+                return wait
+        return 0.0
@@ -4,26 +4,53 @@ This module provides a FastAPI-based mock server that implements the MCP specifi
 for testing purposes. It returns well-formed responses that match the schema.
 """
 
+import asyncio
+import multiprocessing
+import socket
+import sys
+import time
+from contextvars import ContextVar
 from fastapi import FastAPI, Request, HTTPException, WebSocket
-from fastapi.responses import JSONResponse
+from starlette.requests import HTTPConnection
+from fastapi.responses import Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 import json
-from typing import Dict, Any, Optional, Union, List
+import uuid
+from typing import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Any,
+    Optional,
+    Union,
+    List,
+    Tuple,
+)
 import uvicorn
 import logging
 from pydantic import ValidationError
 
+from mock_server.broker import Broker, BrokerClient
+from mock_server.catalog import InvalidCursor, SyntheticCatalog
+from mock_server.completion import CompletionIndex
+from mock_server.files import FileProvider
+from mock_server.faults import DRIP, DROP, NO_FAULTS, TRUNCATE, FaultInjector, FaultPlan
+from mock_server.metrics import Metrics, Sample, merge_snapshots, render
+from mock_server.ratelimit import DEFAULT_RATE_LIMITS, RateLimiter
+from mock_server.subscriptions import (
+    DEFAULT_QUEUE_SIZE,
+    DROP_OLDEST,
+    Connection,
+    SubscriptionRegistry,
+)
 from mcp.protocol.schema import (
-    JsonRpcRequest,
-    JsonRpcResponse,
     ToolsListResult,
     PromptsListResult,
     PromptsGetResult,
     ResourcesListResult,
     ResourcesReadResult,
     ResourcesTemplatesListResult,
-    ToolCallResult,
-    CompletionResult,
 )
 
 logger = logging.getLogger(__name__)
@@ -39,8 +66,70 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Store active WebSocket connections
-active_connections: List[WebSocket] = []
+# Open WebSocket and SSE streams and the resource subscriptions made on them
+subscriptions = SubscriptionRegistry()
+
+# The stream the request being processed arrived on, if it has one
+current_connection: ContextVar[Optional[Connection]] = ContextVar(
+    "current_connection", default=None
+)
+
+# Identity of the client that sent the request being processed, which rate
+# limits are kept per
+current_client: ContextVar[str] = ContextVar("current_client", default="local")
+
+# Transport the request being processed arrived on, a metrics label
+current_transport: ContextVar[str] = ContextVar("current_transport", default="http")
+
+# Request counts and latencies, served by /metrics
+metrics = Metrics()
+
+# Method labels of requests without a valid method, so that clients cannot
+# create unbounded numbers of metric series
+INVALID_METHOD = "(invalid)"
+UNKNOWN_METHOD = "(unknown)"
+
+# Latency and faults injected into responses
+faults = FaultInjector()
+
+# Request rate limits per client and method
+limiter = RateLimiter(DEFAULT_RATE_LIMITS)
+
+# Broker key of the worker that keeps the rate limit buckets
+RATE_LIMIT_KEY = "rate-limits"
+
+# JSON-RPC error code of requests refused by a rate limit
+RATE_LIMITED = -32029
+
+# Connection to the other worker processes when running with several workers
+broker: Optional[BrokerClient] = None
+
+# Outgoing message queues of open SSE streams, keyed by session id
+sse_sessions: Dict[str, asyncio.Queue] = {}
+
+# Messages an SSE stream buffers before writers wait for the client to read
+SSE_STREAM_QUEUE_SIZE = 64
+
+# Strong references to fire-and-forget tasks so they are not garbage collected
+background_tasks = set()
+
+# Synthetic large catalog replacing the built-in tools and resources, if any
+CATALOG: Optional[SyntheticCatalog] = None
+
+# Directory served as resources instead of the built-in ones, if any
+FILES: Optional[FileProvider] = None
+
+# Seconds between checks of subscribed files for changes
+FILE_WATCH_INTERVAL = 1.0
+
+# Task polling subscribed files, started by the first subscription to one
+file_watcher: Optional[asyncio.Task] = None
+
+# Longest line accepted in stdio mode, in bytes
+STDIO_LINE_LIMIT = 64 * 1024 * 1024
+
+# Seconds between keep-alive comments on idle SSE streams
+SSE_KEEPALIVE_INTERVAL = 15.0
 
 # Mock capabilities data
 MOCK_CAPABILITIES = {
@@ -245,432 +334,1340 @@ MOCK_COMPLETIONS = {
 }
 
 
-def create_jsonrpc_response(
-    id: Optional[Union[int, str]], result: Any
-) -> Dict[str, Any]:
-    """Create a JSON-RPC response object."""
-    return JsonRpcResponse(jsonrpc="2.0", id=id, result=result).dict()
+class RpcError(Exception):
+    """A JSON-RPC error raised by a method handler."""
+
+    def __init__(self, code: int, message: str):
+        self.code = code
+        self.message = message
+        super().__init__(message)
+
+
+class PreEncoded:
+    """A result serialized to JSON once, ready to be spliced into responses."""
 
+    __slots__ = ("json",)
 
-def create_jsonrpc_error(
-    id: Optional[Union[int, str]], code: int, message: str
-) -> Dict[str, Any]:
-    """Create a JSON-RPC error response object."""
-    return JsonRpcResponse(
-        jsonrpc="2.0", id=id, error={"code": code, "message": message}
-    ).dict()
+    def __init__(self, result: Any):
+        self.json = encode_json(result)
+
+    @classmethod
+    def from_json(cls, data: Union[bytes, bytearray]) -> "PreEncoded":
+        """Wrap a result that is already JSON-encoded."""
+        encoded = cls.__new__(cls)
+        encoded.json = data
+        return encoded
+
+
+Handler = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+# Dispatch table from JSON-RPC method name to its handler
+METHOD_HANDLERS: Dict[str, Handler] = {}
+
+
+def rpc_method(name: str) -> Callable[[Handler], Handler]:
+    """Register the decorated coroutine as the handler for a JSON-RPC method.
+
+    Handlers receive the request params and return the result, either as a
+    JSON-serializable value or as a PreEncoded result. They report failures
+    by raising RpcError.
+    """
+
+    def register(handler: Handler) -> Handler:
+        METHOD_HANDLERS[name] = handler
+        return handler
+
+    return register
+
+
+def encode_json(value: Any) -> bytes:
+    """Serialize a value to compact UTF-8 JSON."""
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def encode_response(id: Optional[Union[int, str]], result: Any) -> bytes:
+    """Encode a JSON-RPC response, splicing in a pre-encoded result as is."""
+    result_json = result.json if isinstance(result, PreEncoded) else encode_json(result)
+    return b'{"jsonrpc":"2.0","id":%s,"result":%s}' % (encode_json(id), result_json)
+
+
+def encode_error(id: Optional[Union[int, str]], code: int, message: str) -> bytes:
+    """Encode a JSON-RPC error response."""
+    return encode_json(
+        {"jsonrpc": "2.0", "id": id, "error": {"code": code, "message": message}}
+    )
 
 
 def create_jsonrpc_notification(method: str, params: Any) -> Dict[str, Any]:
     """Create a JSON-RPC notification object."""
-    return JsonRpcResponse(jsonrpc="2.0", method=method, params=params).dict()
+    return {"jsonrpc": "2.0", "method": method, "params": params}
 
 
-@app.post("/")
-async def handle_jsonrpc(request: Request) -> JSONResponse:
-    """Handle JSON-RPC requests."""
-    try:
-        # Parse request body
-        body = await request.json()
+def is_notification(message: Any) -> bool:
+    """Return True if a JSON-RPC message is a notification (has no id)."""
+    return isinstance(message, dict) and "id" not in message
+
+
+# Results that only depend on the mock data, encoded once by build_static_results
+STATIC_RESULTS: Dict[str, PreEncoded] = {}
+RESOURCE_READ_RESULTS: Dict[str, PreEncoded] = {}
+PROMPT_GET_RESULTS: Dict[str, Union[PreEncoded, RpcError]] = {}
+
+
+def build_static_results() -> None:
+    """Validate and encode the results derived from the mock data.
+
+    Call again after changing the mock data so responses pick up the change.
+    """
+    STATIC_RESULTS.update(
+        {
+            "capabilities": PreEncoded(MOCK_CAPABILITIES),
+            "tools": PreEncoded(ToolsListResult(tools=MOCK_TOOLS).model_dump()),
+            "tools_page_1": PreEncoded(
+                ToolsListResult(tools=MOCK_TOOLS[:2], nextCursor="page2").model_dump()
+            ),
+            "tools_page_2": PreEncoded(
+                ToolsListResult(tools=MOCK_TOOLS[2:]).model_dump()
+            ),
+            "prompts": PreEncoded(PromptsListResult(**MOCK_PROMPTS).model_dump()),
+            "prompts_page_1": PreEncoded(
+                PromptsListResult(**MOCK_PROMPTS_PAGE_1).model_dump()
+            ),
+            "prompts_page_2": PreEncoded(
+                PromptsListResult(**MOCK_PROMPTS_PAGE_2).model_dump()
+            ),
+            "resources": PreEncoded(
+                ResourcesListResult(resources=MOCK_RESOURCES).model_dump()
+            ),
+            "resources_page_1": PreEncoded(
+                ResourcesListResult(**MOCK_RESOURCES_PAGE_1).model_dump()
+            ),
+            "resources_page_2": PreEncoded(
+                ResourcesListResult(**MOCK_RESOURCES_PAGE_2).model_dump()
+            ),
+            "templates": PreEncoded(
+                ResourcesTemplatesListResult(
+                    resourceTemplates=MOCK_RESOURCE_TEMPLATES
+                ).model_dump()
+            ),
+        }
+    )
+
+    RESOURCE_READ_RESULTS.clear()
+    for uri, content in MOCK_RESOURCE_CONTENTS.items():
+        RESOURCE_READ_RESULTS[uri] = PreEncoded(
+            ResourcesReadResult(contents=[content]).model_dump()
+        )
 
-        # Validate request against schema
+    PROMPT_GET_RESULTS.clear()
+    for name, content in MOCK_PROMPT_CONTENT.items():
         try:
-            rpc_request = JsonRpcRequest(**body)
-        except ValidationError as e:
-            return JSONResponse(
-                content=create_jsonrpc_error(
-                    body.get("id"), -32600, f"Invalid Request: {str(e)}"
-                ),
-                media_type="application/json",
+            PROMPT_GET_RESULTS[name] = PreEncoded(
+                PromptsGetResult(**content).model_dump()
             )
+        except ValidationError as e:
+            # Served as an internal error, as validating per request would
+            PROMPT_GET_RESULTS[name] = RpcError(-32603, str(e))
 
-        method = rpc_request.method
-        params = rpc_request.params or {}
-        id = rpc_request.id
 
-        # Handle capabilities/get method
-        if method == "capabilities/get":
-            return JSONResponse(
-                content=create_jsonrpc_response(id, MOCK_CAPABILITIES),
-                media_type="application/json",
-            )
+build_static_results()
 
-        # Handle tools/list method
-        elif method == "tools/list":
-            cursor = params.get("cursor")
-            use_pagination = params.get("use_pagination")
-
-            # Validate parameters
-            if cursor is not None and not isinstance(cursor, str):
-                return JSONResponse(
-                    content=create_jsonrpc_error(id, -32602, "Invalid cursor type"),
-                    media_type="application/json",
-                )
-            if use_pagination is not None and not isinstance(use_pagination, bool):
-                return JSONResponse(
-                    content=create_jsonrpc_error(id, -32602, "Invalid pagination type"),
-                    media_type="application/json",
-                )
-
-            # Handle pagination
-            if cursor == "page2":
-                result = ToolsListResult(tools=MOCK_TOOLS[2:], nextCursor=None)
-            elif cursor and cursor != "page2":
-                return JSONResponse(
-                    content=create_jsonrpc_error(id, -32602, "Invalid cursor value"),
-                    media_type="application/json",
-                )
-            elif use_pagination or cursor:
-                result = ToolsListResult(tools=MOCK_TOOLS[:2], nextCursor="page2")
-            else:
-                result = ToolsListResult(tools=MOCK_TOOLS, nextCursor=None)
-
-            return JSONResponse(
-                content=create_jsonrpc_response(id, result.dict()),
-                media_type="application/json",
-            )
+# Completion indexes keyed by ("prompt", name, argument) or ("resource", uri)
+COMPLETION_INDEXES: Dict[tuple, CompletionIndex] = {}
 
-        # Handle tools/call method
-        elif method == "tools/call":
-            tool_name = params.get("name")
-            tool_args = params.get("arguments", {})
-
-            if not tool_name or not isinstance(tool_name, str):
-                return JSONResponse(
-                    content=create_jsonrpc_error(
-                        id, -32602, "Missing or invalid tool name"
-                    ),
-                    media_type="application/json",
-                )
-
-            # Find the tool
-            tool = next((t for t in MOCK_TOOLS if t["name"] == tool_name), None)
-            if not tool:
-                return JSONResponse(
-                    content=create_jsonrpc_error(id, -32602, "Tool not found"),
-                    media_type="application/json",
-                )
-
-            # Mock successful tool call
-            result = ToolCallResult(
-                content=[
-                    {
-                        "type": "text",
-                        "text": f"Mock result for {tool_name} with args: {tool_args}",
-                    }
-                ],
-                isError=False,
-            )
 
-            return JSONResponse(
-                content=create_jsonrpc_response(id, result.dict()),
-                media_type="application/json",
+def build_completion_indexes(extra_values: List[str] = ()) -> None:
+    """Index the completion vocabularies of every prompt argument and template.
+
+    Args:
+        extra_values: Values added to every vocabulary, such as a large
+            synthetic one for benchmarking
+    """
+    COMPLETION_INDEXES.clear()
+    for prompt_name, arguments in MOCK_COMPLETIONS["prompt"].items():
+        for arg_name, values in arguments.items():
+            COMPLETION_INDEXES[("prompt", prompt_name, arg_name)] = CompletionIndex(
+                [*values, *extra_values]
             )
+    for uri, values in MOCK_COMPLETIONS["resource"].items():
+        COMPLETION_INDEXES[("resource", uri)] = CompletionIndex(
+            [*values, *extra_values]
+        )
 
-        # Handle completion/complete method
-        elif method == "completion/complete":
-            ref = params.get("ref")
-            if not ref or not isinstance(ref, dict):
-                return JSONResponse(
-                    content=create_jsonrpc_error(id, -32602, "Invalid ref parameter"),
-                    media_type="application/json",
-                )
-
-            ref_type = ref.get("type")
-            if ref_type == "ref/prompt":
-                prompt_name = ref.get("name")
-                arg = params.get("argument", {})
-                arg_name = arg.get("name")
-                arg_value = arg.get("value", "")
-
-                if not prompt_name or not arg_name:
-                    return JSONResponse(
-                        content=create_jsonrpc_error(
-                            id, -32602, "Missing required parameters"
-                        ),
-                        media_type="application/json",
-                    )
 
-                # Get completions for prompt argument
-                completions = (
-                    MOCK_COMPLETIONS["prompt"].get(prompt_name, {}).get(arg_name, [])
-                )
-                filtered = [v for v in completions if arg_value.lower() in v.lower()]
-                result = {
-                    "completion": {
-                        "values": filtered[:10],
-                        "hasMore": len(filtered) > 10,
-                        "total": len(filtered),
-                    }
-                }
+build_completion_indexes()
+
+
+def validate_request(body: Dict[str, Any]) -> Optional[str]:
+    """Check a request object against the JSON-RPC request schema.
+
+    Returns:
+        A description of the first problem found, or None if it is valid
+    """
+    if body.get("jsonrpc") != "2.0":
+        return "jsonrpc must be '2.0'"
+    if not isinstance(body.get("method"), str):
+        return "method must be a string"
+    id = body.get("id")
+    if id is not None and (isinstance(id, bool) or not isinstance(id, (int, str))):
+        return "id must be a string, an integer or null"
+    params = body.get("params")
+    if params is not None and not isinstance(params, dict):
+        return "params must be an object"
+    return None
+
+
+def select_page(
+    params: Dict[str, Any], full: str, page_1: str, page_2: str
+) -> PreEncoded:
+    """Pick the static result for a paginated list request."""
+    cursor = params.get("cursor")
+    use_pagination = params.get("use_pagination")
+
+    # Validate parameters
+    if cursor is not None and not isinstance(cursor, str):
+        raise RpcError(-32602, "Invalid cursor type")
+    if use_pagination is not None and not isinstance(use_pagination, bool):
+        raise RpcError(-32602, "Invalid pagination type")
+
+    # Handle pagination
+    if cursor == "page2":
+        return STATIC_RESULTS[page_2]
+    if cursor:
+        raise RpcError(-32602, "Invalid cursor value")
+    if use_pagination:
+        return STATIC_RESULTS[page_1]
+    return STATIC_RESULTS[full]
+
+
+def catalog_page(params: Dict[str, Any], kind: str) -> Dict[str, Any]:
+    """Serve a page of a synthetic catalog list.
+
+    Catalog lists are always paginated, whatever ``use_pagination`` says.
+    """
+    cursor = params.get("cursor")
+    if cursor is not None and not isinstance(cursor, str):
+        raise RpcError(-32602, "Invalid cursor type")
+    try:
+        items, next_cursor = CATALOG.page(kind, cursor)
+    except InvalidCursor:
+        raise RpcError(-32602, "Invalid cursor value")
+    result = {kind: items}
+    if next_cursor is not None:
+        result["nextCursor"] = next_cursor
+    return result
+
+
+async def files_page(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Serve a page of the served directory's files.
+
+    Directory listings are always paginated, whatever ``use_pagination`` says.
+    """
+    cursor = params.get("cursor")
+    if cursor is not None and not isinstance(cursor, str):
+        raise RpcError(-32602, "Invalid cursor type")
+    loop = asyncio.get_running_loop()
+    try:
+        items, next_cursor = await loop.run_in_executor(None, FILES.page, cursor)
+    except InvalidCursor:
+        raise RpcError(-32602, "Invalid cursor value")
+    result = {"resources": items}
+    if next_cursor is not None:
+        result["nextCursor"] = next_cursor
+    return result
 
-            elif ref_type == "ref/resource":
-                uri = ref.get("uri")
-                value = params.get("value", "")
 
-                if not uri:
-                    return JSONResponse(
-                        content=create_jsonrpc_error(
-                            id, -32602, "Missing URI parameter"
-                        ),
-                        media_type="application/json",
-                    )
+def configure_catalog(catalog: Optional[SyntheticCatalog]) -> None:
+    """Serve tools and resources from a synthetic catalog, or None to stop.
 
-                # Get completions for resource URI
-                completions = MOCK_COMPLETIONS["resource"].get(uri, [])
-                filtered = [v for v in completions if value.lower() in v.lower()]
-                result = {
-                    "completion": {
-                        "values": filtered[:10],
-                        "hasMore": len(filtered) > 10,
-                        "total": len(filtered),
-                    }
-                }
+    The catalog's synthetic completion values, if any, are added to every
+    completion vocabulary.
+    """
+    global CATALOG
+    CATALOG = catalog
+    build_completion_indexes(catalog.completion_values() if catalog else ())
 
-            else:
-                return JSONResponse(
-                    content=create_jsonrpc_error(id, -32602, "Invalid ref type"),
-                    media_type="application/json",
-                )
 
-            return JSONResponse(
-                content=create_jsonrpc_response(id, result),
-                media_type="application/json",
-            )
+def require_string(params: Dict[str, Any], name: str) -> str:
+    """Return a required string parameter, raising invalid params otherwise."""
+    value = params.get(name)
+    if not value:
+        raise RpcError(-32602, f"Missing required parameter: {name}")
+    if not isinstance(value, str):
+        raise RpcError(-32602, f"Invalid {name} type")
+    return value
 
-        # Handle prompts/list method
-        elif method == "prompts/list":
-            cursor = params.get("cursor")
-            use_pagination = params.get("use_pagination")
-
-            # Validate parameters
-            if cursor is not None and not isinstance(cursor, str):
-                return JSONResponse(
-                    content=create_jsonrpc_error(id, -32602, "Invalid cursor type"),
-                    media_type="application/json",
-                )
-            if use_pagination is not None and not isinstance(use_pagination, bool):
-                return JSONResponse(
-                    content=create_jsonrpc_error(id, -32602, "Invalid pagination type"),
-                    media_type="application/json",
-                )
-
-            # Handle pagination
-            if cursor == "page2":
-                result = PromptsListResult(**MOCK_PROMPTS_PAGE_2)
-            elif cursor and cursor != "page2":
-                return JSONResponse(
-                    content=create_jsonrpc_error(id, -32602, "Invalid cursor value"),
-                    media_type="application/json",
-                )
-            elif use_pagination or cursor:
-                result = PromptsListResult(**MOCK_PROMPTS_PAGE_1)
-            else:
-                result = PromptsListResult(**MOCK_PROMPTS)
-
-            return JSONResponse(
-                content=create_jsonrpc_response(id, result.dict()),
-                media_type="application/json",
-            )
 
-        # Handle prompts/get method
-        elif method == "prompts/get":
-            name = params.get("name")
-            if not name:
-                return JSONResponse(
-                    content=create_jsonrpc_error(
-                        id, -32602, "Missing required parameter: name"
-                    ),
-                    media_type="application/json",
-                )
-            if not isinstance(name, str):
-                return JSONResponse(
-                    content=create_jsonrpc_error(id, -32602, "Invalid name type"),
-                    media_type="application/json",
-                )
-
-            content = MOCK_PROMPT_CONTENT.get(name)
-            if not content:
-                return JSONResponse(
-                    content=create_jsonrpc_error(id, -32602, "Prompt not found"),
-                    media_type="application/json",
-                )
-
-            result = PromptsGetResult(**content)
-            return JSONResponse(
-                content=create_jsonrpc_response(id, result.dict()),
-                media_type="application/json",
-            )
+@rpc_method("capabilities/get")
+async def capabilities_get(params: Dict[str, Any]) -> Any:
+    return STATIC_RESULTS["capabilities"]
 
-        # Resources endpoints
-        elif method == "resources/list":
-            cursor = params.get("cursor")
-            use_pagination = params.get("use_pagination")
-
-            # Validate parameters
-            if cursor is not None and not isinstance(cursor, str):
-                return JSONResponse(
-                    content=create_jsonrpc_error(id, -32602, "Invalid cursor type"),
-                    media_type="application/json",
-                )
-            if use_pagination is not None and not isinstance(use_pagination, bool):
-                return JSONResponse(
-                    content=create_jsonrpc_error(id, -32602, "Invalid pagination type"),
-                    media_type="application/json",
-                )
-
-            # Handle pagination
-            if cursor == "page2":
-                result = ResourcesListResult(**MOCK_RESOURCES_PAGE_2)
-            elif cursor and cursor != "page2":
-                return JSONResponse(
-                    content=create_jsonrpc_error(id, -32602, "Invalid cursor value"),
-                    media_type="application/json",
-                )
-            elif use_pagination or cursor:
-                result = ResourcesListResult(**MOCK_RESOURCES_PAGE_1)
-            else:
-                result = ResourcesListResult(resources=MOCK_RESOURCES, nextCursor=None)
-
-            return JSONResponse(
-                content=create_jsonrpc_response(id, result.dict()),
-                media_type="application/json",
-            )
 
-        elif method == "resources/read":
-            uri = params.get("uri")
-            if not uri:
-                return JSONResponse(
-                    content=create_jsonrpc_error(
-                        id, -32602, "Missing required parameter: uri"
-                    ),
-                    media_type="application/json",
-                )
-            if not isinstance(uri, str):
-                return JSONResponse(
-                    content=create_jsonrpc_error(id, -32602, "Invalid uri type"),
-                    media_type="application/json",
-                )
-
-            content = MOCK_RESOURCE_CONTENTS.get(uri)
-            if not content:
-                return JSONResponse(
-                    content=create_jsonrpc_error(id, -32002, "Resource not found"),
-                    media_type="application/json",
-                )
-
-            result = ResourcesReadResult(contents=[content])
-            return JSONResponse(
-                content=create_jsonrpc_response(id, result.dict()),
-                media_type="application/json",
-            )
+@rpc_method("tools/list")
+async def tools_list(params: Dict[str, Any]) -> Any:
+    if CATALOG is not None and CATALOG.tools:
+        return catalog_page(params, "tools")
+    return select_page(params, "tools", "tools_page_1", "tools_page_2")
 
-        elif method == "resources/templates/list":
-            result = ResourcesTemplatesListResult(
-                resourceTemplates=MOCK_RESOURCE_TEMPLATES
-            )
-            return JSONResponse(
-                content=create_jsonrpc_response(id, result.dict()),
-                media_type="application/json",
-            )
 
-        elif method == "resources/subscribe":
-            uri = params.get("uri")
-            if not uri:
-                return JSONResponse(
-                    content=create_jsonrpc_error(
-                        id, -32602, "Missing required parameter: uri"
-                    ),
-                    media_type="application/json",
-                )
-            if not isinstance(uri, str):
-                return JSONResponse(
-                    content=create_jsonrpc_error(id, -32602, "Invalid uri type"),
-                    media_type="application/json",
-                )
-
-            if uri not in MOCK_RESOURCE_CONTENTS:
-                return JSONResponse(
-                    content=create_jsonrpc_error(id, -32002, "Resource not found"),
-                    media_type="application/json",
-                )
-
-            return JSONResponse(
-                content=create_jsonrpc_response(
-                    id, {"subscriptionId": "mock_subscription_1"}
+@rpc_method("tools/call")
+async def tools_call(params: Dict[str, Any]) -> Any:
+    tool_name = params.get("name")
+    tool_args = params.get("arguments", {})
+
+    if not tool_name or not isinstance(tool_name, str):
+        raise RpcError(-32602, "Missing or invalid tool name")
+
+    # Find the tool
+    in_catalog = CATALOG is not None and CATALOG.tool_index(tool_name) is not None
+    if not in_catalog and not any(t["name"] == tool_name for t in MOCK_TOOLS):
+        raise RpcError(-32602, "Tool not found")
+
+    # Mock successful tool call
+    return {
+        "content": [
+            {
+                "type": "text",
+                "text": f"Mock result for {tool_name} with args: {tool_args}",
+            }
+        ],
+        "isError": False,
+    }
+
+
+@rpc_method("completion/complete")
+async def completion_complete(params: Dict[str, Any]) -> Any:
+    ref = params.get("ref")
+    if not ref or not isinstance(ref, dict):
+        raise RpcError(-32602, "Invalid ref parameter")
+
+    ref_type = ref.get("type")
+    if ref_type == "ref/prompt":
+        prompt_name = ref.get("name")
+        arg = params.get("argument", {})
+        arg_name = arg.get("name")
+        value = arg.get("value", "")
+
+        if not prompt_name or not arg_name:
+            raise RpcError(-32602, "Missing required parameters")
+
+        target = ("prompt", prompt_name, arg_name)
+
+    elif ref_type == "ref/resource":
+        uri = ref.get("uri")
+        value = params.get("value", "")
+
+        if not uri:
+            raise RpcError(-32602, "Missing URI parameter")
+
+        target = ("resource", uri)
+
+    else:
+        raise RpcError(-32602, "Invalid ref type")
+
+    if not isinstance(value, str):
+        raise RpcError(-32602, "Invalid argument value")
+
+    index = COMPLETION_INDEXES.get(target)
+    values, total = index.complete(value) if index is not None else ([], 0)
+    return {
+        "completion": {
+            "values": values,
+            "hasMore": total > len(values),
+            "total": total,
+        }
+    }
+
+
+@rpc_method("prompts/list")
+async def prompts_list(params: Dict[str, Any]) -> Any:
+    return select_page(params, "prompts", "prompts_page_1", "prompts_page_2")
+
+
+@rpc_method("prompts/get")
+async def prompts_get(params: Dict[str, Any]) -> Any:
+    name = require_string(params, "name")
+    result = PROMPT_GET_RESULTS.get(name)
+    if result is None:
+        raise RpcError(-32602, "Prompt not found")
+    if isinstance(result, RpcError):
+        # A fresh instance: re-raising the cached one would grow its traceback
+        raise RpcError(result.code, result.message)
+    return result
+
+
+@rpc_method("resources/list")
+async def resources_list(params: Dict[str, Any]) -> Any:
+    if FILES is not None:
+        return await files_page(params)
+    if CATALOG is not None and CATALOG.resources:
+        return catalog_page(params, "resources")
+    return select_page(params, "resources", "resources_page_1", "resources_page_2")
+
+
+@rpc_method("resources/read")
+async def resources_read(params: Dict[str, Any]) -> Any:
+    uri = require_string(params, "uri")
+    if FILES is not None:
+        loop = asyncio.get_running_loop()
+        encoded = await loop.run_in_executor(None, FILES.read, uri)
+        if encoded is None:
+            raise RpcError(-32002, "Resource not found")
+        return PreEncoded.from_json(encoded)
+    index = CATALOG.resource_index(uri) if CATALOG is not None else None
+    if index is not None:
+        return {"contents": [CATALOG.read_resource(index)]}
+    result = RESOURCE_READ_RESULTS.get(uri)
+    if result is None:
+        raise RpcError(-32002, "Resource not found")
+    return result
+
+
+@rpc_method("resources/templates/list")
+async def resources_templates_list(params: Dict[str, Any]) -> Any:
+    return STATIC_RESULTS["templates"]
+
+
+@rpc_method("resources/subscribe")
+async def resources_subscribe(params: Dict[str, Any]) -> Any:
+    uri = require_string(params, "uri")
+    if FILES is not None:
+        if FILES.path(uri) is None:
+            raise RpcError(-32002, "Resource not found")
+        FILES.watch(uri)
+        start_file_watcher()
+    else:
+        in_catalog = CATALOG is not None and CATALOG.resource_index(uri) is not None
+        if not in_catalog and uri not in MOCK_RESOURCE_CONTENTS:
+            raise RpcError(-32002, "Resource not found")
+    subscription_id, expired = subscriptions.subscribe(
+        uri, current_connection.get(), current_client.get()
+    )
+    if broker is not None:
+        await broker.claim(f"subscription:{subscription_id}")
+        for expired_id in expired:
+            await broker.release(f"subscription:{expired_id}")
+    return {"subscriptionId": subscription_id}
+
+
+@rpc_method("resources/unsubscribe")
+async def resources_unsubscribe(params: Dict[str, Any]) -> Any:
+    subscription_id = require_string(params, "subscriptionId")
+    client = current_client.get()
+    if await drop_subscription(subscription_id, client):
+        return {}
+    # The subscription may have been made on another worker
+    if broker is not None and await broker.forward(
+        f"subscription:{subscription_id}",
+        {"type": "unsubscribe", "id": subscription_id, "client": client},
+    ):
+        return {}
+    raise RpcError(-32602, "Invalid subscription ID")
+
+
+async def drop_subscription(subscription_id: str, client: Optional[str]) -> bool:
+    """Cancel a subscription made on this worker.
+
+    Args:
+        subscription_id: Subscription to cancel
+        client: Namespace of the caller; only its own subscriptions can be
+            cancelled
+
+    Returns:
+        False if this worker has no such subscription in the namespace
+    """
+    if not subscriptions.unsubscribe(subscription_id, client):
+        return False
+    if broker is not None:
+        await broker.release(f"subscription:{subscription_id}")
+    return True
+
+
+def start_file_watcher() -> None:
+    """Start polling subscribed files for changes, if not already running."""
+    global file_watcher
+    if file_watcher is None or file_watcher.done():
+        file_watcher = asyncio.create_task(watch_files())
+
+
+async def watch_files() -> None:
+    """Send resources/updated when a subscribed file changes.
+
+    Each worker watches the files subscribed to through it and notifies its
+    own subscribers.
+    """
+    loop = asyncio.get_running_loop()
+    while FILES is not None:
+        await asyncio.sleep(FILE_WATCH_INTERVAL)
+        uris = [uri for uri in subscriptions.uris() if FILES.owns(uri)]
+        try:
+            changed = await loop.run_in_executor(None, FILES.changed, uris)
+        except Exception as e:
+            logger.error(f"Error checking files for changes: {e}")
+            continue
+        for uri in changed:
+            logger.debug(f"Resource changed: {uri}")
+            subscriptions.notify(
+                uri,
+                create_jsonrpc_notification(
+                    "notifications/resources/updated", {"uri": uri}
                 ),
-                media_type="application/json",
             )
 
-        elif method == "resources/unsubscribe":
-            subscription_id = params.get("subscriptionId")
-            if not subscription_id:
-                return JSONResponse(
-                    content=create_jsonrpc_error(
-                        id, -32602, "Missing required parameter: subscriptionId"
-                    ),
-                    media_type="application/json",
-                )
-            if not isinstance(subscription_id, str):
-                return JSONResponse(
-                    content=create_jsonrpc_error(
-                        id, -32602, "Invalid subscriptionId type"
-                    ),
-                    media_type="application/json",
-                )
-
-            if subscription_id != "mock_subscription_1":
-                return JSONResponse(
-                    content=create_jsonrpc_error(id, -32602, "Invalid subscription ID"),
-                    media_type="application/json",
-                )
-
-            return JSONResponse(
-                content=create_jsonrpc_response(id, {}),
-                media_type="application/json",
-            )
 
-        # Method not found
-        return JSONResponse(
-            content=create_jsonrpc_error(id, -32601, f"Method {method} not found"),
-            media_type="application/json",
+async def close_connection(connection: Connection) -> None:
+    """Forget a closed stream and release its subscriptions."""
+    for subscription_id in subscriptions.disconnect(connection):
+        if broker is not None:
+            await broker.release(f"subscription:{subscription_id}")
+
+
+async def process_message(body: Any, plan: Optional[FaultPlan] = None) -> bytes:
+    """Process a single JSON-RPC request object and return the encoded response.
+
+    The request is counted in the metrics, with the time taken to answer it.
+
+    Args:
+        body: The decoded request
+        plan: Faults to inject, decided here from the method if not given
+    """
+    start = time.perf_counter()
+    method, error_code, content = await dispatch(body, plan)
+    metrics.observe(
+        method, current_transport.get(), time.perf_counter() - start, error_code
+    )
+    return content
+
+
+async def check_rate_limit(client: Optional[str], method: str) -> float:
+    """Count a request against its client's rate limits.
+
+    With several workers, one of them keeps the buckets and the others ask it
+    through the broker, so a client gets the configured rates whichever
+    workers serve its requests. The first worker to find no keeper becomes
+    it, which also replaces a keeper that exited.
+
+    Returns:
+        0 if the request is allowed, else the seconds until it would be
+    """
+    if broker is None or not limiter.applies(method):
+        return limiter.check(client, method)
+    event = {"type": "rate_limit", "client": client, "method": method}
+    wait = await broker.forward(RATE_LIMIT_KEY, event)
+    if wait is None:
+        await broker.claim(RATE_LIMIT_KEY)
+        wait = await broker.forward(RATE_LIMIT_KEY, event)
+    return wait if wait is not None else limiter.check(client, method)
+
+
+async def dispatch(
+    body: Any, plan: Optional[FaultPlan]
+) -> Tuple[str, Optional[int], bytes]:
+    """Run the handler of a request.
+
+    Returns:
+        The method's metrics label, the error code if the request failed and
+        the encoded response
+    """
+    if not isinstance(body, dict):
+        return (
+            INVALID_METHOD,
+            -32600,
+            encode_error(None, -32600, "Invalid Request: expected a JSON object"),
+        )
+
+    id = body.get("id")
+    problem = validate_request(body)
+    if problem is not None:
+        return (
+            INVALID_METHOD,
+            -32600,
+            encode_error(id, -32600, f"Invalid Request: {problem}"),
         )
 
+    method = body["method"]
+    handler = METHOD_HANDLERS.get(method)
+    label = method if handler is not None else UNKNOWN_METHOD
+    wait = await check_rate_limit(current_client.get(), method)
+    if wait:
+        message = f"Rate limit exceeded for {method}, retry in {wait:.3f}s"
+        return label, RATE_LIMITED, encode_error(id, RATE_LIMITED, message)
+    if plan is None:
+        plan = faults.plan(method, current_client.get())
+    if plan.delay:
+        await asyncio.sleep(plan.delay)
+    if plan.error is not None:
+        return label, plan.error[0], encode_error(id, *plan.error)
+
+    if handler is None:
+        return label, -32601, encode_error(id, -32601, f"Method {method} not found")
+
+    try:
+        result = await handler(body.get("params") or {})
+    except RpcError as e:
+        return label, e.code, encode_error(id, e.code, e.message)
     except Exception as e:
-        return JSONResponse(
-            content=create_jsonrpc_error(None, -32603, str(e)),
-            media_type="application/json",
+        # Keep the request id so clients that correlate by id still get a reply
+        return label, -32603, encode_error(id, -32603, str(e))
+    return label, None, encode_response(id, result)
+
+
+async def process_body(body: Any, plan: Optional[FaultPlan] = None) -> Optional[bytes]:
+    """Process a decoded request object or batch array.
+
+    Batch entries are processed concurrently. Notifications inside a batch get
+    no response entry.
+
+    Args:
+        body: The decoded request or batch
+        plan: Faults to inject into a single request. Batch entries always
+            get their own
+
+    Returns:
+        The encoded response, or None when a batch held only notifications
+    """
+    if not isinstance(body, list):
+        return await process_message(body, plan)
+
+    if not body:
+        return encode_error(None, -32600, "Invalid Request: empty batch")
+
+    responses = await asyncio.gather(*(process_message(m) for m in body))
+    responses = [r for m, r in zip(body, responses) if not is_notification(m)]
+    if not responses:
+        return None
+    return b"[" + b",".join(responses) + b"]"
+
+
+def parse_error(error: Exception) -> bytes:
+    """Encode the error response for a body that is not valid JSON."""
+    return encode_error(None, -32700, f"Parse error: {str(error)}")
+
+
+def plan_faults(body: Any) -> FaultPlan:
+    """Decide the faults of a decoded request.
+
+    Batches get no transport-level faults; their entries are planned one by
+    one as they are processed.
+    """
+    if isinstance(body, dict) and isinstance(body.get("method"), str):
+        return faults.plan(body["method"], current_client.get())
+    return NO_FAULTS
+
+
+class InterruptedResponse(Response):
+    """A response whose connection is closed partway through the body."""
+
+    def __init__(self, content: bytes, sent: int):
+        super().__init__(content=content, media_type="application/json")
+        self.sent = sent
+
+    async def __call__(self, scope, receive, send) -> None:
+        await send(
+            {
+                "type": "http.response.start",
+                "status": self.status_code,
+                "headers": self.raw_headers,
+            }
         )
+        if self.sent:
+            await send(
+                {
+                    "type": "http.response.body",
+                    "body": self.body[: self.sent],
+                    "more_body": True,
+                }
+            )
+        # Returning before the body is complete makes the server drop the
+        # connection
+
+
+def fault_response(content: bytes, plan: FaultPlan) -> Response:
+    """Build the HTTP response for a request, applying transport faults."""
+    if plan.transport == DROP:
+        return InterruptedResponse(content, 0)
+    if plan.transport == TRUNCATE:
+        return InterruptedResponse(content, plan.rng.randrange(1, len(content)))
+    if plan.transport == DRIP:
+        profile = plan.profile
+
+        async def drip() -> AsyncIterator[bytes]:
+            for start in range(0, len(content), profile.drip_chunk_bytes):
+                if start:
+                    await asyncio.sleep(profile.drip_interval)
+                yield content[start : start + profile.drip_chunk_bytes]
+
+        return StreamingResponse(drip(), media_type="application/json")
+    return Response(content=content, media_type="application/json")
+
+
+def client_id(connection: HTTPConnection) -> str:
+    """Identify the client of a request, for rate limiting.
+
+    Clients are told apart by an ``X-Client-Id`` header if they send one, so a
+    load generator can act as many tenants, and by address otherwise.
+    """
+    client = connection.headers.get("x-client-id")
+    if client:
+        return client
+    return connection.client.host if connection.client else "unknown"
+
+
+@app.post("/")
+async def handle_jsonrpc(request: Request) -> Response:
+    """Handle JSON-RPC requests and batches.
+
+    A batch made only of notifications gets an empty 204 reply.
+    """
+    current_client.set(client_id(request))
+    plan = NO_FAULTS
+    try:
+        body = json.loads(await request.body())
+    except ValueError as e:
+        content = parse_error(e)
+    else:
+        plan = plan_faults(body)
+        content = await process_body(body, plan)
+    if content is None:
+        return Response(status_code=204)
+    return fault_response(content, plan)
 
 
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
-    """Handle WebSocket connections for notifications."""
+    """Handle WebSocket connections.
+
+    Each text frame carries a JSON-RPC request or batch. Frames are processed
+    concurrently and answered as soon as they complete, so replies may be sent
+    out of order. Notifications get no reply. The connection also receives
+    broadcast server notifications.
+
+    Injected drops close the socket and truncations send a cut-off frame.
+    Slow-drip faults do not apply to framed messages.
+    """
     await websocket.accept()
-    active_connections.append(websocket)
+    send_lock = asyncio.Lock()
+    tasks = set()
+
+    async def send(text: str) -> None:
+        async with send_lock:
+            await websocket.send_text(text)
+
+    connection = subscriptions.connect(send, websocket.close)
+    current_connection.set(connection)
+    current_client.set(client_id(websocket))
+    current_transport.set("ws")
+
+    async def reply(text: str) -> None:
+        plan = NO_FAULTS
+        try:
+            body = json.loads(text)
+        except ValueError as e:
+            content = parse_error(e)
+        else:
+            plan = plan_faults(body)
+            content = await process_body(body, plan)
+            if is_notification(body):
+                content = None
+        if content is None:
+            return
+        if plan.transport == DROP:
+            await websocket.close()
+            return
+        if plan.transport == TRUNCATE:
+            content = content[: plan.rng.randrange(1, len(content))]
+        await connection.send(content.decode("utf-8", errors="ignore"))
+
     try:
         while True:
-            # Keep connection alive
-            await websocket.receive_text()
+            text = await websocket.receive_text()
+            task = asyncio.create_task(reply(text))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
     except Exception:
-        active_connections.remove(websocket)
+        for task in tasks:
+            task.cancel()
+    finally:
+        await close_connection(connection)
 
 
-async def broadcast_tools_changed():
-    """Broadcast tools/list_changed notification to all connected clients."""
-    notification = create_jsonrpc_notification(
-        "tools/list_changed", {"message": "Tools list has been updated"}
-    )
-    for connection in active_connections:
+def format_sse_event(event: str, data: str) -> str:
+    """Encode one Server-Sent Event."""
+    lines = "".join(f"data: {line}\n" for line in data.split("\n"))
+    return f"event: {event}\n{lines}\n"
+
+
+@app.get("/sse")
+async def sse_endpoint() -> StreamingResponse:
+    """Open an HTTP+SSE session.
+
+    The first event is ``endpoint``, naming the URL the client POSTs its
+    messages to. Replies and server notifications follow as ``message``
+    events.
+    """
+    session_id = uuid.uuid4().hex
+    queue: asyncio.Queue = asyncio.Queue(SSE_STREAM_QUEUE_SIZE)
+    sse_sessions[session_id] = queue
+
+    async def close() -> None:
+        await queue.put(None)
+
+    connection = subscriptions.connect(queue.put, close, id=session_id)
+    if broker is not None:
+        await broker.claim(f"session:{session_id}")
+
+    async def events() -> AsyncIterator[str]:
         try:
-            await connection.send_json(notification)
-        except Exception:
-            active_connections.remove(connection)
+            yield format_sse_event("endpoint", f"/messages?session_id={session_id}")
+            while True:
+                try:
+                    message = await asyncio.wait_for(
+                        queue.get(), SSE_KEEPALIVE_INTERVAL
+                    )
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                if message is None:
+                    return
+                yield format_sse_event("message", message)
+        finally:
+            sse_sessions.pop(session_id, None)
+            await close_connection(connection)
+            if broker is not None:
+                await broker.release(f"session:{session_id}")
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
+
+
+@app.post("/messages")
+async def handle_sse_message(request: Request, session_id: str) -> Response:
+    """Accept a JSON-RPC message for an SSE session.
+
+    The message is processed in the background and its reply is sent on the
+    session's event stream, so replies may be sent out of order. With several
+    workers, messages for a session opened on another worker are forwarded
+    to it.
+    """
+    text = (await request.body()).decode("utf-8", errors="replace")
+    client = client_id(request)
+    delivered = await deliver_sse_message(session_id, text, client)
+    if not delivered and broker is not None:
+        delivered = await broker.forward(
+            f"session:{session_id}",
+            {
+                "type": "sse_message",
+                "session": session_id,
+                "text": text,
+                "client": client,
+            },
+        )
+    if not delivered:
+        raise HTTPException(status_code=404, detail="Unknown session")
+    return Response(status_code=202)
+
 
+async def deliver_sse_message(session_id: str, text: str, client: str) -> bool:
+    """Start processing a message for an SSE session open on this worker.
 
-def run_server(host: str = "127.0.0.1", port: int = 8000):
-    """Run the mock server."""
-    uvicorn.run(app, host=host, port=port)
+    Args:
+        session_id: Session the message was posted to
+        text: The message
+        client: Identity of the client that posted it
+
+    Returns:
+        False if the session is not open on this worker
+    """
+    queue = sse_sessions.get(session_id)
+    if queue is None:
+        return False
+
+    try:
+        body = json.loads(text)
+    except ValueError as e:
+        await queue.put(parse_error(e).decode("utf-8"))
+        return True
+
+    async def reply() -> None:
+        content = await process_body(body)
+        if content is not None and not is_notification(body):
+            await queue.put(content.decode("utf-8"))
+
+    current_connection.set(subscriptions.connections.get(session_id))
+    current_client.set(client)
+    current_transport.set("sse")
+    task = asyncio.create_task(reply())
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
+    return True
+
+
+async def publish(event: Dict[str, Any]) -> Optional[int]:
+    """Apply an event on every worker.
+
+    Returns:
+        The result on this worker when it is the only one, else None
+    """
+    if broker is None:
+        return await handle_worker_event(event)
+    broker.publish(event)
+    return None
+
+
+async def handle_worker_event(event: Dict[str, Any]) -> Any:
+    """Apply an event published or forwarded by any worker."""
+    kind = event["type"]
+    if kind == "notify":
+        return subscriptions.notify(event["uri"], event["message"])
+    if kind == "broadcast":
+        return subscriptions.broadcast(event["message"])
+    if kind == "unsubscribe":
+        return await drop_subscription(event["id"], event.get("client"))
+    if kind == "sse_message":
+        return await deliver_sse_message(
+            event["session"], event["text"], event["client"]
+        )
+    if kind == "faults":
+        return set_faults(event["config"])
+    if kind == "rate_limits":
+        return set_rate_limits(event["config"])
+    if kind == "rate_limit":
+        return limiter.check(event["client"], event["method"])
+    if kind == "metrics":
+        return worker_metrics()
+    logger.warning(f"Unknown worker event: {kind}")
+    return None
+
+
+async def broadcast_tools_changed() -> Optional[int]:
+    """Send tools/list_changed to all WebSocket and SSE clients.
+
+    Returns:
+        The number of clients it was queued for, or None with several workers
+    """
+    return await publish(
+        {
+            "type": "broadcast",
+            "message": create_jsonrpc_notification(
+                "notifications/tools/list_changed",
+                {"message": "Tools list has been updated"},
+            ),
+        }
+    )
+
+
+async def notify_resource_updated(uri: str) -> Optional[int]:
+    """Send resources/updated to the clients subscribed to a resource.
+
+    Returns:
+        The number of clients it was queued for, or None with several workers
+    """
+    return await publish(
+        {
+            "type": "notify",
+            "uri": uri,
+            "message": create_jsonrpc_notification(
+                "notifications/resources/updated", {"uri": uri}
+            ),
+        }
+    )
+
+
+@app.post("/admin/resources/updated")
+async def admin_resource_updated(request: Request) -> Dict[str, Any]:
+    """Trigger resources/updated notifications, for load-testing hosts.
+
+    The JSON body names the ``uri`` and optionally a ``count`` of
+    notifications to send. With several workers, ``queued`` is null and the
+    other counts only cover the worker that answered.
+    """
+    body = await request.json()
+    uri = body.get("uri")
+    count = body.get("count", 1)
+    if not isinstance(uri, str) or not isinstance(count, int) or count < 1:
+        raise HTTPException(status_code=400, detail="Expected a uri and a count")
+    counts = [await notify_resource_updated(uri) for _ in range(count)]
+    return {
+        "subscribers": subscriptions.subscriber_count(uri),
+        "queued": None if None in counts else sum(counts),
+        **subscriptions.stats(),
+    }
+
+
+@app.post("/admin/tools/list_changed")
+async def admin_tools_list_changed() -> Dict[str, Any]:
+    """Trigger a tools/list_changed notification to every client."""
+    return {"queued": await broadcast_tools_changed(), **subscriptions.stats()}
+
+
+def worker_metrics() -> Dict[str, Any]:
+    """Return this worker's request metrics and connection counts."""
+    stats = subscriptions.stats()
+    return {
+        "requests": metrics.snapshot(),
+        "gauges": {
+            "websockets": stats["connections"] - len(sse_sessions),
+            "sse_streams": len(sse_sessions),
+            "subscriptions": stats["subscriptions"],
+            "pending": stats["pending"],
+            "dropped": stats["dropped"],
+            "evicted": stats["evicted"],
+        },
+    }
+
+
+@app.get("/metrics")
+async def metrics_endpoint() -> Response:
+    """Serve request and connection metrics in the Prometheus text format.
+
+    With several workers, the metrics of every worker are added up.
+    """
+    if broker is None:
+        reports = [worker_metrics()]
+    else:
+        reports = await broker.gather({"type": "metrics"})
+    gauges = {}
+    for report in reports:
+        for name, value in report["gauges"].items():
+            gauges[name] = gauges.get(name, 0) + value
+
+    samples: Dict[str, Sample] = {
+        "mcp_websocket_connections": (
+            "gauge",
+            "Open WebSocket connections.",
+            gauges.get("websockets", 0),
+        ),
+        "mcp_sse_streams": (
+            "gauge",
+            "Open SSE event streams.",
+            gauges.get("sse_streams", 0),
+        ),
+        "mcp_subscriptions": (
+            "gauge",
+            "Active resource subscriptions.",
+            gauges.get("subscriptions", 0),
+        ),
+        "mcp_notifications_pending": (
+            "gauge",
+            "Notifications queued for delivery.",
+            gauges.get("pending", 0),
+        ),
+        "mcp_notifications_dropped_total": (
+            "counter",
+            "Notifications dropped because a client fell behind.",
+            gauges.get("dropped", 0),
+        ),
+        "mcp_slow_consumers_evicted_total": (
+            "counter",
+            "Connections closed because they fell behind.",
+            gauges.get("evicted", 0),
+        ),
+        "mcp_workers": ("gauge", "Worker processes reporting.", len(reports)),
+    }
+    snapshot = merge_snapshots(report["requests"] for report in reports)
+    return Response(render(snapshot, samples), media_type="text/plain; version=0.0.4")
+
+
+def set_faults(config: Optional[Dict[str, Any]]) -> bool:
+    """Replace the fault configuration, restarting its random sequences.
+
+    Raises:
+        ValueError: If the configuration is invalid
+    """
+    global faults
+    faults = FaultInjector(config)
+    return True
+
+
+@app.get("/admin/faults")
+async def admin_get_faults() -> Dict[str, Any]:
+    """Return the fault injection configuration in effect."""
+    return faults.config
+
+
+@app.put("/admin/faults")
+async def admin_put_faults(request: Request) -> Dict[str, Any]:
+    """Replace the fault injection configuration on every worker.
+
+    An empty object turns fault injection off.
+    """
+    config = await request.json()
+    try:
+        FaultInjector(config)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    await publish({"type": "faults", "config": config})
+    return config
+
+
+def set_rate_limits(config: Optional[Dict[str, Any]]) -> bool:
+    """Replace the rate limits, starting every client with full buckets.
+
+    Raises:
+        ValueError: If the configuration is invalid
+    """
+    global limiter
+    limiter = RateLimiter(config)
+    return True
+
+
+@app.get("/admin/rate-limits")
+async def admin_get_rate_limits() -> Dict[str, Any]:
+    """Return the rate limit configuration in effect."""
+    return limiter.config
+
+
+@app.put("/admin/rate-limits")
+async def admin_put_rate_limits(request: Request) -> Dict[str, Any]:
+    """Replace the rate limits on every worker.
+
+    An empty object turns rate limiting off.
+    """
+    config = await request.json()
+    try:
+        RateLimiter(config)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    await publish({"type": "rate_limits", "config": config})
+    return config
+
+
+def configure(
+    catalog: Optional[SyntheticCatalog] = None,
+    notify_queue_size: int = DEFAULT_QUEUE_SIZE,
+    slow_consumer: str = DROP_OLDEST,
+    fault_config: Optional[Dict[str, Any]] = None,
+    files: Optional[FileProvider] = None,
+    file_watch_interval: float = FILE_WATCH_INTERVAL,
+    rate_limits: Optional[Dict[str, Any]] = DEFAULT_RATE_LIMITS,
+) -> None:
+    """Apply server options to this process. See run_server."""
+    global subscriptions, FILES, FILE_WATCH_INTERVAL
+    configure_catalog(catalog)
+    FILES = files
+    FILE_WATCH_INTERVAL = file_watch_interval
+    subscriptions = SubscriptionRegistry(notify_queue_size, slow_consumer)
+    set_faults(fault_config)
+    set_rate_limits(rate_limits)
+
+
+async def _open_stdio() -> (
+    Tuple[Callable[[], Awaitable[bytes]], Callable[[bytes], Awaitable[None]]]
+):
+    """Return coroutines reading a line from stdin and writing to stdout.
+
+    Pipes and terminals are read and written asynchronously. Regular files,
+    such as redirected input, do not support that and go through a thread.
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        reader = asyncio.StreamReader(limit=STDIO_LINE_LIMIT)
+        await loop.connect_read_pipe(
+            lambda: asyncio.StreamReaderProtocol(reader), sys.stdin
+        )
+        read_line = reader.readline
+    except ValueError:
+
+        async def read_line() -> bytes:
+            return await loop.run_in_executor(None, sys.stdin.buffer.readline)
+
+    try:
+        transport, protocol = await loop.connect_write_pipe(
+            asyncio.streams.FlowControlMixin, sys.stdout
+        )
+        writer = asyncio.StreamWriter(transport, protocol, None, loop)
+
+        async def write(data: bytes) -> None:
+            writer.write(data)
+            await writer.drain()
+
+    except ValueError:
+
+        async def write(data: bytes) -> None:
+            sys.stdout.buffer.write(data)
+            sys.stdout.buffer.flush()
+
+    return read_line, write
+
+
+async def serve_stdio() -> None:
+    """Serve newline-delimited JSON-RPC on stdin and stdout.
+
+    Each line carries a request or batch. Lines are processed concurrently
+    and answered as soon as they complete, so replies may be written out of
+    order. Server notifications are written to stdout too. The server exits
+    once stdin is closed and every request has been answered.
+
+    Injected latency and errors apply, but not transport faults.
+    """
+    read_line, write = await _open_stdio()
+    write_lock = asyncio.Lock()
+    tasks = set()
+
+    async def send(text: str) -> None:
+        async with write_lock:
+            await write(text.encode("utf-8") + b"\n")
+
+    connection = subscriptions.connect(send)
+    current_connection.set(connection)
+    current_client.set("stdio")
+    current_transport.set("stdio")
+
+    async def reply(line: bytes) -> None:
+        try:
+            body = json.loads(line)
+        except ValueError as e:
+            content = parse_error(e)
+        else:
+            content = await process_body(body)
+            if is_notification(body):
+                content = None
+        if content is not None:
+            await connection.send(content.decode("utf-8"))
+
+    try:
+        while True:
+            try:
+                line = await read_line()
+            except ValueError as e:
+                # The line is longer than STDIO_LINE_LIMIT
+                logger.error(f"Dropping stdin line: {e}")
+                await connection.send(parse_error(e).decode("utf-8"))
+                continue
+            if not line:
+                break
+            if not line.strip():
+                continue
+            task = asyncio.create_task(reply(line))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        if tasks:
+            await asyncio.wait(tasks)
+    finally:
+        await close_connection(connection)
+
+
+def _worker_main(
+    sock: socket.socket, broker_address: Tuple[str, int], options: Dict[str, Any]
+) -> None:
+    """Entry point of a worker process started by run_server."""
+    configure(**options)
+    asyncio.run(_serve_worker(sock, broker_address))
+
+
+async def _serve_worker(sock: socket.socket, broker_address: Tuple[str, int]) -> None:
+    global broker
+    broker = BrokerClient(handle_worker_event)
+    await broker.connect(broker_address)
+    server = uvicorn.Server(uvicorn.Config(app))
+
+    async def exit_with_broker() -> None:
+        # Shut down if the supervising process goes away
+        await broker.wait_closed()
+        server.should_exit = True
+
+    watcher = asyncio.create_task(exit_with_broker())
+    try:
+        await server.serve(sockets=[sock])
+    finally:
+        watcher.cancel()
+        await broker.close()
+
+
+async def _supervise(sock: socket.socket, workers: int, options: Dict[str, Any]):
+    """Run the broker and wait for the worker processes to exit."""
+    shared = Broker()
+    await shared.start()
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(
+            target=_worker_main, args=(sock, shared.address, options), daemon=True
+        )
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    loop = asyncio.get_running_loop()
+    try:
+        await asyncio.gather(
+            *(loop.run_in_executor(None, process.join) for process in processes)
+        )
+    finally:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+        await shared.close()
+
+
+def run_server(
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    catalog: Optional[SyntheticCatalog] = None,
+    notify_queue_size: int = DEFAULT_QUEUE_SIZE,
+    slow_consumer: str = DROP_OLDEST,
+    workers: int = 1,
+    fault_config: Optional[Dict[str, Any]] = None,
+    files: Optional[FileProvider] = None,
+    file_watch_interval: float = FILE_WATCH_INTERVAL,
+    rate_limits: Optional[Dict[str, Any]] = DEFAULT_RATE_LIMITS,
+    stdio: bool = False,
+):
+    """Run the mock server.
+
+    Args:
+        host: Host to bind the server to
+        port: Port to bind the server to
+        catalog: Synthetic catalog to serve instead of the built-in tools and
+            resources
+        notify_queue_size: Notifications each client may have waiting
+        slow_consumer: What to do when a client's notification queue is full,
+            one of ``drop-oldest``, ``drop-newest`` or ``disconnect``
+        workers: Number of worker processes sharing the listening socket.
+            Subscriptions, SSE sessions and notifications are kept coherent
+            across them through a local broker
+        fault_config: Latency and fault injection profiles, as described in
+            mock_server.faults
+        files: Directory to serve as resources instead of the built-in ones
+        file_watch_interval: Seconds between checks of subscribed files for
+            changes
+        rate_limits: Token-bucket limits per client and method, as described
+            in mock_server.ratelimit, or None for no limits. With several
+            workers, one of them keeps the buckets for all
+        stdio: Serve JSON-RPC on stdin and stdout instead of binding a port.
+            host, port and workers are then ignored
+    """
+    options = {
+        "catalog": catalog,
+        "notify_queue_size": notify_queue_size,
+        "slow_consumer": slow_consumer,
+        "fault_config": fault_config,
+        "files": files,
+        "file_watch_interval": file_watch_interval,
+        "rate_limits": rate_limits,
+    }
+    if stdio:
+        configure(**options)
+        asyncio.run(serve_stdio())
+        return
+    if workers <= 1:
+        configure(**options)
+        uvicorn.run(app, host=host, port=port)
+        return
+
+    sock = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    try:
+        asyncio.run(_supervise(sock, workers, options))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sock.close()
 
 
 if __name__ == "__main__":
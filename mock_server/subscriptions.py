@@ -0,0 +1,312 @@
+"""Resource subscriptions and notification fan-out for the mock server.
+
+Every open WebSocket or SSE stream is registered as a Connection. Each
+Connection owns a bounded outbox and a writer task that drains it. Fan-out
+only enqueues, so one notification reaches any number of subscribers without
+waiting on any of them, and their writers send concurrently.
+
+A consumer that cannot keep up fills its outbox. What happens next is set by
+the slow-consumer policy: drop the oldest queued message, drop the new one, or
+disconnect the consumer.
+
+Subscriptions made without a stream, such as over plain HTTP, can never be
+notified. They are kept only so their client can cancel them, at most
+DEFAULT_MAX_PUSHLESS per client namespace, and the oldest are forgotten past
+that.
+"""
+
+import asyncio
+import json
+import logging
+import uuid
+from collections import OrderedDict, defaultdict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUEUE_SIZE = 1024
+
+# Subscriptions without a stream kept per client namespace
+DEFAULT_MAX_PUSHLESS = 64
+
+DROP_OLDEST = "drop-oldest"
+DROP_NEWEST = "drop-newest"
+DISCONNECT = "disconnect"
+SLOW_CONSUMER_POLICIES = (DROP_OLDEST, DROP_NEWEST, DISCONNECT)
+
+Send = Callable[[str], Awaitable[None]]
+Close = Callable[[], Awaitable[None]]
+
+
+class Connection:
+    """An open stream that server notifications can be pushed to."""
+
+    def __init__(
+        self,
+        send: Send,
+        close: Optional[Close] = None,
+        id: Optional[str] = None,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        policy: str = DROP_OLDEST,
+    ):
+        """Initialize the connection and start its writer task.
+
+        Args:
+            send: Coroutine writing one encoded message to the stream
+            close: Coroutine closing the stream, used by the disconnect policy
+            id: Connection id, generated if not given
+            queue_size: Maximum number of notifications waiting to be sent
+            policy: What to do when the outbox is full, one of
+                SLOW_CONSUMER_POLICIES
+        """
+        if policy not in SLOW_CONSUMER_POLICIES:
+            raise ValueError(f"Unknown slow consumer policy: {policy}")
+        self.id = id or uuid.uuid4().hex
+        self.policy = policy
+        self.dropped = 0
+        self.evicted = False
+        self.closed = False
+        self._send = send
+        self._close = close
+        self._outbox: asyncio.Queue = asyncio.Queue(queue_size)
+        self._writer = asyncio.create_task(self._drain())
+
+    @property
+    def pending(self) -> int:
+        """Number of notifications waiting to be sent."""
+        return self._outbox.qsize()
+
+    def push(self, message: str) -> bool:
+        """Queue a notification without waiting.
+
+        Returns:
+            True if the message was queued, False if it was dropped
+        """
+        if self.closed:
+            return False
+        try:
+            self._outbox.put_nowait(message)
+            return True
+        except asyncio.QueueFull:
+            pass
+
+        self.dropped += 1
+        if self.policy == DROP_OLDEST:
+            self._outbox.get_nowait()
+            self._outbox.put_nowait(message)
+        elif self.policy == DISCONNECT:
+            logger.warning(f"Disconnecting slow consumer {self.id}")
+            self.evicted = True
+            self.disconnect()
+        return False
+
+    async def send(self, message: str) -> None:
+        """Send a message that must not be dropped, such as a reply."""
+        await self._send(message)
+
+    def stop(self) -> None:
+        """Stop sending notifications, leaving the stream open."""
+        self.closed = True
+        self._writer.cancel()
+
+    def disconnect(self) -> None:
+        """Stop sending notifications and close the stream."""
+        if self.closed:
+            return
+        self.stop()
+        if self._close is not None:
+            task = asyncio.create_task(self._close())
+            task.add_done_callback(_log_close_error)
+
+    async def _drain(self) -> None:
+        try:
+            while True:
+                await self._send(await self._outbox.get())
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.debug(f"Stopped sending to connection {self.id}: {e}")
+            self.closed = True
+
+
+def _log_close_error(task: asyncio.Task) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.debug(f"Error closing slow consumer: {task.exception()}")
+
+
+class SubscriptionRegistry:
+    """Maps resource URIs to subscribers and fans notifications out to them."""
+
+    def __init__(
+        self,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        policy: str = DROP_OLDEST,
+        max_pushless: int = DEFAULT_MAX_PUSHLESS,
+    ):
+        """Initialize the registry.
+
+        Args:
+            queue_size: Outbox size of connections opened through ``connect``
+            policy: Slow-consumer policy of connections opened through ``connect``
+            max_pushless: Subscriptions without a stream kept per client
+                namespace before the oldest are forgotten
+        """
+        if policy not in SLOW_CONSUMER_POLICIES:
+            raise ValueError(f"Unknown slow consumer policy: {policy}")
+        self.queue_size = queue_size
+        self.policy = policy
+        self.max_pushless = max_pushless
+        self.connections: Dict[str, Connection] = {}
+        # subscription id -> (uri, connection id or None for pushless clients,
+        # client namespace). Only subscriptions with a stream are indexed by
+        # URI and connection
+        self._subscriptions: Dict[str, Tuple[str, Optional[str], Optional[str]]] = {}
+        self._by_uri: Dict[str, Set[str]] = defaultdict(set)
+        self._by_connection: Dict[str, Set[str]] = defaultdict(set)
+        # Client namespace -> its subscriptions without a stream, oldest first
+        self._pushless: Dict[Optional[str], "OrderedDict[str, None]"] = {}
+        # Slow-consumer actions on connections that are gone
+        self._dropped = 0
+        self._evicted = 0
+
+    def connect(
+        self, send: Send, close: Optional[Close] = None, id: Optional[str] = None
+    ) -> Connection:
+        """Register an open stream and return its Connection."""
+        connection = Connection(send, close, id, self.queue_size, self.policy)
+        self.connections[connection.id] = connection
+        return connection
+
+    def disconnect(self, connection: Connection) -> List[str]:
+        """Forget a closed stream and every subscription made through it.
+
+        Returns:
+            The ids of the subscriptions that were dropped
+        """
+        connection.stop()
+        if self.connections.pop(connection.id, None) is connection:
+            self._dropped += connection.dropped
+            self._evicted += connection.evicted
+        dropped = list(self._by_connection.pop(connection.id, ()))
+        for subscription_id in dropped:
+            uri = self._subscriptions.pop(subscription_id)[0]
+            self._discard(uri, subscription_id)
+        return dropped
+
+    def subscribe(
+        self,
+        uri: str,
+        connection: Optional[Connection] = None,
+        client: Optional[str] = None,
+    ) -> Tuple[str, List[str]]:
+        """Subscribe to a resource.
+
+        Args:
+            uri: Resource to watch
+            connection: Stream to deliver updates on. Without one nothing can
+                be delivered, and the subscription is only kept so that it can
+                be cancelled, among the last ``max_pushless`` of its namespace
+            client: Namespace of the subscriber, the only one that may cancel
+                the subscription
+
+        Returns:
+            The new subscription id, and the ids of the subscriptions without
+            a stream forgotten to make room for it
+        """
+        subscription_id = f"sub_{uuid.uuid4().hex}"
+        if connection is None:
+            self._subscriptions[subscription_id] = (uri, None, client)
+            pushless = self._pushless.setdefault(client, OrderedDict())
+            pushless[subscription_id] = None
+            expired = []
+            while len(pushless) > self.max_pushless:
+                expired_id, _ = pushless.popitem(last=False)
+                del self._subscriptions[expired_id]
+                expired.append(expired_id)
+            return subscription_id, expired
+
+        self._subscriptions[subscription_id] = (uri, connection.id, client)
+        self._by_uri[uri].add(subscription_id)
+        self._by_connection[connection.id].add(subscription_id)
+        return subscription_id, []
+
+    def unsubscribe(self, subscription_id: str, client: Optional[str] = None) -> bool:
+        """Cancel a subscription.
+
+        Args:
+            subscription_id: Subscription to cancel
+            client: Namespace of the caller. If given, subscriptions made in
+                other namespaces are left alone
+
+        Returns:
+            False if there is no such subscription in the namespace
+        """
+        entry = self._subscriptions.get(subscription_id)
+        if entry is None or (client is not None and entry[2] != client):
+            return False
+        del self._subscriptions[subscription_id]
+        uri, connection_id, owner = entry
+        if connection_id is None:
+            pushless = self._pushless[owner]
+            del pushless[subscription_id]
+            if not pushless:
+                del self._pushless[owner]
+            return True
+        self._discard(uri, subscription_id)
+        self._by_connection[connection_id].discard(subscription_id)
+        return True
+
+    def _discard(self, uri: str, subscription_id: str) -> None:
+        subscribers = self._by_uri.get(uri)
+        if subscribers is not None:
+            subscribers.discard(subscription_id)
+            if not subscribers:
+                del self._by_uri[uri]
+
+    def subscriber_count(self, uri: str) -> int:
+        """Return the number of subscriptions to a resource."""
+        return len(self._by_uri.get(uri, ()))
+
+    def uris(self) -> List[str]:
+        """Return the resources with at least one subscription."""
+        return list(self._by_uri)
+
+    def notify(self, uri: str, message: Dict[str, Any]) -> int:
+        """Queue a notification for every connection subscribed to ``uri``.
+
+        The message is encoded once. A connection subscribed several times gets
+        it once.
+
+        Returns:
+            The number of connections it was queued for
+        """
+        connection_ids = {self._subscriptions[s][1] for s in self._by_uri.get(uri, ())}
+        return self._fan_out(connection_ids, json.dumps(message))
+
+    def broadcast(self, message: Dict[str, Any]) -> int:
+        """Queue a notification for every open connection.
+
+        Returns:
+            The number of connections it was queued for
+        """
+        return self._fan_out(list(self.connections), json.dumps(message))
+
+    def _fan_out(self, connection_ids, text: str) -> int:
+        delivered = 0
+        for connection_id in connection_ids:
+            connection = self.connections.get(connection_id)
+            if connection is not None and connection.push(text):
+                delivered += 1
+        return delivered
+
+    def stats(self) -> Dict[str, int]:
+        """Return counts of connections, subscriptions and slow-consumer actions."""
+        return {
+            "connections": len(self.connections),
+            "subscriptions": len(self._subscriptions),
+            "pending": sum(c.pending for c in self.connections.values()),
+            "dropped": self._dropped
+            + sum(c.dropped for c in self.connections.values()),
+            "evicted": self._evicted
+            + sum(c.evicted for c in self.connections.values()),
+        }
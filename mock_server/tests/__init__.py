@@ -0,0 +1 @@
+"""Unit tests of the mock server's own components."""
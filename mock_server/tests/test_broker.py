@@ -0,0 +1,54 @@
+"""Test cases for the broker that keeps mock server workers coherent."""
+
+import asyncio
+from typing import Any, Dict
+
+from mock_server.broker import Broker, BrokerClient
+
+# Larger than the default line limit of asyncio streams
+LARGE_PAYLOAD = "x" * (256 * 1024)
+
+
+async def forward_and_gather() -> Dict[str, Any]:
+    """Forward a large event between two workers and gather large answers."""
+    broker = Broker()
+    await broker.start()
+
+    async def owner_handler(event: Dict[str, Any]) -> Any:
+        if event["type"] == "gather":
+            return LARGE_PAYLOAD
+        return len(event["text"])
+
+    async def asker_handler(event: Dict[str, Any]) -> Any:
+        return "asker"
+
+    owner = BrokerClient(owner_handler)
+    asker = BrokerClient(asker_handler)
+    await owner.connect(broker.address)
+    await asker.connect(broker.address)
+    try:
+        await owner.claim("session:large")
+        forwarded = await asyncio.wait_for(
+            asker.forward("session:large", {"type": "echo", "text": LARGE_PAYLOAD}),
+            timeout=5,
+        )
+        gathered = await asyncio.wait_for(asker.gather({"type": "gather"}), timeout=5)
+        # The broker must still serve both workers afterwards
+        again = await asyncio.wait_for(
+            asker.forward("session:large", {"type": "echo", "text": "small"}),
+            timeout=5,
+        )
+    finally:
+        await owner.close()
+        await asker.close()
+        await broker.close()
+    return {"forwarded": forwarded, "gathered": gathered, "again": again}
+
+
+def test_broker_forwards_large_messages():
+    """Test that events and answers larger than 64 KiB are relayed intact."""
+    outcome = asyncio.run(forward_and_gather())
+
+    assert outcome["forwarded"] == len(LARGE_PAYLOAD)
+    assert sorted(outcome["gathered"]) == sorted([LARGE_PAYLOAD, "asker"])
+    assert outcome["again"] == len("small")
@@ -2,15 +2,377 @@
 """Test runner script for MCP compliance testing."""
 
 import argparse
+import json
 import logging
+import os
+import shlex
+import subprocess
 import sys
+import time
+from pathlib import Path
+from typing import Optional
+
 import pytest
+from mcp.client import MCPClient
+from mcp.compliance import DEFAULT_REPORT, build_report, print_report, save_report
+from mcp.load.bench import (
+    DEFAULT_CONCURRENCY,
+    DEFAULT_DURATION,
+    DEFAULT_WARMUP,
+    format_results,
+    run_benchmark,
+    write_report,
+)
+from mcp.load.capacity import (
+    DEFAULT_ERROR_RATE_SLO,
+    DEFAULT_LATENCY_SLO_MS,
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_SLO_PERCENTILE,
+    DEFAULT_STEP_DURATION,
+    STRATEGIES,
+    Slo,
+    format_knees,
+    search_capacity,
+    write_curve,
+)
+from mcp.load.openloop import (
+    DEFAULT_MAX_IN_FLIGHT,
+    format_open_loop,
+    resolve_calls,
+    run_open_loop,
+)
+from mcp.load.process import ProcessSampler
+from mcp.load.scenario import ARRIVALS, constant_scenario, load_scenario
+from mcp.load.soak import (
+    DEFAULT_WINDOW,
+    TimeSeriesWriter,
+    format_report,
+    parse_duration,
+    run_soak,
+)
+from mcp.load.workload import DEFAULT_METHODS, discover_calls
+from mcp.sharding import (
+    Shard,
+    discover_groups,
+    load_durations,
+    schedule,
+    split_exclusive,
+)
+from mcp.transports import ASGITransport, StdioTransport
 from mcp.version_manager import VersionManager
 
 # Default values
 DEFAULT_SPEC_VERSION = "2024-11-05"
 DEFAULT_SERVER_URL = "http://127.0.0.1:8000"
 
+# Benchmark results, written next to the compliance summary
+BENCH_REPORT = "reports/bench.json"
+LOAD_REPORT = "reports/load.json"
+CAPACITY_REPORT = "reports/capacity.json"
+CAPACITY_CURVE = "reports/capacity.csv"
+SOAK_REPORT = "reports/soak.json"
+SOAK_SERIES = "reports/soak.csv"
+
+# Reports and output of each parallel worker
+WORKER_DIR = "reports/workers"
+
+
+def create_client(args, pool_size: int) -> MCPClient:
+    """Create a client for the server the command line names.
+
+    Args:
+        args: Parsed command line
+        pool_size: Connections to keep open, for HTTP servers
+    """
+    if args.in_process:
+        from mock_server.server import app, set_rate_limits
+
+        # Load modes measure the server, not its limiter
+        set_rate_limits(None)
+        return MCPClient("in-process", ASGITransport(app))
+    if args.server_cmd:
+        command = shlex.split(args.server_cmd)
+        return MCPClient(args.server_cmd, StdioTransport(command))
+    return MCPClient(args.server_url, pool_size=pool_size)
+
+
+def server_label(args) -> str:
+    """Describe the server under test for reports."""
+    if args.in_process:
+        return "in-process"
+    return args.server_cmd or args.server_url
+
+
+def run_bench(args) -> int:
+    """Benchmark each method, print the results and save them.
+
+    Returns:
+        The exit code
+    """
+    logger = logging.getLogger(__name__)
+    methods = args.methods.split(",") if args.methods else DEFAULT_METHODS
+    with create_client(args, pool_size=args.concurrency) as client:
+        calls = discover_calls(client, methods)
+        if not calls:
+            logger.error("None of the methods can be benchmarked on this server")
+            return 1
+        results = run_benchmark(
+            client, calls, args.concurrency, args.duration, args.warmup
+        )
+
+    settings = {
+        "server": server_label(args),
+        "concurrency": args.concurrency,
+        "duration_s": args.duration,
+        "warmup_s": args.warmup,
+    }
+    write_report(BENCH_REPORT, results, settings)
+    print("\n=== MCP BENCHMARK ===\n")
+    print(format_results(results))
+    print(f"\nResults written to {BENCH_REPORT}")
+    return 0
+
+
+def run_load(args) -> int:
+    """Run an open-loop load scenario, print the results and save them.
+
+    Returns:
+        The exit code
+    """
+    logger = logging.getLogger(__name__)
+    if args.scenario:
+        try:
+            scenario = load_scenario(args.scenario)
+        except (OSError, ValueError) as e:
+            logger.error(f"Invalid scenario: {e}")
+            return 1
+    else:
+        methods = args.methods.split(",") if args.methods else DEFAULT_METHODS
+        scenario = constant_scenario(
+            list(methods), args.rate, args.duration, args.arrival
+        )
+    with create_client(args, pool_size=args.max_in_flight) as client:
+        calls, weights = resolve_calls(client, scenario)
+        if not calls:
+            logger.error("None of the scenario's calls can be sent to this server")
+            return 1
+        results = run_open_loop(client, scenario, calls, weights, args.max_in_flight)
+
+    settings = {
+        "server": server_label(args),
+        "scenario": args.scenario,
+        "arrival": scenario.arrival,
+        "seed": scenario.seed,
+        "duration_s": scenario.duration,
+        "max_in_flight": args.max_in_flight,
+    }
+    write_report(LOAD_REPORT, results, settings)
+    print("\n=== MCP OPEN-LOOP LOAD ===\n")
+    print(format_open_loop(results))
+    print(f"\nResults written to {LOAD_REPORT}")
+    return 0
+
+
+def run_capacity(args) -> int:
+    """Search each method's capacity within the SLO, print the knees and save.
+
+    Returns:
+        The exit code
+    """
+    logger = logging.getLogger(__name__)
+    methods = args.methods.split(",") if args.methods else DEFAULT_METHODS
+    slo = Slo(args.slo_latency_ms, args.slo_percentile, args.slo_error_rate)
+    with create_client(args, pool_size=args.max_concurrency) as client:
+        calls = discover_calls(client, methods)
+        if not calls:
+            logger.error("None of the methods can be measured on this server")
+            return 1
+        results = [
+            search_capacity(
+                client,
+                call,
+                slo,
+                args.search,
+                args.max_concurrency,
+                args.step_duration,
+                args.warmup,
+            )
+            for call in calls
+        ]
+
+    settings = {
+        "server": server_label(args),
+        "slo": slo.to_dict(),
+        "strategy": args.search,
+        "max_concurrency": args.max_concurrency,
+        "step_duration_s": args.step_duration,
+        "warmup_s": args.warmup,
+    }
+    write_curve(CAPACITY_REPORT, CAPACITY_CURVE, results, settings)
+    print("\n=== MCP CAPACITY ===\n")
+    print(format_knees(results, slo))
+    print(f"\nCurves written to {CAPACITY_REPORT} and {CAPACITY_CURVE}")
+    return 0
+
+
+def soak_duration(text: str) -> float:
+    """Parse --soak for argparse."""
+    try:
+        return parse_duration(text)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def server_sampler(args, client: MCPClient) -> Optional[ProcessSampler]:
+    """Sample the server process, if it runs on this machine."""
+    logger = logging.getLogger(__name__)
+    if args.server_pid:
+        pid = args.server_pid
+    elif args.server_cmd:
+        pid = client.transport.pid
+    elif args.in_process:
+        logger.warning(
+            "Not sampling the in-process server's resource usage: it shares "
+            "this process with the load generator"
+        )
+        return None
+    else:
+        logger.info("Pass --server-pid to sample the server's resource usage")
+        return None
+    try:
+        return ProcessSampler(pid)
+    except ValueError as e:
+        logger.warning(f"Not sampling the server's resource usage: {e}")
+        return None
+
+
+def run_soak_test(args) -> int:
+    """Soak the server, print the drift found and save the time series.
+
+    Returns:
+        The exit code: 1 if latency drift or resource growth was found
+    """
+    logger = logging.getLogger(__name__)
+    methods = args.methods.split(",") if args.methods else DEFAULT_METHODS
+    with create_client(args, pool_size=args.concurrency) as client:
+        calls = discover_calls(client, methods)
+        if not calls:
+            logger.error("None of the methods can be sent to this server")
+            return 1
+        with TimeSeriesWriter(SOAK_SERIES) as series:
+            report = run_soak(
+                client,
+                calls,
+                args.soak,
+                args.concurrency,
+                args.soak_window,
+                server_sampler(args, client),
+                series.write,
+            )
+
+    settings = {
+        "server": server_label(args),
+        "duration_s": args.soak,
+        "window_s": args.soak_window,
+        "concurrency": args.concurrency,
+        "methods": [call.method for call in calls],
+    }
+    with open(SOAK_REPORT, "w") as f:
+        json.dump({"settings": settings, **report.to_dict()}, f, indent=2)
+    print("\n=== MCP SOAK ===\n")
+    print(format_report(report))
+    print(f"\nTime series written to {SOAK_SERIES}, summary to {SOAK_REPORT}")
+    return 1 if report.degraded else 0
+
+
+def start_worker(server_args, index: int, shard: Shard):
+    """Launch a pytest process running one shard.
+
+    Returns:
+        The process, its report path, its log path and its start time
+    """
+    logger = logging.getLogger(__name__)
+    report = f"{WORKER_DIR}/summary-{index}.json"
+    log_path = f"{WORKER_DIR}/worker-{index}.log"
+    command = [
+        sys.executable,
+        "-m",
+        "pytest",
+        *server_args,
+        "--client-id",
+        f"workbench-{os.getpid()}-{index}",
+        "--report-file",
+        report,
+        *shard.files,
+    ]
+    if Path(report).exists():
+        Path(report).unlink()
+    logger.info(
+        f"Worker {index}: {', '.join(shard.groups)} (~{shard.estimate:.1f}s), "
+        f"output in {log_path}"
+    )
+    with open(log_path, "w") as log:
+        process = subprocess.Popen(command, stdout=log, stderr=subprocess.STDOUT)
+    return process, report, log_path, time.monotonic()
+
+
+def run_parallel(args, server_args) -> int:
+    """Run the suite in parallel worker processes and merge their reports.
+
+    Each worker runs whole groups of test files, scheduled by how long they
+    took last time, with its own pooled client and its own X-Client-Id
+    namespace on the server. Groups that load the server on purpose run
+    alone afterwards.
+
+    Returns:
+        The exit code
+    """
+    logger = logging.getLogger(__name__)
+    durations = load_durations(DEFAULT_REPORT)
+    shared, exclusive = split_exclusive(discover_groups("tests"))
+    stages = [schedule(shared, durations, args.parallel)]
+    if exclusive:
+        stages.append(schedule(exclusive, durations, 1))
+    Path(WORKER_DIR).mkdir(parents=True, exist_ok=True)
+    workers = []
+    for shards in stages:
+        first = len(workers)
+        for shard in shards:
+            workers.append(start_worker(server_args, len(workers), shard))
+
+        running = set(range(first, len(workers)))
+        while running:
+            time.sleep(0.1)
+            for i in sorted(running):
+                process, _, _, started = workers[i]
+                if process.poll() is not None:
+                    running.discard(i)
+                    logger.info(
+                        f"Worker {i} finished in {time.monotonic() - started:.1f}s"
+                    )
+
+    exit_code = 0
+    results = []
+    for i, (process, report, log_path, _) in enumerate(workers):
+        code = process.returncode
+        # 5 means pytest collected nothing to run
+        if code not in (0, 5):
+            exit_code = 1
+        try:
+            with open(report) as f:
+                results.extend(json.load(f)["results"])
+        except (OSError, ValueError, KeyError) as e:
+            logger.error(f"Worker {i} left no report ({e}), see {log_path}")
+            exit_code = 1
+
+    results.sort(key=lambda r: r["nodeid"])
+    report = build_report(results)
+    save_report(report)
+    print_report(report)
+    if report["summary"]["must_failures"] > 0:
+        exit_code = 1
+    return exit_code
+
 
 def main():
     """Main entry point for the test runner."""
@@ -20,14 +382,164 @@ def main():
         default=DEFAULT_SPEC_VERSION,
         help=f"MCP specification version (default: {DEFAULT_SPEC_VERSION})",
     )
-    parser.add_argument(
+    server = parser.add_mutually_exclusive_group()
+    server.add_argument(
         "--server-url",
         default=DEFAULT_SERVER_URL,
         help=f"Base URL of the MCP server to test (default: {DEFAULT_SERVER_URL})",
     )
+    server.add_argument(
+        "--server-cmd",
+        help="Command that launches the MCP server to test over stdio "
+        "(e.g. 'python my_server.py')",
+    )
+    server.add_argument(
+        "--in-process",
+        action="store_true",
+        help="Test the bundled mock server in this process, without sockets",
+    )
+    parser.add_argument(
+        "--no-rate-limits",
+        action="store_true",
+        help="Turn off the --in-process mock server's rate limits for the "
+        "compliance suite. The benchmark and load modes always turn them off",
+    )
     parser.add_argument(
         "--verbose", "-v", action="store_true", help="Enable verbose output"
     )
+    bench = parser.add_argument_group("benchmark")
+    bench.add_argument(
+        "--bench",
+        action="store_true",
+        help="Benchmark each method instead of running the compliance suite",
+    )
+    bench.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f"Requests kept in flight (default: {DEFAULT_CONCURRENCY})",
+    )
+    bench.add_argument(
+        "--duration",
+        type=float,
+        default=DEFAULT_DURATION,
+        help=f"Seconds to measure each method for (default: {DEFAULT_DURATION:g})",
+    )
+    bench.add_argument(
+        "--warmup",
+        type=float,
+        default=DEFAULT_WARMUP,
+        help="Seconds to send each method for before measuring "
+        f"(default: {DEFAULT_WARMUP:g})",
+    )
+    bench.add_argument(
+        "--methods",
+        help="Comma-separated methods to benchmark (default: all known methods)",
+    )
+
+    load = parser.add_argument_group("open-loop load")
+    load.add_argument(
+        "--scenario",
+        help="JSON scenario of calls and rate stages to send open-loop "
+        "instead of running the compliance suite",
+    )
+    load.add_argument(
+        "--rate",
+        type=float,
+        help="Send --methods open-loop at this many requests per second for "
+        "--duration seconds, instead of running the compliance suite",
+    )
+    load.add_argument(
+        "--arrival",
+        choices=ARRIVALS,
+        default="poisson",
+        help="Arrival process used with --rate (default: poisson)",
+    )
+    load.add_argument(
+        "--max-in-flight",
+        type=int,
+        default=DEFAULT_MAX_IN_FLIGHT,
+        help="Requests that may be on the wire at once "
+        f"(default: {DEFAULT_MAX_IN_FLIGHT})",
+    )
+
+    capacity = parser.add_argument_group("capacity search")
+    capacity.add_argument(
+        "--capacity",
+        action="store_true",
+        help="Search each method's highest throughput within the SLO instead "
+        "of running the compliance suite",
+    )
+    capacity.add_argument(
+        "--search",
+        choices=STRATEGIES,
+        default="bisect",
+        help="How to pick the concurrency levels to try (default: bisect)",
+    )
+    capacity.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=DEFAULT_MAX_CONCURRENCY,
+        help=f"Highest concurrency to try (default: {DEFAULT_MAX_CONCURRENCY})",
+    )
+    capacity.add_argument(
+        "--step-duration",
+        type=float,
+        default=DEFAULT_STEP_DURATION,
+        help="Seconds to measure each concurrency level for "
+        f"(default: {DEFAULT_STEP_DURATION:g})",
+    )
+    capacity.add_argument(
+        "--slo-latency-ms",
+        type=float,
+        default=DEFAULT_LATENCY_SLO_MS,
+        help=f"Latency objective (default: {DEFAULT_LATENCY_SLO_MS:g})",
+    )
+    capacity.add_argument(
+        "--slo-percentile",
+        type=float,
+        default=DEFAULT_SLO_PERCENTILE,
+        help="Percentile the latency objective applies to "
+        f"(default: {DEFAULT_SLO_PERCENTILE:g})",
+    )
+    capacity.add_argument(
+        "--slo-error-rate",
+        type=float,
+        default=DEFAULT_ERROR_RATE_SLO,
+        help=f"Highest share of failed requests (default: {DEFAULT_ERROR_RATE_SLO:g})",
+    )
+
+    soak = parser.add_argument_group("soak test")
+    soak.add_argument(
+        "--soak",
+        type=soak_duration,
+        metavar="DURATION",
+        help="Cycle through the workload for DURATION (e.g. 90s, 30m, 8h) and "
+        "look for latency drift and resource growth, instead of running the "
+        "compliance suite",
+    )
+    soak.add_argument(
+        "--soak-window",
+        type=float,
+        default=DEFAULT_WINDOW,
+        help=f"Seconds covered by each window of statistics "
+        f"(default: {DEFAULT_WINDOW:g})",
+    )
+    soak.add_argument(
+        "--server-pid",
+        type=int,
+        help="Process id of a local server whose memory, CPU and open files "
+        "to sample (servers launched with --server-cmd are sampled anyway)",
+    )
+
+    parser.add_argument(
+        "--parallel",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Run the compliance suite in N worker processes (default: 1). "
+        "With --server-cmd each worker launches its own server",
+    )
 
     args = parser.parse_args()
 
@@ -50,10 +562,28 @@ def main():
         logger.error(str(e))
         sys.exit(1)
 
+    if args.bench:
+        sys.exit(run_bench(args))
+    if args.scenario or args.rate:
+        sys.exit(run_load(args))
+    if args.capacity:
+        sys.exit(run_capacity(args))
+    if args.soak:
+        sys.exit(run_soak_test(args))
+
     # Run pytest with our arguments
+    if args.in_process:
+        server_args = ["--in-process"]
+        if args.no_rate_limits:
+            server_args.append("--no-rate-limits")
+    elif args.server_cmd:
+        server_args = ["--server-cmd", args.server_cmd]
+    else:
+        server_args = ["--server-url", args.server_url]
+    if args.parallel > 1:
+        sys.exit(run_parallel(args, server_args))
     pytest_args = [
-        "--server-url",
-        args.server_url,
+        *server_args,
         "-v" if args.verbose else "",
         "tests",
     ]
@@ -4,5 +4,7 @@ from setuptools import setup, find_namespace_packages
 
 setup(
     name="mcp-workbench",
-    packages=find_namespace_packages(include=["mcp*", "mock_server*"]),
+    packages=find_namespace_packages(
+        include=["mcp*", "mock_server*"], exclude=["mock_server.tests*"]
+    ),
 )
@@ -2,7 +2,18 @@
 """Script to start the mock MCP server."""
 
 import argparse
+import json
+import sys
+from mock_server.catalog import DEFAULT_PAGE_SIZE, SyntheticCatalog
+from mock_server.faults import FaultInjector
+from mock_server.files import DEFAULT_CACHE_BYTES, FileProvider
+from mock_server.ratelimit import DEFAULT_RATE_LIMITS, RateLimiter
 from mock_server.server import run_server
+from mock_server.subscriptions import (
+    DEFAULT_QUEUE_SIZE,
+    DROP_OLDEST,
+    SLOW_CONSUMER_POLICIES,
+)
 
 
 def main():
@@ -19,10 +30,156 @@ def main():
         default=8000,
         help="Port to bind the server to (default: 8000)",
     )
+    parser.add_argument(
+        "--stdio",
+        action="store_true",
+        help="Serve newline-delimited JSON-RPC on stdin/stdout instead of HTTP",
+    )
+    parser.add_argument(
+        "--tools",
+        type=int,
+        default=0,
+        help="Serve this many generated tools instead of the built-in ones",
+    )
+    parser.add_argument(
+        "--resources",
+        type=int,
+        default=0,
+        help="Serve this many generated resources instead of the built-in ones",
+    )
+    parser.add_argument(
+        "--page-size",
+        type=int,
+        default=DEFAULT_PAGE_SIZE,
+        help=f"Items per page of generated and directory lists (default: {DEFAULT_PAGE_SIZE})",
+    )
+    parser.add_argument(
+        "--completions",
+        type=int,
+        default=0,
+        help="Add this many generated values to every completion vocabulary",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="Seed for generated items and cursor signing (default: 0)",
+    )
+    parser.add_argument(
+        "--notify-queue-size",
+        type=int,
+        default=DEFAULT_QUEUE_SIZE,
+        help="Notifications each client may have waiting "
+        f"(default: {DEFAULT_QUEUE_SIZE})",
+    )
+    parser.add_argument(
+        "--slow-consumer",
+        choices=SLOW_CONSUMER_POLICIES,
+        default=DROP_OLDEST,
+        help=f"What to do when a client falls behind (default: {DROP_OLDEST})",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes (default: 1)",
+    )
+    parser.add_argument(
+        "--resource-dir",
+        metavar="DIR",
+        help="Serve the files under this directory as resources",
+    )
+    parser.add_argument(
+        "--read-cache-mb",
+        type=int,
+        default=DEFAULT_CACHE_BYTES // 2**20,
+        help="Memory for cached resource reads from --resource-dir "
+        f"(default: {DEFAULT_CACHE_BYTES // 2**20})",
+    )
+    parser.add_argument(
+        "--watch-interval",
+        type=float,
+        default=1.0,
+        help="Seconds between checks of subscribed files for changes (default: 1)",
+    )
+    parser.add_argument(
+        "--faults",
+        metavar="FILE",
+        help="JSON file of per-method latency and fault injection profiles",
+    )
+    parser.add_argument(
+        "--rate-limits",
+        metavar="FILE",
+        help="JSON file of per-client token-bucket limits "
+        "(default: limit tools/call and completion/complete)",
+    )
+    parser.add_argument(
+        "--no-rate-limits",
+        action="store_true",
+        help="Do not rate limit requests",
+    )
 
     args = parser.parse_args()
-    print(f"Starting mock MCP server at http://{args.host}:{args.port}")
-    run_server(args.host, args.port)
+    if args.stdio and args.workers > 1:
+        parser.error("--stdio cannot be combined with --workers")
+    catalog = None
+    if args.tools or args.resources or args.completions:
+        try:
+            catalog = SyntheticCatalog(
+                tools=args.tools,
+                resources=args.resources,
+                page_size=args.page_size,
+                seed=args.seed,
+                completions=args.completions,
+            )
+        except ValueError as e:
+            parser.error(str(e))
+    files = None
+    if args.resource_dir:
+        try:
+            files = FileProvider(
+                args.resource_dir,
+                page_size=args.page_size,
+                cache_bytes=args.read_cache_mb * 2**20,
+            )
+        except ValueError as e:
+            parser.error(str(e))
+    fault_config = None
+    if args.faults:
+        try:
+            with open(args.faults) as f:
+                fault_config = json.load(f)
+            FaultInjector(fault_config)
+        except (OSError, ValueError) as e:
+            parser.error(f"Invalid fault configuration: {e}")
+    rate_limits = DEFAULT_RATE_LIMITS
+    if args.no_rate_limits:
+        rate_limits = None
+    elif args.rate_limits:
+        try:
+            with open(args.rate_limits) as f:
+                rate_limits = json.load(f)
+            RateLimiter(rate_limits)
+        except (OSError, ValueError) as e:
+            parser.error(f"Invalid rate limit configuration: {e}")
+    if args.stdio:
+        # stdout carries the protocol
+        print("Starting mock MCP server on stdio", file=sys.stderr)
+    else:
+        print(f"Starting mock MCP server at http://{args.host}:{args.port}")
+    run_server(
+        args.host,
+        args.port,
+        catalog=catalog,
+        notify_queue_size=args.notify_queue_size,
+        slow_consumer=args.slow_consumer,
+        workers=args.workers,
+        fault_config=fault_config,
+        files=files,
+        file_watch_interval=args.watch_interval,
+        rate_limits=rate_limits,
+        stdio=args.stdio,
+    )
 
 
 if __name__ == "__main__":
@@ -1,7 +1,7 @@
 """Metadata for MCP specification requirements."""
 
 from dataclasses import dataclass
-from typing import Optional
+from typing import Any, Dict, Optional, Tuple
 
 
 @dataclass
@@ -165,3 +165,58 @@ MCP_REQUIREMENTS = {
         ),
     ],
 }
+
+
+# Capability a server must declare for each feature's tests to apply, as a
+# path into the capabilities/get result. Features not listed always apply.
+FEATURE_CAPABILITIES: Dict[str, Tuple[str, ...]] = {
+    "prompts/list": ("prompts",),
+    "prompts/get": ("prompts",),
+    "prompts/list_changed": ("prompts", "listChanged"),
+    "resources/list": ("resources",),
+    "resources/read": ("resources",),
+    "resources/templates": ("resources",),
+    "resources/list_changed": ("resources", "listChanged"),
+    "resources/subscribe": ("resources", "subscribe"),
+    "tools/list": ("tools",),
+    "tools/call": ("tools",),
+    "tools/list_changed": ("tools", "listChanged"),
+}
+
+
+def declares_capability(capabilities: Dict[str, Any], path: Tuple[str, ...]) -> bool:
+    """Return True if a capabilities/get result declares the capability at path.
+
+    A capability object counts as declared even when empty; a flag counts
+    only when it is present and not false.
+    """
+    value: Any = capabilities
+    for key in path:
+        if not isinstance(value, dict) or key not in value:
+            return False
+        value = value[key]
+    return value is not None and value is not False
+
+
+def check_capability_shape(capabilities: Dict[str, Any], path: Tuple[str, ...]) -> bool:
+    """Check that the flag at path of a capabilities/get result is well formed.
+
+    Every capability on the way must be an object and the flag a boolean,
+    when present.
+
+    Returns:
+        Whether the flag is declared true
+
+    Raises:
+        AssertionError: If a capability or the flag has the wrong type
+    """
+    value: Any = capabilities
+    for depth, key in enumerate(path):
+        name = ".".join(path[: depth + 1])
+        if key not in value:
+            return False
+        value = value[key]
+        if depth < len(path) - 1:
+            assert isinstance(value, dict), f"{name} must be an object, got {value!r}"
+    assert isinstance(value, bool), f"{name} must be a boolean, got {value!r}"
+    return value
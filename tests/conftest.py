@@ -1,14 +1,150 @@
 """Test fixtures for MCP test suite."""
 
+import logging
+import shlex
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+
 import pytest
-from mcp.client import MCPClient
+from mcp.client import MCPClient, MCPError
+from mcp.transports import ASGITransport, HTTPTransport, StdioTransport, Transport
+from tests._meta import FEATURE_CAPABILITIES, declares_capability
+
+logger = logging.getLogger(__name__)
 
 
 def pytest_addoption(parser):
     """Add command-line options for the test suite."""
+    parser.addoption("--server-url", help="Base URL of the MCP server to test")
+    parser.addoption(
+        "--server-cmd",
+        help="Command that launches the MCP server to test over stdio",
+    )
+    parser.addoption(
+        "--in-process",
+        action="store_true",
+        help="Test the bundled mock server by calling its ASGI app directly",
+    )
+    parser.addoption(
+        "--no-rate-limits",
+        action="store_true",
+        help="Turn off the rate limits of the --in-process mock server",
+    )
     parser.addoption(
-        "--server-url", required=True, help="Base URL of the MCP server to test"
+        "--client-id",
+        help="Namespace to send as X-Client-Id, keeping this session's state on "
+        "the server apart from other sessions",
+    )
+
+
+def pytest_configure(config):
+    """Check that a server to test was given."""
+    if not any(
+        config.getoption(option)
+        for option in ("--server-url", "--server-cmd", "--in-process")
+    ):
+        raise pytest.UsageError(
+            "one of --server-url, --server-cmd or --in-process is required"
+        )
+    config.addinivalue_line(
+        "markers",
+        "capability_shape: checks the declared capabilities themselves, so it "
+        "is not skipped when they are missing",
+    )
+    config.mcp_shared_transport = None
+    config.mcp_capabilities = None
+
+
+def pytest_unconfigure(config):
+    """Shut down the shared transport, if one was opened."""
+    transport = getattr(config, "mcp_shared_transport", None)
+    if transport is not None:
+        transport.close()
+
+
+def client_headers(config) -> Optional[Dict[str, str]]:
+    """Return the headers that name this session's namespace, if any."""
+    client_id = config.getoption("--client-id")
+    return {"X-Client-Id": client_id} if client_id else None
+
+
+def is_streaming_url(url: str) -> bool:
+    """Tell whether a URL names a WebSocket or SSE endpoint."""
+    return url.startswith(("ws://", "wss://")) or urlparse(url).path.endswith("/sse")
+
+
+def get_shared_transport(config) -> Optional[Transport]:
+    """Return the transport shared by the whole session, if the target needs one.
+
+    A --server-cmd server is launched once and kept warm, --in-process calls
+    the mock server's app directly, and plain HTTP URLs share one pool of
+    keep-alive connections. WebSocket and SSE URLs get a client per test, so
+    notifications meant for one test never reach another.
+    """
+    if config.mcp_shared_transport is None:
+        command = config.getoption("--server-cmd")
+        url = config.getoption("--server-url")
+        if command:
+            config.mcp_shared_transport = StdioTransport(shlex.split(command))
+        elif config.getoption("--in-process"):
+            from mock_server.server import app, set_rate_limits
+
+            if config.getoption("--no-rate-limits"):
+                set_rate_limits(None)
+            config.mcp_shared_transport = ASGITransport(app)
+        elif not is_streaming_url(url):
+            config.mcp_shared_transport = HTTPTransport(
+                url, headers=client_headers(config)
+            )
+    return config.mcp_shared_transport
+
+
+def make_client(config) -> MCPClient:
+    """Create a client for the server under test."""
+    transport = get_shared_transport(config)
+    label = (
+        config.getoption("--server-cmd")
+        or config.getoption("--server-url")
+        or "in-process"
     )
+    if transport is not None:
+        return MCPClient(label, transport)
+    return MCPClient(label, headers=client_headers(config))
+
+
+def get_capabilities(config) -> Dict[str, Any]:
+    """Fetch the server's capabilities once and cache them for the session."""
+    if config.mcp_capabilities is None:
+        client = make_client(config)
+        try:
+            config.mcp_capabilities = client.send("capabilities/get")
+        finally:
+            if client.transport is not config.mcp_shared_transport:
+                client.close()
+    return config.mcp_capabilities
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip tests for features whose capability the server does not declare.
+
+    The capability each feature needs comes from the test's mcp_requirement
+    marker, so undeclared features cost no round trips at all.
+    """
+    try:
+        capabilities = get_capabilities(config)
+    except MCPError as e:
+        logger.warning(f"Could not fetch capabilities, running all tests: {e}")
+        return
+
+    for item in items:
+        marker = item.get_closest_marker("mcp_requirement")
+        if marker is None or item.get_closest_marker("capability_shape"):
+            continue
+        path = FEATURE_CAPABILITIES.get(marker.kwargs.get("feature"))
+        if path and not declares_capability(capabilities, path):
+            item.add_marker(
+                pytest.mark.skip(reason=f"Server does not declare {'.'.join(path)}")
+            )
 
 
 @pytest.fixture
@@ -17,7 +153,22 @@ def server_url(request):
     return request.config.getoption("--server-url")
 
 
+@pytest.fixture(scope="session")
+def capabilities(request):
+    """The server's capabilities/get result, fetched once per session."""
+    try:
+        return get_capabilities(request.config)
+    except MCPError as e:
+        pytest.fail(f"capabilities/get failed: {e}")
+
+
 @pytest.fixture
-def client(server_url):
+def client(request):
     """Create a reusable JSON-RPC client."""
-    return MCPClient(server_url)
+    client = make_client(request.config)
+    if client.transport is request.config.mcp_shared_transport:
+        # The transport outlives each test, so the client is not closed here
+        yield client
+        return
+    with client:
+        yield client
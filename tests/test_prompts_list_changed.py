@@ -3,21 +3,21 @@
 import time
 import pytest
 from mcp.client import JSONRPCError
+from tests._meta import check_capability_shape
 
 
+@pytest.mark.capability_shape
 @pytest.mark.mcp_requirement(
     feature="prompts/list_changed", level="SHOULD", req_id="PROMPTS-LIST-CHANGED-1"
 )
-def test_prompts_list_changed_capability(client):
-    """Test that server declares prompts.listChanged capability correctly."""
-    capabilities = client.send("capabilities/get")
-    prompts_cap = capabilities.get("prompts", {})
+def test_prompts_list_changed_capability(capabilities):
+    """Test that server declares prompts.listChanged capability correctly.
 
-    if not prompts_cap.get("listChanged", False):
-        pytest.skip("Server does not declare prompts.listChanged = true")
-
-    # If we get here, the server declares listChanged support
-    assert prompts_cap["listChanged"] is True
+    prompts must be an object and listChanged a boolean. Skipped when the
+    capability is not declared.
+    """
+    if not check_capability_shape(capabilities, ("prompts", "listChanged")):
+        pytest.skip("Server does not declare prompts.listChanged")
 
 
 @pytest.mark.mcp_requirement(
@@ -27,16 +27,10 @@ def test_prompts_list_changed_detects_change(client):
     """Test that changes in the prompts list can be detected.
 
     This test:
-    1. Checks if server supports listChanged
-    2. Takes initial snapshot of prompts
-    3. Waits for potential changes
-    4. Checks if list has changed
+    1. Takes initial snapshot of prompts
+    2. Waits for potential changes
+    3. Checks if list has changed
     """
-    # Check capability first
-    capabilities = client.send("capabilities/get")
-    if not capabilities.get("prompts", {}).get("listChanged"):
-        pytest.skip("listChanged capability not declared")
-
     # Get initial prompt list
     initial_list = client.send("prompts/list")
     initial_prompts = initial_list.get("prompts", [])
@@ -0,0 +1,97 @@
+"""Test cases for rate limiting of tool invocations and completion requests."""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Tuple
+
+import pytest
+from mcp.client import JSONRPCError
+
+# Requests fired at a method, and how many at a time, to see if it is throttled
+BURST_SIZE = 500
+BURST_CONCURRENCY = 16
+
+# Seconds a throttled server has to accept requests again
+RECOVERY_TIMEOUT = 10
+
+# Seconds left for limits to refill before later tests use the method
+REFILL_WAIT = 1
+
+
+def send_burst(
+    client, method: str, params: Dict[str, Any]
+) -> Tuple[int, List[JSONRPCError]]:
+    """Send BURST_SIZE concurrent requests.
+
+    Returns:
+        The number of requests that succeeded and the errors of the others
+    """
+
+    def call(_):
+        try:
+            client.send(method, params)
+        except JSONRPCError as e:
+            return e
+        return None
+
+    with ThreadPoolExecutor(BURST_CONCURRENCY) as executor:
+        outcomes = list(executor.map(call, range(BURST_SIZE)))
+    refused = [e for e in outcomes if e is not None]
+    return BURST_SIZE - len(refused), refused
+
+
+def wait_for_recovery(client, method: str, params: Dict[str, Any]) -> None:
+    """Wait until the server accepts the method again, then let limits refill."""
+    deadline = time.monotonic() + RECOVERY_TIMEOUT
+    while True:
+        try:
+            client.send(method, params)
+            break
+        except JSONRPCError:
+            if time.monotonic() > deadline:
+                pytest.fail(f"{method} still refused {RECOVERY_TIMEOUT}s after a burst")
+            time.sleep(0.1)
+    time.sleep(REFILL_WAIT)
+
+
+def check_throttled(client, method: str, params: Dict[str, Any]) -> None:
+    """Check that a burst of calls is partly refused and the server recovers."""
+    succeeded, refused = send_burst(client, method, params)
+    wait_for_recovery(client, method, params)
+
+    assert succeeded > 0, f"Server must serve {method} requests within its limit"
+    assert refused, (
+        f"Server must rate limit {method}: all {BURST_SIZE} requests of a burst "
+        f"of {BURST_CONCURRENCY} concurrent clients succeeded"
+    )
+    for error in refused:
+        assert error.code != -32601, f"{method} must not be reported as unknown"
+
+
+@pytest.mark.mcp_requirement(feature="tools/call", level="MUST", req_id="TOOLS-CALL-4")
+def test_tools_call_rate_limited(client):
+    """Test that a burst of tool invocations is throttled."""
+    tools = client.send("tools/list")["tools"]
+    if not tools:
+        pytest.skip("No tools available")
+
+    tool = tools[0]
+    args = {key: "test" for key in tool["inputSchema"].get("required", [])}
+    check_throttled(client, "tools/call", {"name": tool["name"], "arguments": args})
+
+
+@pytest.mark.mcp_requirement(
+    feature="completion/complete", level="MUST", req_id="COMPLETION-4"
+)
+def test_completion_rate_limited(client):
+    """Test that a burst of completion requests is throttled."""
+    prompt_list = client.send("prompts/list")["prompts"]
+    prompt = next((p for p in prompt_list if p.get("arguments")), None)
+    if not prompt:
+        pytest.skip("No prompt with arguments")
+
+    params = {
+        "ref": {"type": "ref/prompt", "name": prompt["name"]},
+        "argument": {"name": prompt["arguments"][0]["name"], "value": "ex"},
+    }
+    check_throttled(client, "completion/complete", params)
@@ -3,22 +3,22 @@
 import time
 import pytest
 from mcp.client import JSONRPCError
+from tests._meta import check_capability_shape
 from mcp.protocol.schema import ResourcesListResult
 
 
+@pytest.mark.capability_shape
 @pytest.mark.mcp_requirement(
     feature="resources/list_changed", level="SHOULD", req_id="RESOURCES-LIST-CHANGED-1"
 )
-def test_resources_list_changed_capability(client):
-    """Test that server declares resources.listChanged capability correctly."""
-    capabilities = client.send("capabilities/get")
-    resources_cap = capabilities.get("resources", {})
+def test_resources_list_changed_capability(capabilities):
+    """Test that server declares resources.listChanged capability correctly.
 
-    if not resources_cap.get("listChanged", False):
-        pytest.skip("Server does not declare resources.listChanged = true")
-
-    # If we get here, the server declares listChanged support
-    assert resources_cap["listChanged"] is True
+    resources must be an object and listChanged a boolean. Skipped when the
+    capability is not declared.
+    """
+    if not check_capability_shape(capabilities, ("resources", "listChanged")):
+        pytest.skip("Server does not declare resources.listChanged")
 
 
 @pytest.mark.mcp_requirement(
@@ -28,16 +28,10 @@ def test_resources_list_changed_detects_change(client):
     """Test that changes in the resources list can be detected.
 
     This test:
-    1. Checks if server supports listChanged
-    2. Takes initial snapshot of resources
-    3. Waits for potential changes
-    4. Checks if list has changed
+    1. Takes initial snapshot of resources
+    2. Waits for potential changes
+    3. Checks if list has changed
     """
-    # Check capability first
-    capabilities = client.send("capabilities/get")
-    if not capabilities.get("resources", {}).get("listChanged"):
-        pytest.skip("listChanged capability not declared")
-
     # Get initial resource list
     initial_list = client.send("resources/list")
     initial_resources = ResourcesListResult(**initial_list)
@@ -3,21 +3,21 @@
 import time
 import pytest
 from mcp.client import JSONRPCError
+from tests._meta import check_capability_shape
 
 
+@pytest.mark.capability_shape
 @pytest.mark.mcp_requirement(
     feature="resources/subscribe", level="SHOULD", req_id="RESOURCES-SUBSCRIBE-1"
 )
-def test_resources_subscribe_capability(client):
-    """Test that server declares resources.subscribe capability correctly."""
-    capabilities = client.send("capabilities/get")
-    resources_cap = capabilities.get("resources", {})
+def test_resources_subscribe_capability(capabilities):
+    """Test that server declares resources.subscribe capability correctly.
 
-    if not resources_cap.get("subscribe", False):
-        pytest.skip("Server does not declare resources.subscribe = true")
-
-    # If we get here, the server declares subscribe support
-    assert resources_cap["subscribe"] is True
+    resources must be an object and subscribe a boolean. Skipped when the
+    capability is not declared.
+    """
+    if not check_capability_shape(capabilities, ("resources", "subscribe")):
+        pytest.skip("Server does not declare resources.subscribe")
 
 
 @pytest.mark.mcp_requirement(
@@ -27,17 +27,11 @@ def test_resources_subscribe_lifecycle(client):
     """Test the subscription lifecycle for a resource.
 
     This test:
-    1. Checks if server supports subscriptions
-    2. Gets a resource to subscribe to
-    3. Subscribes to the resource
-    4. Waits for potential changes
-    5. Unsubscribes from the resource
+    1. Gets a resource to subscribe to
+    2. Subscribes to the resource
+    3. Waits for potential changes
+    4. Unsubscribes from the resource
     """
-    # Check capability first
-    capabilities = client.send("capabilities/get")
-    if not capabilities.get("resources", {}).get("subscribe"):
-        pytest.skip("subscribe capability not declared")
-
     # Get a resource to subscribe to
     resources = client.send("resources/list")
     if not resources["resources"]:
@@ -68,11 +62,6 @@ def test_resources_subscribe_lifecycle(client):
 )
 def test_resources_subscribe_error_cases(client):
     """Test error handling for resource subscriptions."""
-    # Skip if subscriptions not supported
-    capabilities = client.send("capabilities/get")
-    if not capabilities.get("resources", {}).get("subscribe"):
-        pytest.skip("subscribe capability not declared")
-
     # Test with unknown URI
     with pytest.raises(JSONRPCError) as exc_info:
         client.send("resources/subscribe", {"uri": "unknown://resource"})
@@ -2,20 +2,21 @@
 
 import pytest
 from mcp.client import JSONRPCError
+from tests._meta import check_capability_shape
 
 
+@pytest.mark.capability_shape
 @pytest.mark.mcp_requirement(
     feature="tools/list_changed", level="SHOULD", req_id="TOOLS-LIST-CHANGED-1"
 )
-def test_tools_list_changed_capability(client):
-    """Test that server declares listChanged capability if supported."""
-    capabilities = client.send("capabilities/get")["result"]
-    tools_cap = capabilities.get("tools", {})
+def test_tools_list_changed_capability(capabilities):
+    """Test that server declares tools.listChanged capability correctly.
 
-    if not tools_cap.get("listChanged"):
-        pytest.skip("tools/list_changed not supported")
-
-    assert tools_cap["listChanged"] is True, "listChanged must be true if declared"
+    tools must be an object and listChanged a boolean. Skipped when the
+    capability is not declared.
+    """
+    if not check_capability_shape(capabilities, ("tools", "listChanged")):
+        pytest.skip("Server does not declare tools.listChanged")
 
 
 @pytest.mark.mcp_requirement(
@@ -23,12 +24,6 @@ def test_tools_list_changed_capability(client):
 )
 def test_tools_list_changed_detects_change(client):
     """Test that server emits notification when tools change."""
-    capabilities = client.send("capabilities/get")["result"]
-    tools_cap = capabilities.get("tools", {})
-
-    if not tools_cap.get("listChanged"):
-        pytest.skip("tools/list_changed not supported")
-
     # Subscribe to notifications
     client.send(
         "notifications/subscribe", {"methods": ["notifications/tools/list_changed"]}